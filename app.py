@@ -1,11 +1,42 @@
 # app.py
 # -*- coding: utf-8 -*-
-import streamlit as st
-from pathlib import Path
-import base64
-from src.data_handler import load_data
-from src.quiz_logic import calculate_score, sections_to_improve
-from src.ui_builder import display_instructions, build_quiz_form, show_result
+# Perfil de importaciones (AUTODIAG_IMPORT_PROFILE=1): va antes del resto
+from src.lazy_imports import get_import_profiler, install_from_env
+
+install_from_env()
+
+import streamlit as st  # noqa: E402
+from collections import deque  # noqa: E402
+from contextlib import contextmanager  # noqa: E402
+from pathlib import Path  # noqa: E402
+import base64  # noqa: E402
+import hashlib  # noqa: E402
+import os  # noqa: E402
+import statistics  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from src.registry import WorkbookRegistry, shared_registry  # noqa: E402
+from src.percentiles import shared_percentile_index  # noqa: E402
+from src.results_store import (  # noqa: E402
+    make_record,
+    results_db_path,
+    shared_results_store,
+)
+from src.assets import LOGOS, ensure_static_assets, picture_html  # noqa: E402
+from src.theme import load_theme_html  # noqa: E402
+from src.warmup import WARMUP_ENV_VAR, start_warmup  # noqa: E402
+from src.questionnaire import Questionnaire  # noqa: E402
+from src.quiz_logic import WEAK_SCORE_MAX  # noqa: E402
+from src.render_model import RenderModel, build_render_model  # noqa: E402
+from src.ui_builder import (  # noqa: E402
+    PAGE_KEY,
+    QUIZ_STATE_KEY,
+    display_instructions,
+    build_quiz_form,
+    build_quiz_page,
+    show_result,
+    sync_quiz_state,
+)
 
 st.set_page_config(
     page_title="Autodiagnóstico LGBTIQ+",
@@ -28,375 +59,299 @@ def get_image_base64(image_path: str) -> str:
         return ""
 
 
-# Cargar logos
-logo1_base64 = get_image_base64("assets/cropped-Logo_WebSite.png")
-logo2_base64 = get_image_base64("assets/camara-de-la-diversidad.jpg_1.png")
+APP_DIR = Path(__file__).resolve().parent
+LOGO_ALTS = {"logo_website": "Logo 1", "logo_camara": "Logo 2"}
+
 
-# CSS global con tema responsive mejorado
-st.markdown(
+@st.cache_resource(show_spinner=False)
+def load_logo_manifest():
     """
-<style>
-/* Variables de tema */
-:root {
-  --primary-color: #667eea;
-  --secondary-color: #764ba2;
-  --success-color: #28a745;
-  --warning-color: #f1c40f;
-  --danger-color: #dc3545;
-  --text-dark: #111827;
-  --text-light: #6b7280;
-  --bg-white: #ffffff;
-  --bg-light: #f8f9fa;
-  --border-color: #e5e7eb;
-  --button-discrete: #5a67d8;
-}
-
-/* Reset y base */
-* {
-  box-sizing: border-box;
-}
-
-/* Ocultar elementos de Streamlit innecesarios */
-#MainMenu {visibility: hidden;}
-footer {visibility: hidden;}
-header {visibility: hidden;}
-
-/* Contenedor principal responsive */
-.main .block-container {
-  max-width: 1200px;
-  padding: 2rem 1rem;
-}
-
-/* Logos header responsive */
-.logos-header {
-  display: flex;
-  justify-content: space-between;
-  align-items: center;
-  max-width: 1000px;
-  margin: 0 auto 2rem auto;
-  padding: 1rem;
-  gap: 2rem;
-}
-
-.logo-img {
-  max-height: 80px;
-  width: auto;
-  object-fit: contain;
-  transition: transform 0.3s ease;
-}
-
-.logo-img:hover {
-  transform: scale(1.05);
-}
-
-@media (max-width: 768px) {
-  .logos-header {
-    flex-direction: column;
-    gap: 1rem;
-  }
-  
-  .logo-img {
-    max-height: 60px;
-  }
-}
-
-/* Cards responsive */
-.card {
-  max-width: 1200px;
-  margin: 1.5rem auto;
-  padding: 2rem;
-  border-radius: 12px;
-  border: 1px solid var(--border-color);
-  background: linear-gradient(145deg, var(--bg-white) 0%, var(--bg-light) 100%);
-  box-shadow: 0 4px 16px rgba(0,0,0,0.08);
-  transition: transform 0.2s ease, box-shadow 0.2s ease;
-}
-
-.card:hover {
-  transform: translateY(-2px);
-  box-shadow: 0 8px 24px rgba(0,0,0,0.12);
-}
-
-/* Badge responsive */
-.badge {
-  margin-top: 0.8rem;
-  padding: 0.5rem 0.75rem;
-  background-color: var(--bg-light);
-  border-radius: 8px;
-  font-size: 0.9rem;
-  color: var(--text-light);
-  display: inline-block;
-  transition: background-color 0.2s ease;
-}
-
-.badge:hover {
-  background-color: #e5e7eb;
-}
-
-/* Botones mejorados */
-.stButton > button {
-  width: 100%;
-  padding: 0.75rem 2rem !important;
-  font-size: 1.1rem !important;
-  font-weight: 600 !important;
-  border-radius: 10px !important;
-  background: linear-gradient(135deg, var(--primary-color) 0%, var(--secondary-color) 100%) !important;
-  border: none !important;
-  color: white !important;
-  box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3) !important;
-  transition: all 0.3s ease !important;
-}
-
-.stButton > button:hover {
-  transform: translateY(-2px);
-  box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4) !important;
-}
-
-.stButton > button:active {
-  transform: translateY(0);
-}
-
-/* Radio buttons mejorados */
-.stRadio > div {
-  gap: 0.75rem;
-}
-
-.stRadio > div > label {
-  padding: 1rem;
-  border: 2px solid var(--border-color);
-  border-radius: 10px;
-  background-color: var(--bg-white);
-  cursor: pointer;
-  transition: all 0.2s ease;
-}
-
-.stRadio > div > label:hover {
-  border-color: var(--primary-color);
-  background-color: #f3f4f6;
-  transform: translateX(4px);
-}
-
-.stRadio > div > label[data-checked="true"] {
-  border-color: var(--primary-color);
-  background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(118, 75, 162, 0.1) 100%);
-  font-weight: 600;
-}
-
-/* Expanders mejorados */
-.streamlit-expanderHeader {
-  font-size: 1.1rem !important;
-  font-weight: 600 !important;
-  color: var(--text-dark) !important;
-  background-color: var(--bg-light) !important;
-  border-radius: 8px !important;
-  padding: 1rem !important;
-  transition: background-color 0.2s ease;
-}
-
-.streamlit-expanderHeader:hover {
-  background-color: #e5e7eb !important;
-}
-
-/* Métricas mejoradas */
-.stMetric {
-  background-color: var(--bg-white);
-  padding: 1rem;
-  border-radius: 8px;
-  border: 1px solid var(--border-color);
-  box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-}
-
-/* Download button - discreto y ancho completo */
-.stDownloadButton > button {
-  width: 100%;
-  padding: 0.75rem 2rem !important;
-  font-size: 1rem !important;
-  font-weight: 600 !important;
-  border-radius: 10px !important;
-  background: linear-gradient(135deg, var(--button-discrete) 0%, #4c51bf 100%) !important;
-  border: none !important;
-  color: white !important;
-  box-shadow: 0 4px 12px rgba(90, 103, 216, 0.25) !important;
-  transition: all 0.3s ease !important;
-}
-
-.stDownloadButton > button:hover {
-  transform: translateY(-2px);
-  box-shadow: 0 6px 20px rgba(90, 103, 216, 0.35) !important;
-  background: linear-gradient(135deg, #4c51bf 0%, var(--button-discrete) 100%) !important;
-}
-
-/* Alerts centrados */
-.stAlert {
-  max-width: 800px;
-  margin: 1rem auto !important;
-}
-
-/* Footer con logos */
-.footer-logos {
-  display: flex;
-  justify-content: center;
-  align-items: center;
-  gap: 3rem;
-  margin: 2rem auto 1rem auto;
-  max-width: 800px;
-  flex-wrap: wrap;
-}
-
-.footer-logo-img {
-  max-height: 60px;
-  width: auto;
-  object-fit: contain;
-  opacity: 0.8;
-  transition: opacity 0.3s ease, transform 0.3s ease;
-}
-
-.footer-logo-img:hover {
-  opacity: 1;
-  transform: scale(1.05);
-}
-
-/* Responsive design */
-@media (max-width: 768px) {
-  .main .block-container {
-    padding: 1rem 0.5rem;
-  }
-  
-  .card {
-    padding: 1.5rem;
-    margin: 1rem 0;
-  }
-  
-  .stButton > button,
-  .stDownloadButton > button {
-    font-size: 1rem !important;
-    padding: 0.65rem 1.5rem !important;
-  }
-  
-  h1 {
-    font-size: 1.8rem !important;
-  }
-  
-  h2 {
-    font-size: 1.5rem !important;
-  }
-  
-  h3 {
-    font-size: 1.3rem !important;
-  }
-  
-  .footer-logos {
-    gap: 1.5rem;
-  }
-  
-  .footer-logo-img {
-    max-height: 50px;
-  }
-}
-
-@media (max-width: 480px) {
-  .main .block-container {
-    padding: 0.75rem 0.25rem;
-  }
-  
-  .card {
-    padding: 1rem;
-  }
-  
-  h1 {
-    font-size: 1.5rem !important;
-  }
-  
-  .footer-logo-img {
-    max-height: 40px;
-  }
-}
-
-/* Animaciones */
-@keyframes fadeIn {
-  from {
-    opacity: 0;
-    transform: translateY(10px);
-  }
-  to {
-    opacity: 1;
-    transform: translateY(0);
-  }
-}
-
-.card, .stButton, .stRadio {
-  animation: fadeIn 0.3s ease;
-}
-
-/* Scrollbar personalizado */
-::-webkit-scrollbar {
-  width: 8px;
-  height: 8px;
-}
-
-::-webkit-scrollbar-track {
-  background: var(--bg-light);
-}
-
-::-webkit-scrollbar-thumb {
-  background: var(--primary-color);
-  border-radius: 4px;
-}
-
-::-webkit-scrollbar-thumb:hover {
-  background: var(--secondary-color);
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
+    Logos optimizados servidos desde /app/static/ (se generan una vez por proceso
+    si faltan). None si el static serving está desactivado.
+    """
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    return ensure_static_assets(APP_DIR / "static", APP_DIR / "assets")
+
+
+def logos_html(css_class: str) -> str:
+    """Etiquetas de los logos: <picture> estático o, en su defecto, base64."""
+    manifest = load_logo_manifest()
+    if manifest and all(name in manifest for name in LOGOS):
+        return "".join(
+            picture_html(manifest[name], css_class, LOGO_ALTS[name]) for name in LOGOS
+        )
+
+    # Respaldo: data URI (se reenvía en cada rerun)
+    images = [get_image_base64(str(APP_DIR / "assets" / f)) for f in LOGOS.values()]
+    if not all(images):
+        return ""
+    return "".join(
+        f'<img src="data:image/png;base64,{b64}" class="{css_class}" alt="{alt}">'
+        for b64, alt in zip(images, LOGO_ALTS.values())
+    )
+
+
+def get_registry() -> WorkbookRegistry:
+    """
+    Libros de data/ del proceso (un tenant por .xlsx, ver src/registry.py):
+    se cargan en su primer uso y se recargan en segundo plano si cambian.
+    Es el mismo registro que usa el warm-up.
+    """
+    return shared_registry(APP_DIR / "data")
+
+
+# ?tenant=<id o hash> elige el cuestionario; sin parámetro, el por defecto
+TENANT_PARAM = "tenant"
+
+
+def current_tenant() -> str:
+    registry = get_registry()
+    key = st.query_params.get(TENANT_PARAM)
+    tid = registry.resolve(key)
+    if tid is None:
+        st.error(
+            f"No existe el cuestionario «{key}». Disponibles: "
+            + ", ".join(registry.ids())
+        )
+        st.stop()
+    return tid
 
 
-@st.cache_data(show_spinner="Cargando datos del Excel...")
 def load_cached_data():
-    """Carga datos con caché para evitar recargas."""
-    return load_data("data")
+    """
+    Datos del Excel fijados a la sesión junto con su tenant y el SHA-256 del
+    libro: la primera llamada toma la versión vigente del registro y la guarda
+    en session_state, así una recarga del Excel solo afecta a las sesiones
+    nuevas. Si la sesión cambia de tenant se descartan los datos y las
+    respuestas del anterior.
+    """
+    tid = current_tenant()
+    pinned = st.session_state.get("_data")
+    if pinned is None or pinned[0] != tid:
+        if pinned is not None:
+            for key in list(st.session_state):
+                if key in (QUIZ_STATE_KEY, PAGE_KEY) or key.startswith("q_"):
+                    del st.session_state[key]
+        store = get_registry().store(tid)
+        if store.loaded:
+            data, digest = store.current_version()
+        else:
+            with st.spinner("Cargando datos del Excel..."):
+                data, digest = store.current_version()
+        pinned = st.session_state["_data"] = (tid, data, digest)
+    return pinned[1]
+
+
+@st.cache_resource(show_spinner=False)
+def prewarm_pdfs() -> int:
+    """
+    Pre-genera los PDF de las combinaciones más comunes (una vez por proceso).
+    Opcional: solo con AUTODIAG_PDF_PREWARM=1, porque importa ReportLab al inicio.
+    """
+    from src.pdf_report import prewarm_pdf_cache
+
+    data = get_registry().current()
+    return prewarm_pdf_cache(
+        data["levels"],
+        data["questions"],
+        data["thresholds"],
+        index=data["recommendation_index"],
+    )
+
+
+# Modo del cuestionario (AUTODIAG_FORM_MODE):
+# - fragment: formulario + resultado en un st.fragment; un clic solo re-ejecuta eso
+# - form: st.form; los radios no disparan reruns hasta "Calcular resultado"
+# - full: cada clic re-ejecuta toda la página (comportamiento original)
+FORM_MODES = ("fragment", "form", "full")
+FORM_MODE = os.environ.get("AUTODIAG_FORM_MODE", "fragment")
+if FORM_MODE not in FORM_MODES:
+    FORM_MODE = "fragment"
+
+# Disposición (AUTODIAG_QUIZ_LAYOUT): "single" (todas las preguntas) o "paged"
+# (una sección por página, las respuestas persisten entre páginas)
+QUIZ_LAYOUT = os.environ.get("AUTODIAG_QUIZ_LAYOUT", "single")
+
+
+@contextmanager
+def timed_rerun(scope: str):
+    """Guarda en session_state la duración de los últimos reruns por alcance."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        history = st.session_state.setdefault("_rerun_timings", {})
+        history.setdefault(scope, deque(maxlen=50)).append(time.perf_counter() - t0)
+
+
+def _calc_button(button, **kwargs) -> bool:
+    # Botón centrado usando columnas simétricas
+    calc_cols = st.columns([1, 2, 1])
+    with calc_cols[1]:
+        return button(
+            "Calcular resultado", type="primary", use_container_width=True, **kwargs
+        )
+
+
+def get_results_store():
+    """Base de resultados del proceso; None salvo que se active AUTODIAG_RESULTS_DB."""
+    path = results_db_path(APP_DIR)
+    return shared_results_store(path) if path is not None else None
+
+
+def questionnaire_version(state) -> str:
+    """Huella de las preguntas respondidas: solo se comparan resultados iguales."""
+    return hashlib.sha1("|".join(state.keys).encode("utf-8")).hexdigest()[:12]
+
+
+def result_percentiles(state, res, sections):
+    """Percentil del total y de cada sección (antes de sumar este resultado)."""
+    path = results_db_path(APP_DIR)
+    if path is None:
+        return None
+    tenant = st.session_state["_data"][0]
+    return shared_percentile_index(path).lookup(
+        tenant, questionnaire_version(state), res["total"], sections
+    )
+
+
+def save_result(state, data, res, areas, sections) -> None:
+    """
+    Encola el resultado para la base (escritura diferida: no espera al disco).
+    Volver a calcular con las mismas respuestas no lo guarda de nuevo.
+    """
+    store = get_results_store()
+    if store is None:
+        return
+    tenant = st.session_state["_data"][0]
+    answers = {q["id"]: state.answers[q["key"]] for q in data["questions"]}
+    signature = (tenant, tuple(answers.items()))
+    if st.session_state.get("_saved_result") == signature:
+        return
+    version = questionnaire_version(state)
+    record = make_record(tenant, version, answers, res, areas, section_scores=sections)
+    if store.submit(record):
+        shared_percentile_index(store.path).add(tenant, version, res["total"], sections)
+    st.session_state["_saved_result"] = signature
+
+
+def _render_result(state, data) -> None:
+    """Resultado a partir de los agregados de la sesión (sin recorrer respuestas)."""
+    levels = data["levels"]
+
+    missing_q = len(data["questions"]) - state.answered
+    if missing_q > 0:
+        st.error(
+            f"No has completado el cuestionario: faltan **{missing_q} pregunta(s)**. "
+            "Responde todas antes de calcular."
+        )
+        return
+
+    # Calcula resultado
+    res = state.result(data["thresholds"])
+    areas = state.areas()
+    sections = state.section_totals()
+    percentiles = result_percentiles(state, res, sections)
+    save_result(state, data, res, areas, sections)
+    # Tablas precalculadas al cargar el Excel: solo se suman las preguntas bajas
+    low = {
+        q["id"]: state.answers[q["key"]]
+        for q in data["questions"]
+        if state.answers[q["key"]] <= WEAK_SCORE_MAX
+    }
+    recs = data["recommendation_index"].match(low, areas)
+
+    st.markdown("---")
+    show_result(res, levels, recs, areas, percentiles)
+
+    # Generación de PDF (ReportLab se importa solo al llegar aquí)
+    from src.pdf_report import PDF_FILENAME, cached_result_pdf
+
+    pdf_bytes = cached_result_pdf(res, levels, areas, recs)
+
+    # Botón de descarga centrado
+    dl_cols = st.columns([1, 2, 1])
+    with dl_cols[1]:
+        st.download_button(
+            label="Descargar PDF del resultado",
+            data=pdf_bytes,
+            file_name=PDF_FILENAME,
+            mime="application/pdf",
+            use_container_width=True,
+        )
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_render_model(tenant: str, digest: str, _questions) -> RenderModel:
+    """
+    Questionnaire + HTML y textos de todas las preguntas, calculados una vez por
+    libro (tenant + SHA-256 del Excel) y compartidos entre sesiones. Las claves
+    de pregunta no bastan: no incluyen la sección, que también cambia el modelo.
+    """
+    return build_render_model(Questionnaire.from_dicts(_questions))
+
+
+def quiz_section(data) -> None:
+    """Formulario, barra de progreso, botón de cálculo y resultado."""
+    tenant, _, digest = st.session_state["_data"]
+    model = load_render_model(tenant, digest, data["questions"])
+    in_form = FORM_MODE == "form"
+    with st.form("cuestionario", border=False) if in_form else st.container():
+        if QUIZ_LAYOUT == "paged":
+            state, is_last = build_quiz_page(model, in_form=in_form)
+        else:
+            state, is_last = build_quiz_form(model, in_form=in_form), True
+
+        calc_clicked = False
+        if is_last and in_form:
+            calc_clicked = _calc_button(
+                st.form_submit_button, on_click=sync_quiz_state, args=(model,)
+            )
+        elif is_last:
+            calc_clicked = _calc_button(st.button)
+
+    if calc_clicked:
+        _render_result(state, data)
+
+
+@st.fragment
+def quiz_fragment(data) -> None:
+    """Modo fragment: los widgets de aquí dentro solo re-ejecutan esta función."""
+    with timed_rerun("fragmento"):
+        quiz_section(data)
 
 
 def main():
+    # Tema global: <link> a static/theme.<hash>.css (o <style> minificado)
+    st.markdown(load_theme_html(APP_DIR), unsafe_allow_html=True)
+
     # Header con logos
-    if logo1_base64 and logo2_base64:
+    header_logos = logos_html("logo-img")
+    if header_logos:
         st.markdown(
-            f"""
-            <div class="logos-header">
-                <img src="data:image/png;base64,{logo1_base64}" class="logo-img" alt="Logo 1">
-                <img src="data:image/png;base64,{logo2_base64}" class="logo-img" alt="Logo 2">
-            </div>
-            """,
+            f'<div class="logos-header">{header_logos}</div>',
             unsafe_allow_html=True,
         )
 
     # Título
     st.markdown(
-        """
-        <div style="text-align: center; margin-bottom: 1rem;">
-            <h1 style="
-                color: var(--text-dark);
-                font-size: 2.5rem;
-                font-weight: 800;
-                margin: 0;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                background-clip: text;
-            ">
-                Autodiagnóstico en inclusión laboral LGBTIQ+
-            </h1>
-            <p style="color: var(--text-light); font-size: 1.1rem; margin-top: 0.5rem;">
-                Herramienta de evaluación para empresas
-            </p>
-        </div>
-        """,
+        '<div class="ad-head">'
+        '<h1 class="ad-title">Autodiagnóstico en inclusión laboral LGBTIQ+</h1>'
+        '<p class="ad-sub">Herramienta de evaluación para empresas</p>'
+        "</div>",
         unsafe_allow_html=True,
     )
 
+    # Calentamiento en segundo plano (datos, ReportLab, estáticos); con serve.py
+    # ya viene hecho desde el arranque del servidor
+    if os.environ.get(WARMUP_ENV_VAR, "1") != "0":
+        start_warmup(APP_DIR)
+
     # Carga con caché
     data = load_cached_data()
+    if os.environ.get("AUTODIAG_PDF_PREWARM") == "1":
+        prewarm_pdfs()
 
     # Mostrar tiempos de carga (opcional, solo en debug)
     if "_load_timings" in data and st.sidebar.checkbox("Modo debug", value=False):
@@ -406,156 +361,101 @@ def main():
             cols[0].metric("Total", f"{timings.get('total', 0):.2f}s")
             cols[1].metric("Cuestionario", f"{timings.get('cuestionario', 0):.3f}s")
             cols[2].metric("Niveles", f"{timings.get('niveles', 0):.3f}s")
-
-    instructions = data["instructions"]
-    questions = data["questions"]
-    thresholds = data["thresholds"]
-    levels = data["levels"]
-    recommendations = data["recommendations"]
+            # Desglose completo por etapa (snapshot, instrucciones, nivel_1, ...)
+            st.table(
+                {
+                    "Etapa": list(timings.keys()),
+                    "Segundos": [f"{v:.4f}" for v in timings.values()],
+                }
+            )
+            # Latencia de reruns en esta sesión (script completo / fragmento)
+            reruns = st.session_state.get("_rerun_timings", {})
+            if reruns:
+                st.caption(f"Reruns (modo {FORM_MODE})")
+                st.table(
+                    {
+                        "Alcance": list(reruns.keys()),
+                        "N": [len(v) for v in reruns.values()],
+                        "Último (ms)": [f"{v[-1] * 1000:.1f}" for v in reruns.values()],
+                        "Mediana (ms)": [
+                            f"{statistics.median(v) * 1000:.1f}"
+                            for v in reruns.values()
+                        ],
+                    }
+                )
+            # Versión del Excel publicada y recargas en caliente
+            st.caption(f"Datos del Excel (tenant {current_tenant()})")
+            st.json(get_registry().store(current_tenant()).stats())
+            st.caption("Registro de cuestionarios")
+            st.json(get_registry().stats())
+            # Calentamiento al arranque: estado y segundos por componente
+            if os.environ.get(WARMUP_ENV_VAR, "1") != "0":
+                st.caption("Calentamiento")
+                st.json(start_warmup(APP_DIR).status())
+            # Base de resultados: cola de escritura diferida
+            results = get_results_store()
+            if results is not None:
+                st.caption("Resultados guardados")
+                st.json(results.stats())
+                st.caption("Percentiles")
+                st.json(shared_percentile_index(results.path).stats())
+            # Caché de PDF (solo si ReportLab ya se cargó en este proceso)
+            if "src.pdf_report" in sys.modules:
+                st.caption("Caché de PDF")
+                st.json(sys.modules["src.pdf_report"].pdf_cache_stats())
+
+    # Perfil de importaciones (solo con AUTODIAG_IMPORT_PROFILE=1)
+    profiler = get_import_profiler()
+    if profiler is not None and st.sidebar.checkbox("Perfil de importaciones"):
+        with st.expander("Importaciones al arranque (debug)", expanded=False):
+            st.metric("Tiempo total de imports", f"{profiler.total_seconds():.2f}s")
+            rows = profiler.top(20)
+            st.table(
+                {
+                    "Módulo": [r["module"] for r in rows],
+                    "Acumulado (ms)": [
+                        f"{r['cumulative_us'] / 1000:.1f}" for r in rows
+                    ],
+                    "Propio (ms)": [f"{r['self_us'] / 1000:.1f}" for r in rows],
+                }
+            )
 
     # Instrucciones
     with st.expander("Ver instrucciones", expanded=True):
-        display_instructions(instructions)
+        display_instructions(data["instructions"])
 
     # Formulario
     st.markdown("---")
-    answers, labels = build_quiz_form(questions)
-
-    # Botón centrado usando columnas simétricas
-    calc_cols = st.columns([1, 2, 1])
-    with calc_cols[1]:
-        calc_clicked = st.button(
-            "Calcular resultado", type="primary", use_container_width=True
-        )
-
-    if calc_clicked:
-        total_q = len(questions)
-        answered_q = len(answers)
-        missing_q = total_q - answered_q
-
-        if missing_q > 0:
-            st.error(
-                f"No has completado el cuestionario: faltan **{missing_q} pregunta(s)**. "
-                "Responde todas antes de calcular."
-            )
-        else:
-            # Calcula resultado
-            res = calculate_score(answers, thresholds)
-            areas = sections_to_improve(answers, questions)
-
-            st.markdown("---")
-            show_result(res, levels, recommendations, areas)
-
-            # Generación de PDF
-            from io import BytesIO
-            from reportlab.lib.pagesizes import LETTER
-            from reportlab.lib.units import inch
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
-
-            def create_result_pdf(result, levels, areas_dict) -> bytes:
-                buf = BytesIO()
-                doc = SimpleDocTemplate(
-                    buf,
-                    pagesize=LETTER,
-                    leftMargin=0.8 * inch,
-                    rightMargin=0.8 * inch,
-                    topMargin=0.8 * inch,
-                    bottomMargin=0.8 * inch,
-                )
-                styles = getSampleStyleSheet()
-                story = []
-
-                story.append(
-                    Paragraph(
-                        "<b>Autodiagnóstico en inclusión laboral LGBTIQ+</b>",
-                        styles["Title"],
-                    )
-                )
-                story.append(Spacer(1, 10))
-                story.append(
-                    Paragraph(
-                        f"<b>Resultado:</b> {result['level_label']} &nbsp;&nbsp; "
-                        f"<b>Puntaje total:</b> {int(result['total'])}",
-                        styles["Normal"],
-                    )
-                )
-                story.append(Spacer(1, 14))
-
-                lv = levels.get(result["level_key"], {})
-
-                def sec(titulo: str, contenido: str):
-                    story.append(Paragraph(f"<b>{titulo}</b>", styles["Heading2"]))
-                    story.append(Spacer(1, 4))
-                    story.append(
-                        Paragraph(
-                            (contenido or "(sin contenido)").replace("\n", "<br/>"),
-                            styles["Normal"],
-                        )
-                    )
-                    story.append(Spacer(1, 10))
-
-                sec("Definición", lv.get("DEFINICION"))
-                sec("Características", lv.get("CARACTERISTICAS"))
-                sec("Ruta de aprendizaje", lv.get("RUTA"))
-
-                if areas_dict:
-                    story.append(
-                        Paragraph("<b>Áreas a fortalecer</b>", styles["Heading2"])
-                    )
-                    story.append(Spacer(1, 4))
-                    for sec_name, sc in areas_dict.items():
-                        story.append(
-                            Paragraph(
-                                f"• {sec_name} (puntaje ≤ {int(sc)})",
-                                styles["Normal"],
-                            )
-                        )
-                    story.append(Spacer(1, 10))
-
-                doc.build(story)
-                pdf = buf.getvalue()
-                buf.close()
-                return pdf
-
-            pdf_bytes = create_result_pdf(res, levels, areas)
-
-            # Botón de descarga centrado
-            dl_cols = st.columns([1, 2, 1])
-            with dl_cols[1]:
-                st.download_button(
-                    label="Descargar PDF del resultado",
-                    data=pdf_bytes,
-                    file_name="resultado_autodiagnostico_lgbtiq.pdf",
-                    mime="application/pdf",
-                    use_container_width=True,
-                )
+    if FORM_MODE == "fragment":
+        quiz_fragment(data)
+    else:
+        quiz_section(data)
 
     # Footer con logos
     st.markdown("---")
-    if logo1_base64 and logo2_base64:
+    footer_logos = logos_html("footer-logo-img")
+    if footer_logos:
         st.markdown(
-            f"""
-            <div class="footer-logos">
-                <img src="data:image/png;base64,{logo1_base64}" class="footer-logo-img" alt="Logo 1">
-                <img src="data:image/png;base64,{logo2_base64}" class="footer-logo-img" alt="Logo 2">
-            </div>
-            """,
+            f'<div class="footer-logos">{footer_logos}</div>',
             unsafe_allow_html=True,
         )
 
+    # Con el guardado activado (AUTODIAG_RESULTS_DB) se avisa qué se guarda
+    storage_note = (
+        '<p class="s">Las respuestas se guardan sin datos de la empresa, solo para '
+        "estadísticas agregadas</p>"
+        if results_db_path(APP_DIR) is not None
+        else ""
+    )
     st.markdown(
-        """
-        <div style="text-align: center; color: var(--text-light); font-size: 0.9rem; padding: 1rem 0;">
-            <p>Desarrollado con compromiso por la inclusión | © 2025</p>
-            <p style="font-size: 0.8rem; margin-top: 0.5rem;">
-                Este diagnóstico es confidencial y está diseñado para uso interno
-            </p>
-        </div>
-        """,
+        '<div class="ad-foot">'
+        "<p>Desarrollado con compromiso por la inclusión | © 2025</p>"
+        '<p class="s">Este diagnóstico es confidencial y está diseñado para uso interno</p>'
+        f"{storage_note}</div>",
         unsafe_allow_html=True,
     )
 
 
 if __name__ == "__main__":
-    main()
+    with timed_rerun("script"):
+        main()
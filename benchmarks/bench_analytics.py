@@ -0,0 +1,152 @@
+# benchmarks/bench_analytics.py
+# -*- coding: utf-8 -*-
+"""
+Tiempo de armar el tablero de cohortes a medida que crece la base:
+cohort_summary (lee los agregados rollup_*) frente a recorrer la tabla de
+resultados y agregar en Python. Verifica que ambos dan los mismos números y
+reporta también el costo extra de mantener los agregados al escribir.
+
+Uso:
+    python benchmarks/bench_analytics.py [--sizes 10000 100000 300000]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.analytics import cohort_summary  # noqa: E402
+from src.data_handler import load_data  # noqa: E402
+from src.quiz_logic import calculate_score, sections_to_improve  # noqa: E402
+from src.results_store import (  # noqa: E402
+    BATCH_SIZE,
+    _INSERT,
+    connect,
+    make_record,
+    write_records,
+)
+
+TENANT = "bench"
+DAY = 86_400
+
+
+def make_records(questions, thresholds, n: int, rng: random.Random):
+    now = time.time()
+    out = []
+    for _ in range(n):
+        answers = {q["id"]: rng.randint(1, 3) for q in questions}
+        out.append(
+            make_record(
+                TENANT,
+                None,
+                answers,
+                calculate_score(answers, thresholds),
+                sections_to_improve(answers, questions),
+                created_at=now - rng.randint(0, 365) * DAY,
+            )
+        )
+    return out
+
+
+def rescan(path: Path, questions) -> dict:
+    """Lo mismo que cohort_summary, recorriendo todos los resultados."""
+    conn = connect(path)
+    n = total = 0
+    levels, weak, q_n, q_sum = {}, {}, {}, {}
+    for tot, level, answers, sections in conn.execute(
+        "SELECT total, level_key, answers, weak_sections FROM results "
+        "WHERE tenant = ?",
+        (TENANT,),
+    ):
+        n += 1
+        total += tot
+        levels[level] = levels.get(level, 0) + 1
+        for qid, score in json.loads(answers).items():
+            q_n[qid] = q_n.get(qid, 0) + 1
+            q_sum[qid] = q_sum.get(qid, 0) + score
+        for sec in json.loads(sections):
+            weak[sec] = weak.get(sec, 0) + 1
+    conn.close()
+    return {
+        "n": n,
+        "levels": levels,
+        "weak": weak,
+        "means": {q["id"]: q_sum[q["id"]] / q_n[q["id"]] for q in questions},
+    }
+
+
+def timed(fn, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    args = ap.parse_args()
+
+    data = load_data(ROOT / "data")
+    questions, thresholds = data["questions"], data["thresholds"]
+    rng = random.Random(17)
+
+    print(
+        f"{'resultados':>10} {'agregados ms':>13} {'recorrido ms':>13} "
+        f"{'escritura µs/fila':>18} {'sin agregados':>14}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        plain = Path(tmp) / "plain.db"
+        conn, plain_conn = connect(path), connect(plain)
+        written = 0
+        for size in sorted(args.sizes):
+            recs = make_records(questions, thresholds, size - written, rng)
+            t0 = time.perf_counter()
+            for i in range(0, len(recs), BATCH_SIZE):
+                write_records(conn, recs[i : i + BATCH_SIZE])
+            with_rollups = (time.perf_counter() - t0) / len(recs)
+            t0 = time.perf_counter()
+            for i in range(0, len(recs), BATCH_SIZE):
+                with plain_conn:
+                    plain_conn.executemany(_INSERT, recs[i : i + BATCH_SIZE])
+            without = (time.perf_counter() - t0) / len(recs)
+            written = size
+
+            t_roll, summary = timed(
+                lambda: cohort_summary(path, TENANT, questions), repeat=5
+            )
+            t_scan, scan = timed(lambda: rescan(path, questions), repeat=1)
+            if (
+                summary["n"] != scan["n"]
+                or {lv["level_key"]: lv["n"] for lv in summary["levels"]}
+                != scan["levels"]
+                or any(
+                    abs(q["mean"] - scan["means"][q["id"]]) > 1e-9
+                    for q in summary["questions"]
+                )
+                or any(
+                    s["weak"] != scan["weak"].get(s["section"], 0)
+                    for s in summary["sections"]
+                )
+            ):
+                sys.exit(f"ERROR: los agregados no coinciden con {size:,} filas")
+            print(
+                f"{size:>10,} {t_roll * 1000:>13.2f} {t_scan * 1000:>13.1f} "
+                f"{with_rollups * 1e6:>18.1f} {without * 1e6:>14.1f}"
+            )
+        conn.close()
+        plain_conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_batch.py
+# -*- coding: utf-8 -*-
+"""
+Throughput de score_batch (vectorizado) frente a calculate_score +
+sections_to_improve llamados fila por fila.
+
+Verifica primero que ambos caminos coinciden en total, nivel y áreas a
+fortalecer sobre una muestra con respuestas faltantes.
+
+Uso:
+    python benchmarks/bench_batch.py [--rows 1000000] [--sample 20000]
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.data_handler import load_data  # noqa: E402
+from src.quiz_logic import (  # noqa: E402
+    batch_row_areas,
+    calculate_score,
+    score_batch,
+    sections_to_improve,
+)
+
+
+def random_answers(rows: int, n_questions: int, seed: int = 11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    mat = rng.integers(1, 4, size=(rows, n_questions)).astype(float)
+    # ~2% de respuestas en blanco
+    mat[rng.random(mat.shape) < 0.02] = np.nan
+    return mat
+
+
+def row_dict(ids, row) -> dict:
+    return {qid: int(v) for qid, v in zip(ids, row) if not np.isnan(v)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--sample", type=int, default=20_000)
+    args = ap.parse_args()
+
+    data = load_data(ROOT / "data")
+    questions, thresholds = data["questions"], data["thresholds"]
+    ids = [q["id"] for q in questions]
+
+    # Equivalencia con las funciones por dict
+    sample = random_answers(args.sample, len(ids), seed=3)
+    batch = score_batch(sample, questions, thresholds)
+    t0 = time.perf_counter()
+    for i, row in enumerate(sample):
+        answers = row_dict(ids, row)
+        res = calculate_score(answers, thresholds)
+        areas = sections_to_improve(answers, questions)
+        if (
+            res["total"] != batch["total"][i]
+            or res["level_key"] != batch["level_key"][i]
+            or res["level_label"] != batch["level_label"][i]
+            or list(areas.items()) != list(batch_row_areas(batch, i).items())
+        ):
+            sys.exit(f"ERROR: diferencia en la fila {i}")
+    per_dict = time.perf_counter() - t0
+    print(f"Equivalencia verificada en {args.sample:,} filas")
+    print(f"Por dict:     {args.sample / per_dict:>14,.0f} filas/s")
+
+    mat = random_answers(args.rows, len(ids))
+    t0 = time.perf_counter()
+    batch = score_batch(mat, questions, thresholds)
+    elapsed = time.perf_counter() - t0
+    print(
+        f"score_batch:  {args.rows / elapsed:>14,.0f} filas/s "
+        f"({args.rows:,} filas en {elapsed:.2f}s)"
+    )
+    print(f"Speedup: x{(args.rows / elapsed) / (args.sample / per_dict):.0f}")
+    levels, counts = np.unique(batch["level_key"].astype(str), return_counts=True)
+    print("Distribución:", dict(zip(levels.tolist(), counts.tolist())))
+
+
+if __name__ == "__main__":
+    main()
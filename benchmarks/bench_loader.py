@@ -0,0 +1,86 @@
+# benchmarks/bench_loader.py
+# -*- coding: utf-8 -*-
+"""
+Compara la carga del Excel en una sola pasada (load_data_from_excel) contra la
+ruta anterior, que abría el .xlsx una vez por hoja, y contra la carga desde el
+snapshot compilado (load_data con use_snapshot=True).
+
+Uso:
+    python benchmarks/bench_loader.py [--repeat 5]
+"""
+
+from __future__ import annotations
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src import data_handler as dh  # noqa: E402
+from src import snapshot  # noqa: E402
+
+
+def legacy_load(xlsx: Path) -> Dict[str, Any]:
+    """Ruta previa: cada loader abre el archivo por su cuenta."""
+    return {
+        "instructions": dh._load_instructions_from_excel(xlsx),
+        "questions": dh._load_questions_from_excel(xlsx),
+        "thresholds": dh._extract_thresholds_from_formula(xlsx),
+        "levels": dh._load_levels_from_excel(xlsx),
+        "recommendations": dh._load_recommendations_from_excel(xlsx),
+    }
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> List[float]:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def _same(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    keys = ["instructions", "questions", "thresholds", "levels"]
+    return all(a[k] == b[k] for k in keys) and a["recommendations"].equals(
+        b["recommendations"]
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    xlsx = dh._find_excel_path(ROOT / "data")
+    if xlsx is None:
+        sys.exit("No hay Excel en data/")
+
+    if not _same(legacy_load(xlsx), dh.load_data_from_excel(xlsx)):
+        sys.exit("ERROR: la carga en una pasada no reproduce el resultado anterior")
+
+    legacy = _time(lambda: legacy_load(xlsx), args.repeat)
+    single = _time(lambda: dh.load_data_from_excel(xlsx), args.repeat)
+
+    # Primera llamada: compila el snapshot si no existe o está desactualizado
+    if not _same(dh.load_data(xlsx.parent), dh.load_data_from_excel(xlsx)):
+        sys.exit("ERROR: el snapshot no reproduce el resultado del Excel")
+    snap = _time(lambda: dh.load_data(xlsx.parent), args.repeat)
+
+    lm, sm = statistics.median(legacy), statistics.median(single)
+    print(f"Archivo: {xlsx.name}")
+    print(f"Ruta anterior (varias aperturas): mediana {lm * 1000:8.1f} ms")
+    print(f"Una sola pasada:                  mediana {sm * 1000:8.1f} ms")
+    print(f"Ahorro: {(lm - sm) * 1000:.1f} ms ({(1 - sm / lm) * 100:.0f}%)")
+    print(
+        f"Snapshot ({snapshot.snapshot_path(xlsx).name}): "
+        f"mediana {statistics.median(snap) * 1000:8.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_pdf.py
+# -*- coding: utf-8 -*-
+"""
+Throughput de generación de PDF:
+- por informe reconstruyendo getSampleStyleSheet() (como el closure anterior)
+- con estilos y contenido de niveles reutilizados (create_result_pdf)
+- render_batch con pool de procesos escribiendo a un zip en memoria
+
+Uso:
+    python benchmarks/bench_pdf.py [--reports 300] [--workers N]
+"""
+
+from __future__ import annotations
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src import pdf_report  # noqa: E402
+from src.data_handler import load_data  # noqa: E402
+from src.quiz_logic import batch_row_areas, score_batch  # noqa: E402
+
+
+def make_items(data, n: int):
+    rng = np.random.default_rng(5)
+    mat = rng.integers(1, 4, size=(n, len(data["questions"]))).astype(float)
+    batch = score_batch(mat, data["questions"], data["thresholds"])
+    return [
+        {
+            "name": f"empresa_{i}",
+            "result": {
+                "total": int(batch["total"][i]),
+                "level_key": batch["level_key"][i],
+                "level_label": batch["level_label"][i],
+            },
+            "areas": batch_row_areas(batch, i),
+        }
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reports", type=int, default=300)
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    data = load_data(ROOT / "data")
+    levels = data["levels"]
+    items = make_items(data, args.reports)
+    n = len(items)
+
+    # Estilos reconstruidos en cada informe (comportamiento anterior)
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    with mock.patch.object(pdf_report, "_styles", getSampleStyleSheet):
+        t0 = time.perf_counter()
+        for it in items:
+            pdf_report.create_result_pdf(it["result"], levels, it["areas"])
+        rebuild = time.perf_counter() - t0
+    print(f"Estilos por informe:     {n / rebuild:7.1f} PDF/s")
+
+    t0 = time.perf_counter()
+    for it in items:
+        pdf_report.create_result_pdf(it["result"], levels, it["areas"])
+    reuse = time.perf_counter() - t0
+    print(f"Estilos reutilizados:    {n / reuse:7.1f} PDF/s")
+
+    workers = args.workers or pdf_report._available_cpus()
+    stats = pdf_report.render_batch(
+        items, levels, zip_target=io.BytesIO(), workers=workers
+    )
+    print(
+        f"render_batch ({workers} proc): {stats['per_second']:7.1f} PDF/s "
+        f"({stats['bytes'] / 1e6:.1f} MB)"
+    )
+    if workers == 1:
+        print("(una sola CPU disponible: el pool no puede paralelizar aquí)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_percentiles.py
+# -*- coding: utf-8 -*-
+"""
+Costo de consultar el percentil de un puntaje a medida que crece la muestra:
+- índice: ScoreDistribution.percentile (conteos acumulados, O(1));
+- ordenado: bisect sobre la lista ordenada de puntajes (O(log n));
+- recorrido: contar los puntajes menores e iguales (O(n)).
+
+Verifica que los tres dan el mismo percentil y reporta también el costo de
+sumar un resultado al índice (ScoreDistribution.add).
+
+Uso:
+    python benchmarks/bench_percentiles.py [--sizes 100 10000 1000000]
+"""
+
+from __future__ import annotations
+import argparse
+import bisect
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.percentiles import ScoreDistribution  # noqa: E402
+
+MAX_SCORE = 30
+
+
+def per_call(fn, queries, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for q in queries:
+            fn(q)
+        best = min(best, (time.perf_counter() - t0) / len(queries))
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    ap.add_argument("--queries", type=int, default=2_000)
+    args = ap.parse_args()
+
+    rng = random.Random(23)
+    queries = [rng.randint(0, MAX_SCORE) for _ in range(args.queries)]
+    print(
+        f"{'resultados':>10} {'índice µs':>10} {'ordenado µs':>12} "
+        f"{'recorrido µs':>13} {'add µs':>8}"
+    )
+    for size in args.sizes:
+        scores = [min(max(int(rng.gauss(20, 5)), 0), MAX_SCORE) for _ in range(size)]
+        counts = {}
+        for s in scores:
+            counts[s] = counts.get(s, 0) + 1
+        dist = ScoreDistribution.from_counts(counts)
+        ordered = sorted(scores)
+
+        def by_sort(s):
+            below = bisect.bisect_left(ordered, s)
+            equal = bisect.bisect_right(ordered, s) - below
+            return 100.0 * (below + 0.5 * equal) / size
+
+        def by_scan(s):
+            below = sum(1 for x in scores if x < s)
+            equal = sum(1 for x in scores if x == s)
+            return 100.0 * (below + 0.5 * equal) / size
+
+        # El recorrido con un millón tarda segundos por consulta: pocas muestras
+        scan_queries = queries[: max(1, 20_000 // max(size // 100, 1))]
+        for q in scan_queries[:5]:
+            expected = by_scan(q)
+            if (
+                max(abs(dist.percentile(q) - expected), abs(by_sort(q) - expected))
+                > 1e-9
+            ):
+                sys.exit(f"ERROR: percentiles distintos con {size:,} resultados")
+
+        t_index = per_call(dist.percentile, queries)
+        t_sort = per_call(by_sort, queries)
+        t_scan = per_call(by_scan, scan_queries, repeat=1)
+        extra = ScoreDistribution.from_counts(counts)
+        t_add = per_call(extra.add, queries, repeat=1)
+        print(
+            f"{size:>10,} {t_index * 1e6:>10.2f} {t_sort * 1e6:>12.2f} "
+            f"{t_scan * 1e6:>13.1f} {t_add * 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/bench_questionnaire.py
+# -*- coding: utf-8 -*-
+"""
+Questionnaire (slots, secciones internadas, índice id -> sección) frente a la
+lista de dicts que entrega data_handler:
+- memoria retenida por N preguntas sintéticas (tracemalloc);
+- búsqueda id -> pregunta / id -> sección;
+- sections_to_improve y score_batch con uno u otro.
+
+Verifica primero que ambos caminos dan los mismos resultados.
+
+Uso:
+    python benchmarks/bench_questionnaire.py [--questions 10000] [--lookups 200000]
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.data_handler import load_data  # noqa: E402
+from src.questionnaire import Questionnaire  # noqa: E402
+from src.quiz_logic import question_keys, score_batch, sections_to_improve  # noqa: E402
+
+
+def make_dicts(n: int, base) -> list:
+    """`n` preguntas con la forma de data_handler (strings nuevos, como al parsear)."""
+    out = []
+    for i in range(n):
+        q = base[i % len(base)]
+        out.append(
+            {
+                "id": f"P{i + 1}",
+                "section": "".join(f"Sección {i // 10 + 1}"),
+                "text": "".join(q["text"]),
+                "options": [
+                    {"score": int(o["score"]), "label": "".join(o["label"])}
+                    for o in q["options"]
+                ],
+            }
+        )
+    for q, key in zip(out, question_keys(out)):
+        q["key"] = key
+    return out
+
+
+def retained(build) -> tuple:
+    """(objeto, bytes que siguen asignados tras construirlo)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def per_call(fn, calls: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--questions", type=int, default=10_000)
+    ap.add_argument("--lookups", type=int, default=200_000)
+    args = ap.parse_args()
+
+    data = load_data(ROOT / "data")
+    base, thresholds = data["questions"], data["thresholds"]
+    n = args.questions
+
+    dicts, dict_bytes = retained(lambda: make_dicts(n, base))
+    qn, qn_bytes = retained(lambda: Questionnaire.from_dicts(make_dicts(n, base)))
+    print(f"{n:,} preguntas")
+    print(f"Memoria lista de dicts:  {dict_bytes / 1024:>10,.0f} KiB")
+    print(
+        f"Memoria Questionnaire:   {qn_bytes / 1024:>10,.0f} KiB "
+        f"({qn_bytes / dict_bytes:.0%}, incluye el índice id -> sección)"
+    )
+
+    # Equivalencia
+    rng = random.Random(5)
+    answers = {q["id"]: rng.randint(1, 3) for q in dicts}
+    if sections_to_improve(answers, dicts) != sections_to_improve(answers, qn):
+        sys.exit("ERROR: sections_to_improve difiere")
+    if qn.to_dicts() != dicts:
+        sys.exit("ERROR: to_dicts no reproduce la lista original")
+    mat = np.random.default_rng(3).integers(1, 4, (2_000, n)).astype(float)
+    a, b = score_batch(mat, dicts, thresholds), score_batch(mat, qn, thresholds)
+    if not all(
+        a[k] == b[k] if k == "sections" else np.array_equal(a[k], b[k]) for k in a
+    ):
+        sys.exit("ERROR: score_batch difiere")
+    print("Equivalencia verificada")
+
+    ids = [rng.choice(qn.ids) for _ in range(args.lookups)]
+
+    def scan():
+        for qid in ids[:200]:
+            next(q for q in dicts if q["id"] == qid)
+
+    by_id = {q["id"]: q for q in dicts}
+
+    def index_map():
+        for qid in ids:
+            by_id[qid]["section"]
+
+    def indexed():
+        section_of = qn.section_of
+        for qid in ids:
+            section_of[qid]
+
+    t_scan = per_call(scan, 1) / 200
+    t_map = per_call(index_map, 3) / len(ids)
+    t_idx = per_call(indexed, 3) / len(ids)
+    print(f"id -> sección, búsqueda lineal:      {t_scan * 1e9:>12,.0f} ns")
+    print(f"id -> sección, dict id -> pregunta: {t_map * 1e9:>12,.0f} ns")
+    print(f"id -> sección, Questionnaire:        {t_idx * 1e9:>12,.0f} ns")
+
+    t_dicts = per_call(lambda: sections_to_improve(answers, dicts), 20)
+    t_qn = per_call(lambda: sections_to_improve(answers, qn), 20)
+    print(
+        f"sections_to_improve: dicts {t_dicts * 1e3:.2f} ms, "
+        f"Questionnaire {t_qn * 1e3:.2f} ms (x{t_dicts / t_qn:.1f})"
+    )
+    t_dicts = per_call(lambda: score_batch(mat, dicts, thresholds), 5)
+    t_qn = per_call(lambda: score_batch(mat, qn, thresholds), 5)
+    print(
+        f"score_batch (2.000 filas): dicts {t_dicts * 1e3:.1f} ms, "
+        f"Questionnaire {t_qn * 1e3:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
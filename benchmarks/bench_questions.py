@@ -0,0 +1,177 @@
+# benchmarks/bench_questions.py
+# -*- coding: utf-8 -*-
+"""
+Parser de preguntas por columnas (_parse_questions) vs. el recorrido anterior
+fila por fila con df.iloc.
+
+Verifica que ambos producen exactamente la misma salida sobre el Excel incluido
+y sobre un cuestionario sintético, y mide el tiempo sobre este último.
+
+Uso:
+    python benchmarks/bench_questions.py [--rows 10000] [--repeat 3]
+"""
+
+from __future__ import annotations
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src import data_handler as dh  # noqa: E402
+
+
+def legacy_parse(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Copia del parser anterior (while + df.iloc[row][col]) como referencia."""
+    df = df.copy()
+    df.columns = [f"col_{i}" for i in range(len(df.columns))]
+    col_b, col_c = "col_1", "col_2"
+
+    questions: List[Dict[str, Any]] = []
+    current_section: Optional[str] = None
+    row_idx = 0
+    max_rows = len(df)
+
+    while row_idx < max_rows:
+        b_val = df.iloc[row_idx][col_b]
+        c_val = df.iloc[row_idx][col_c]
+
+        if (
+            pd.notna(b_val)
+            and not dh._is_question_id(b_val)
+            and (pd.isna(c_val) or not dh._looks_like_question(c_val))
+        ):
+            sb = dh._norm_text(b_val)
+            if sb and sb.lower() != "respuesta":
+                current_section = sb
+
+        if dh._is_question_id(b_val) and dh._looks_like_question(c_val):
+            options: List[Dict[str, Any]] = []
+            r2 = row_idx + 1
+            while r2 < max_rows:
+                b2_val = df.iloc[r2][col_b]
+                c2_val = df.iloc[r2][col_c]
+                if pd.notna(b2_val):
+                    try:
+                        score = int(float(str(b2_val)))
+                        if (
+                            score in (3, 2, 1)
+                            and pd.notna(c2_val)
+                            and dh._norm_text(c2_val)
+                        ):
+                            options.append(
+                                {"score": score, "label": dh._norm_text(c2_val)}
+                            )
+                            r2 += 1
+                            continue
+                    except (ValueError, TypeError):
+                        pass
+                break
+
+            options = sorted(options, key=lambda x: x["score"], reverse=True)
+            if len(options) != 3:
+                missing = {3, 2, 1} - {o["score"] for o in options}
+                for s in sorted(missing, reverse=True):
+                    options.append({"score": s, "label": f"Opción {s}"})
+                options = sorted(options, key=lambda x: x["score"], reverse=True)
+
+            questions.append(
+                {
+                    "id": dh._norm_text(b_val),
+                    "section": current_section or "",
+                    "text": dh._norm_text(c_val),
+                    "options": options,
+                }
+            )
+            row_idx = r2
+            continue
+
+        row_idx += 1
+
+    return questions
+
+
+def synthetic_sheet(rows: int, seed: int = 7) -> pd.DataFrame:
+    """
+    Cuestionario sintético con la misma estructura que el Excel: sección +
+    'Respuesta', id de una letra + enunciado, opciones 3/2/1 y filas vacías.
+    Incluye preguntas con opciones faltantes y puntajes fuera de rango.
+    """
+    rng = np.random.default_rng(seed)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    b: List[Any] = []
+    c: List[Any] = []
+    d: List[Any] = []
+    q = 0
+    while len(b) < rows:
+        if q % 4 == 0:
+            b.append(f"Sección {q // 4}")
+            c.append(np.nan)
+            d.append("Respuesta")
+        b.append(letters[q % 26])
+        c.append(f"¿Pregunta sintética número {q} sobre inclusión laboral?")
+        d.append(int(rng.integers(1, 4)))
+        n_opts = 3 if rng.random() > 0.05 else int(rng.integers(0, 3))
+        for s in (3, 2, 1)[:n_opts]:
+            b.append(s if rng.random() > 0.5 else float(s))
+            c.append(f"Opción {s} de la pregunta {q}")
+            d.append(np.nan)
+        if rng.random() < 0.05:
+            b.append(7)
+            c.append("Fila con puntaje fuera de rango")
+            d.append(np.nan)
+        b.extend([np.nan, np.nan])
+        c.extend([np.nan, np.nan])
+        d.extend([np.nan, np.nan])
+        q += 1
+
+    b, c, d = b[:rows], c[:rows], d[:rows]
+    return pd.DataFrame({"A": np.nan, "B": b, "C": c, "D": d})
+
+
+def _median_time(fn, repeat: int) -> float:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return statistics.median(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    xlsx = dh._find_excel_path(ROOT / "data")
+    if xlsx is not None:
+        df = pd.read_excel(xlsx, sheet_name="Cuestionario", engine="openpyxl")
+        if legacy_parse(df) != dh._parse_questions(df):
+            sys.exit("ERROR: salida distinta sobre el Excel incluido")
+        print(
+            f"Excel incluido: salida idéntica ({len(dh._parse_questions(df))} preguntas)"
+        )
+
+    df = synthetic_sheet(args.rows)
+    new = dh._parse_questions(df)
+    if legacy_parse(df) != new:
+        sys.exit("ERROR: salida distinta sobre el cuestionario sintético")
+
+    legacy_t = _median_time(lambda: legacy_parse(df), args.repeat)
+    new_t = _median_time(lambda: dh._parse_questions(df), args.repeat)
+    print(f"Sintético: {len(df)} filas, {len(new)} preguntas (salida idéntica)")
+    print(f"Anterior (df.iloc fila a fila): {legacy_t * 1000:9.1f} ms")
+    print(f"Por columnas (NumPy):           {new_t * 1000:9.1f} ms")
+    print(f"Speedup: x{legacy_t / new_t:.1f}")
+
+
+if __name__ == "__main__":
+    main()
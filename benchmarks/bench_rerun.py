@@ -0,0 +1,178 @@
+# benchmarks/bench_rerun.py
+# -*- coding: utf-8 -*-
+"""
+Bytes enviados al navegador por rerun de la app (suma de los protobuf de todos
+los elementos, que Streamlit reenvía completos en cada rerun) y tiempo de cada
+rerun: carga inicial (time-to-interactive del lado del servidor), un clic en
+una respuesta, cambio de página (modo paginado) y resultado.
+
+Con --mode se comparan los modos del cuestionario (AUTODIAG_FORM_MODE). AppTest
+siempre re-ejecuta el script completo, así que para "fragment" se reporta además
+el tiempo del cuerpo del fragmento (lo que cuesta un rerun acotado en el
+navegador), y en "form" un clic en una respuesta no produce rerun.
+
+Con --layout se comparan una sola página y el modo paginado por sección
+(AUTODIAG_QUIZ_LAYOUT); --questions N replica las preguntas del Excel hasta N
+(10 por sección) para simular los cuestionarios extendidos.
+
+Uso:
+    python benchmarks/bench_rerun.py [--app ruta/a/app.py] [--repeat 5]
+    python benchmarks/bench_rerun.py --mode full fragment form
+    python benchmarks/bench_rerun.py --layout single paged --questions 80
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src import data_handler  # noqa: E402
+from src.quiz_logic import question_keys  # noqa: E402
+
+
+def _leaves(node):
+    children = getattr(node, "children", None)
+    if children:
+        for child in children.values() if isinstance(children, dict) else children:
+            yield from _leaves(child)
+    else:
+        yield node
+
+
+def rerun_bytes(at: AppTest) -> int:
+    """Bytes serializados de todos los elementos del último rerun."""
+    return sum(
+        len(n.proto.SerializeToString())
+        for n in _leaves(at._tree)
+        if getattr(n, "proto", None) is not None
+    )
+
+
+def _timed_run(at: AppTest) -> float:
+    t0 = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return time.perf_counter() - t0
+
+
+def _fragment_seconds(at: AppTest) -> float:
+    timings = (
+        at.session_state["_rerun_timings"]
+        if "_rerun_timings" in at.session_state
+        else {}
+    )
+    frag = timings.get("fragmento")
+    return frag[-1] if frag else 0.0
+
+
+def _button(at: AppTest, prefix: str):
+    return next((b for b in at.button if b.label.startswith(prefix)), None)
+
+
+def extend_questions(n: int) -> None:
+    """Hace que load_data devuelva `n` preguntas (copias con id y sección nuevos)."""
+    original = data_handler.load_data
+
+    def load_data(*args, **kwargs):
+        data = dict(original(*args, **kwargs))
+        base = data["questions"]
+        questions = [
+            {
+                **base[i % len(base)],
+                "id": f"P{i + 1}",
+                "section": f"Sección {i // 10 + 1}",
+            }
+            for i in range(n)
+        ]
+        for q, key in zip(questions, question_keys(questions)):
+            q["key"] = key
+        data["questions"] = questions
+        return data
+
+    data_handler.load_data = load_data
+
+
+def measure(app: Path) -> dict:
+    st.cache_data.clear()
+    at = AppTest.from_file(str(app), default_timeout=120)
+    out = {}
+    out["inicial"] = (_timed_run(at), rerun_bytes(at))
+
+    at.radio[0].set_value(0)
+    out["clic"] = (_timed_run(at), rerun_bytes(at))
+    out["clic (fragmento)"] = (_fragment_seconds(at), 0)
+
+    # Modo paginado: recorrer las secciones respondiendo cada una
+    paged = False
+    while (nxt := _button(at, "Siguiente")) is not None:
+        for r in at.radio:
+            r.set_value(0)
+        nxt.click()
+        elapsed = _timed_run(at)
+        if not paged:
+            out["página siguiente"] = (elapsed, rerun_bytes(at))
+            paged = True
+
+    # Respuestas + envío en un solo rerun (en modo form así llegan al servidor)
+    for r in at.radio:
+        r.set_value(0)
+    _button(at, "Calcular resultado").click()
+    out["resultado"] = (_timed_run(at), rerun_bytes(at))
+    return out
+
+
+def report(app: Path, repeat: int, mode: Optional[str], layout: Optional[str]) -> None:
+    if mode:
+        os.environ["AUTODIAG_FORM_MODE"] = mode
+    if layout:
+        os.environ["AUTODIAG_QUIZ_LAYOUT"] = layout
+    if mode or layout:
+        print(f"\n== modo {mode or '-'} · {layout or 'single'} ==")
+    runs = [measure(app) for _ in range(repeat)]
+
+    print(f"{'momento':<18} {'bytes':>10} {'mediana ms':>11}")
+    for key in runs[0]:
+        ms = statistics.median(r[key][0] for r in runs) * 1000
+        nbytes = f"{runs[-1][key][1]:,}"
+        if key == "clic (fragmento)":
+            if mode != "fragment":
+                continue
+            nbytes = "-"
+        elif key == "clic" and mode == "form":
+            print(f"{key:<18} {'-':>10} {'sin rerun':>11}")
+            continue
+        print(f"{key:<18} {nbytes:>10} {ms:>11.1f}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--app", default=str(ROOT / "app.py"))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--mode", nargs="*", choices=("full", "fragment", "form"))
+    ap.add_argument("--layout", nargs="*", choices=("single", "paged"))
+    ap.add_argument("--questions", type=int, default=0)
+    args = ap.parse_args()
+
+    app = Path(args.app).resolve()
+    os.chdir(app.parent)
+    if args.questions:
+        extend_questions(args.questions)
+    for layout in args.layout or [None]:
+        for mode in args.mode or [None]:
+            report(app, args.repeat, mode, layout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
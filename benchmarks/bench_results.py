@@ -0,0 +1,136 @@
+# benchmarks/bench_results.py
+# -*- coding: utf-8 -*-
+"""
+Latencia de guardar un resultado con muchas sesiones enviando a la vez:
+- directo: cada envío hace su propia transacción en SQLite (WAL) y commit;
+- diferido: ResultsStore.submit (cola acotada + commits por lotes).
+
+Reporta p50/p99 de la latencia de envío (lo que espera el hilo del script),
+el tiempo hasta que todo queda escrito y verifica la cantidad de filas.
+
+Uso:
+    python benchmarks/bench_results.py [--sessions 300] [--per-session 20]
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.data_handler import load_data  # noqa: E402
+from src.quiz_logic import calculate_score, sections_to_improve  # noqa: E402
+from src.results_store import (  # noqa: E402
+    ResultsStore,
+    connect,
+    make_record,
+    write_records,
+)
+
+
+def records(questions, thresholds, n: int, seed: int):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        answers = {q["id"]: rng.randint(1, 3) for q in questions}
+        out.append(
+            make_record(
+                "bench",
+                None,
+                answers,
+                calculate_score(answers, thresholds),
+                sections_to_improve(answers, questions),
+            )
+        )
+    return out
+
+
+def run(submit, sessions, setup=None):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(sessions))
+
+    def session(batch):
+        local = []
+        if setup is not None:
+            setup()
+        barrier.wait()
+        for rec in batch:
+            t0 = time.perf_counter()
+            submit(rec)
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=session, args=(b,)) for b in sessions]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - t0
+
+
+def summary(name, latencies, elapsed, rows):
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<9} p50 {q[49] * 1e3:>8.3f} ms  p99 {q[98] * 1e3:>8.3f} ms  "
+        f"max {max(latencies) * 1e3:>8.1f} ms  total {elapsed:>6.2f} s  "
+        f"({rows:,} filas)"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=300)
+    ap.add_argument("--per-session", type=int, default=20)
+    args = ap.parse_args()
+
+    data = load_data(ROOT / "data")
+    n = args.sessions * args.per_session
+    recs = records(data["questions"], data["thresholds"], n, seed=7)
+    sessions = [recs[i : i + args.per_session] for i in range(0, n, args.per_session)]
+    print(f"{args.sessions} sesiones simultáneas × {args.per_session} envíos")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "directo.db"
+        connect(path).close()
+        local = threading.local()
+
+        def open_conn():
+            local.conn = connect(path)
+
+        def direct(rec):
+            write_records(local.conn, [rec])
+
+        latencies, elapsed = run(direct, sessions, setup=open_conn)
+        rows = connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        summary("directo", latencies, elapsed, rows)
+
+        store = ResultsStore(Path(tmp) / "diferido.db", maxsize=n)
+        latencies, elapsed = run(store.submit, sessions)
+        t0 = time.perf_counter()
+        store.flush()
+        elapsed += time.perf_counter() - t0
+        stats = store.stats()
+        store.close()
+        rows = connect(store.path).execute("SELECT COUNT(*) FROM results").fetchone()
+        summary("diferido", latencies, elapsed, rows[0])
+        print(
+            f"          {stats['lotes']:,} commits, "
+            f"{stats['por_lote']:.0f} filas por lote, "
+            f"{stats['descartados']} descartados"
+        )
+        if rows[0] != n:
+            sys.exit("ERROR: faltan filas")
+
+
+if __name__ == "__main__":
+    main()
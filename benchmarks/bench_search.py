@@ -0,0 +1,181 @@
+# benchmarks/bench_search.py
+# -*- coding: utf-8 -*-
+"""
+Búsqueda en una biblioteca sintética de recomendaciones (por defecto 50k filas,
+textos en español, portugués e inglés armados con las palabras de la hoja real
+y una distribución tipo Zipf):
+- índice: RecommendationIndex.search (prefijos + BM25), el mismo índice de
+  las recomendaciones del resultado;
+- pandas: str.contains por término sobre una columna ya normalizada, que es
+  lo que haría un filtro en cada tecla.
+
+Verifica, para todas las consultas (también las de los prefijos más comunes),
+que el índice devuelve exactamente las filas en que cada término es prefijo de
+alguna palabra (recorrido completo) y reporta p50/p99 por consulta, el tiempo
+de armado y el tamaño de los arreglos.
+
+Uso:
+    python benchmarks/bench_search.py [--rows 50000] [--queries 300]
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.data_handler import load_data  # noqa: E402
+from src.recommendations import (  # noqa: E402
+    FIELDS,
+    Recommendation,
+    RecommendationIndex,
+    WORD_RE,
+    fold_text,
+    query_terms,
+)
+
+EXTRA_WORDS = (
+    "inclusão diversidade orientação identidade gênero trabalho política "
+    "formação discriminação empresa liderança equidade contratação pessoas "
+    "inclusion diversity workplace gender identity policy training hiring "
+    "pronouns allyship mentoring onboarding harassment reporting equity "
+    "naïve rôle coöperation façade über"
+).split()
+
+
+def vocabulary() -> list:
+    data = load_data(ROOT / "data")
+    words = []
+    for rec in data["recommendation_index"].rows:
+        for name, _ in FIELDS:
+            words.extend(str(getattr(rec, name)).split())
+    words = [w.strip('.,;:()“”"•*') for w in words]
+    return sorted({w for w in words if len(w) >= 3}) + EXTRA_WORDS
+
+
+def synthetic_rows(n: int, rng: random.Random) -> list:
+    words = vocabulary()
+    rng.shuffle(words)
+    # Zipf: la palabra k aparece con peso 1/(k+1)
+    weights = [1 / (k + 1) for k in range(len(words))]
+
+    def text(k: int) -> str:
+        return " ".join(rng.choices(words, weights, k=k))
+
+    return [
+        Recommendation(
+            i,
+            barrera=f"{i + 1}. {text(8)}",
+            concepto=text(40),
+            sintomas=text(30),
+            impacto=text(25),
+            indicadores=text(25),
+            recomendaciones=text(50),
+        )
+        for i in range(n)
+    ]
+
+
+def make_queries(index: RecommendationIndex, n: int, rng: random.Random) -> list:
+    vocab = index.vocab
+    out = []
+    for _ in range(n):
+        k = rng.choice((1, 1, 2, 2, 3))
+        picks = [rng.choice(vocab) for _ in range(k)]
+        # El último término a medio escribir, como al tipear
+        last = picks[-1]
+        picks[-1] = last[: rng.randint(min(3, len(last)), len(last))]
+        out.append(" ".join(picks))
+    return out
+
+
+def brute_force(doc_terms: list, query: str) -> set:
+    prefixes = query_terms(query)
+    if not prefixes:
+        return set()
+    return {
+        doc
+        for doc, words in enumerate(doc_terms)
+        if all(any(w.startswith(p) for w in words) for p in prefixes)
+    }
+
+
+def quantiles(samples: list) -> str:
+    q = statistics.quantiles(samples, n=100)
+    return f"p50 {q[49] * 1e3:>7.3f} ms  p99 {q[98] * 1e3:>7.3f} ms"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50_000)
+    ap.add_argument("--queries", type=int, default=300)
+    args = ap.parse_args()
+
+    import pandas as pd
+
+    rng = random.Random(31)
+    rows = synthetic_rows(args.rows, rng)
+    t0 = time.perf_counter()
+    index = RecommendationIndex(rows)
+    build = time.perf_counter() - t0
+    size = sum(a.nbytes for a in (index.offsets, index.docs, index.tfs, index.impacts))
+    size = (size + sum(d.nbytes + s.nbytes for d, s in index.blocks.values())) / 2**20
+    print(
+        f"{args.rows:,} filas, {len(index.vocab):,} palabras, "
+        f"{len(index.docs):,} postings ({size:.1f} MiB), armado {build:.1f} s"
+    )
+
+    queries = make_queries(index, args.queries, rng)
+    index.search(queries[0])  # NumPy ya importado y en caché
+    latencies = []
+    for q in queries:
+        t0 = time.perf_counter()
+        index.search(q)
+        latencies.append(time.perf_counter() - t0)
+    print(f"índice     {quantiles(latencies)}")
+
+    # Peor caso: los prefijos de 3 letras con más postings ("inc", "per"...)
+    heavy = {}
+    for pos, word in enumerate(index.vocab):
+        heavy[word[:3]] = heavy.get(word[:3], 0) + int(index.df[pos])
+    hard = sorted(heavy, key=heavy.get, reverse=True)[:30]
+    latencies = []
+    for q in hard * 3:
+        t0 = time.perf_counter()
+        index.search(q)
+        latencies.append(time.perf_counter() - t0)
+    print(f"frecuentes {quantiles(latencies)}  ({', '.join(hard[:5])}...)")
+
+    # Columna ya normalizada: el filtro solo paga str.contains por término
+    column = pd.Series(
+        [fold_text(" ".join(getattr(r, n) for n, _ in FIELDS)) for r in rows]
+    )
+    scans = []
+    for q in queries[:30]:
+        t0 = time.perf_counter()
+        mask = pd.Series(True, index=column.index)
+        for term in query_terms(q):
+            mask &= column.str.contains(term, regex=False)
+        scans.append(time.perf_counter() - t0)
+    print(f"pandas     {quantiles(scans)}")
+
+    # Sin límite, el índice debe dar justo las filas del recorrido completo
+    doc_terms = [
+        set(WORD_RE.findall(fold_text(" ".join(getattr(r, n) for n, _ in FIELDS))))
+        for r in rows
+    ]
+    checked = queries[:50] + hard
+    for q in checked:
+        got = {rec.id for rec, _ in index.search(q, limit=args.rows)}
+        if got != brute_force(doc_terms, q):
+            sys.exit(f"ERROR: resultados distintos para {q!r}")
+    print(f"{len(checked)} consultas verificadas contra el recorrido completo")
+
+
+if __name__ == "__main__":
+    main()
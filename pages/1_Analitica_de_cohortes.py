@@ -0,0 +1,161 @@
+# pages/1_Analitica_de_cohortes.py
+# -*- coding: utf-8 -*-
+"""
+Tablero de cohortes: distribución de niveles, histograma de puntajes por
+pregunta y tasa de secciones a fortalecer entre todas las empresas.
+
+Los números salen de los agregados que mantiene src/results_store.py (ver
+src/analytics.py), así que la página carga igual de rápido con cientos de
+miles de diagnósticos guardados.
+
+Solo se muestra con AUTODIAG_ANALYTICS_PASSWORD definida y tras ingresar esa
+contraseña (una vez por sesión).
+"""
+
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from src.analytics import (
+    ANALYTICS_PASSWORD_ENV_VAR,
+    analytics_password,
+    check_password,
+    cohort_summary,
+    periods,
+)
+from src.registry import shared_registry
+from src.results_store import results_db_path, shared_results_store
+from src.theme import load_theme_html
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+st.set_page_config(page_title="Analítica de cohortes", page_icon="📊")
+
+AUTH_KEY = "_analytics_auth"
+
+
+def authorized() -> bool:
+    """Pide la contraseña de la analítica; True cuando la sesión ya la ingresó."""
+    if analytics_password() is None:
+        st.info(
+            "La analítica de cohortes está deshabilitada "
+            f"(se activa definiendo {ANALYTICS_PASSWORD_ENV_VAR})."
+        )
+        return False
+    if st.session_state.get(AUTH_KEY):
+        return True
+    given = st.text_input("Contraseña", type="password")
+    if not given:
+        return False
+    if not check_password(given):
+        st.error("Contraseña incorrecta.")
+        return False
+    st.session_state[AUTH_KEY] = True
+    return True
+
+
+def main() -> None:
+    st.markdown(load_theme_html(APP_DIR), unsafe_allow_html=True)
+    st.markdown(
+        '<div class="ad-head"><h1 class="ad-title">Analítica de cohortes</h1>'
+        '<p class="ad-sub">Resultados agregados de todas las empresas</p></div>',
+        unsafe_allow_html=True,
+    )
+    if not authorized():
+        return
+
+    path = results_db_path(APP_DIR)
+    if path is None:
+        st.info(
+            "El guardado de resultados está desactivado "
+            "(actívalo con AUTODIAG_RESULTS_DB=1)."
+        )
+        return
+    # Crea la base / reconstruye los agregados si hace falta
+    shared_results_store(path)
+
+    registry = shared_registry(APP_DIR / "data")
+    ids = registry.ids()
+    if not ids:
+        st.error("No hay cuestionarios en data/.")
+        return
+    default = registry.resolve(st.query_params.get("tenant")) or registry.default_id
+    tenant = st.selectbox(
+        "Cuestionario", ids, index=ids.index(default) if default in ids else 0
+    )
+    questions = registry.current(tenant)["questions"]
+
+    months = periods(path, tenant)
+    if not months:
+        st.info("Todavía no hay diagnósticos guardados para este cuestionario.")
+        return
+    start, end = months[0], months[-1]
+    if len(months) > 1:
+        start, end = st.select_slider(
+            "Período", options=months, value=(months[0], months[-1])
+        )
+
+    t0 = time.perf_counter()
+    summary = cohort_summary(path, tenant, questions, start, end)
+    elapsed = time.perf_counter() - t0
+
+    cols = st.columns(3)
+    cols[0].metric("Diagnósticos", f"{summary['n']:,}")
+    cols[1].metric(
+        "Puntaje promedio",
+        f"{summary['mean_total']:.1f}" if summary["mean_total"] is not None else "-",
+    )
+    cols[2].metric("Período", start if start == end else f"{start} a {end}")
+
+    st.subheader("Distribución por nivel")
+    st.bar_chart(
+        {
+            "Nivel": [lv["level_label"] for lv in summary["levels"]],
+            "Empresas": [lv["n"] for lv in summary["levels"]],
+        },
+        x="Nivel",
+        y="Empresas",
+    )
+
+    st.subheader("Secciones a fortalecer")
+    st.dataframe(
+        {
+            "Sección": [s["section"] for s in summary["sections"]],
+            "Empresas": [s["weak"] for s in summary["sections"]],
+            "% del total": [round(s["rate"] * 100, 1) for s in summary["sections"]],
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    st.subheader("Puntajes por pregunta")
+    scores = sorted({s for q in summary["questions"] for s in q["hist"]}, reverse=True)
+    st.bar_chart(
+        {
+            "Pregunta": [q["id"] for q in summary["questions"]],
+            **{
+                f"Puntaje {s}": [q["hist"].get(s, 0) for q in summary["questions"]]
+                for s in scores
+            },
+        },
+        x="Pregunta",
+        y=[f"Puntaje {s}" for s in scores],
+    )
+    st.dataframe(
+        {
+            "Pregunta": [q["id"] for q in summary["questions"]],
+            "Sección": [q["section"] for q in summary["questions"]],
+            "Respuestas": [q["n"] for q in summary["questions"]],
+            "Promedio": [
+                round(q["mean"], 2) if q["mean"] is not None else None
+                for q in summary["questions"]
+            ],
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+    st.caption(f"Calculado desde los agregados en {elapsed * 1000:.1f} ms")
+
+
+main()
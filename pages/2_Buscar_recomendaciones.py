@@ -0,0 +1,82 @@
+# pages/2_Buscar_recomendaciones.py
+# -*- coding: utf-8 -*-
+"""
+Búsqueda en la hoja 'Recomendaciones' (barreras, síntomas, indicadores...)
+para consultores.
+
+Usa el mismo índice de recomendaciones que arma la carga del Excel
+(RecommendationIndex.search en src/recommendations.py): cada término se busca
+como prefijo y sin tildes, así que "nombre ident" encuentra "Negación del
+nombre identitario", y la consulta no recorre el DataFrame.
+"""
+
+import html
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from src.recommendations import SEARCH_LIMIT
+from src.registry import shared_registry
+from src.theme import load_theme_html
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+st.set_page_config(page_title="Buscar recomendaciones", page_icon="🔎")
+
+# (campo, título) que se muestran de cada fila encontrada
+SHOWN_FIELDS = (
+    ("concepto", "Concepto"),
+    ("sintomas", "Síntomas"),
+    ("impacto", "Impacto"),
+    ("indicadores", "Señales de alerta"),
+    ("recomendaciones", "Recomendaciones"),
+)
+
+
+def main() -> None:
+    st.markdown(load_theme_html(APP_DIR), unsafe_allow_html=True)
+    st.markdown(
+        '<div class="ad-head"><h1 class="ad-title">Buscar recomendaciones</h1>'
+        '<p class="ad-sub">Barreras, síntomas, indicadores y recomendaciones</p>'
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    registry = shared_registry(APP_DIR / "data")
+    ids = registry.ids()
+    if not ids:
+        st.error("No hay cuestionarios en data/.")
+        return
+    default = registry.resolve(st.query_params.get("tenant")) or registry.default_id
+    tenant = st.selectbox(
+        "Cuestionario", ids, index=ids.index(default) if default in ids else 0
+    )
+    index = registry.current(tenant)["recommendation_index"]
+
+    query = st.text_input(
+        "Buscar", placeholder="p.ej. nombre identitario, lenguaje incl..."
+    )
+    if not query.strip():
+        st.caption(f"{len(index):,} recomendaciones indexadas")
+        return
+
+    t0 = time.perf_counter()
+    hits = index.search(query, limit=SEARCH_LIMIT)
+    elapsed = time.perf_counter() - t0
+
+    st.caption(f"{len(hits)} resultado(s) en {elapsed * 1000:.2f} ms")
+    for rec, _ in hits:
+        with st.expander(rec.barrera or rec.concepto[:80]):
+            for field, title in SHOWN_FIELDS:
+                text = getattr(rec, field)
+                if text:
+                    # .ad-card-b respeta los saltos de línea de la celda
+                    st.markdown(
+                        f"**{title}**\n\n"
+                        f'<div class="ad-card-b">{html.escape(text)}</div>',
+                        unsafe_allow_html=True,
+                    )
+
+
+main()
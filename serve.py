@@ -0,0 +1,47 @@
+# serve.py
+# -*- coding: utf-8 -*-
+"""
+Punto de entrada ASGI con calentamiento al arranque (requiere una versión de
+Streamlit con st.App).
+
+Al iniciar el servidor, antes de recibir tráfico, lanza src.warmup en segundo
+plano y publica /ready para el balanceador: 200 cuando datos, ReportLab y
+estáticos están listos; 503 mientras tanto (el cuerpo JSON trae los tiempos).
+
+Uso:
+    streamlit run serve.py
+    uvicorn serve:app --host 0.0.0.0 --port 8501
+"""
+
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import streamlit as st
+
+from src.warmup import start_warmup
+
+if not hasattr(st, "App"):
+    # requirements.txt solo exige lo que necesita app.py (st.fragment)
+    raise ImportError(
+        f"serve.py necesita una versión de Streamlit con st.App (instalada: "
+        f"{st.__version__}). Actualiza Streamlit o usa: streamlit run app.py"
+    )
+
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+APP_DIR = Path(__file__).resolve().parent
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    start_warmup(APP_DIR)
+    yield
+
+
+async def ready(_request) -> JSONResponse:
+    status = start_warmup(APP_DIR).status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+app = st.App(APP_DIR / "app.py", lifespan=lifespan, routes=[Route("/ready", ready)])
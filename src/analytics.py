@@ -0,0 +1,171 @@
+# src/analytics.py
+# -*- coding: utf-8 -*-
+"""
+Analítica de cohortes sobre los agregados de src/results_store.py.
+
+Solo lee las tablas rollup_* (una fila por tenant x mes x nivel / pregunta /
+puntaje / sección), nunca la tabla de resultados: el costo de armar el tablero
+depende de cuántas preguntas y meses hay, no de cuántos diagnósticos se
+guardaron. Las preguntas y secciones (orden, textos) salen del mismo
+cuestionario que arma _load_questions_from_excel.
+
+Son datos sobre una población sensible: la página de analítica solo se habilita
+si se define AUTODIAG_ANALYTICS_PASSWORD y pide esa contraseña.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import hmac
+import os
+import sqlite3
+
+ANALYTICS_PASSWORD_ENV_VAR = "AUTODIAG_ANALYTICS_PASSWORD"
+
+
+def analytics_password() -> Optional[str]:
+    """Contraseña de la página de analítica; None si está deshabilitada."""
+    return os.environ.get(ANALYTICS_PASSWORD_ENV_VAR) or None
+
+
+def check_password(given: str) -> bool:
+    """True si `given` es la contraseña configurada (en tiempo constante)."""
+    expected = analytics_password()
+    if expected is None:
+        return False
+    return hmac.compare_digest(given.encode("utf-8"), expected.encode("utf-8"))
+
+
+def _connect_ro(path: str | Path) -> Optional[sqlite3.Connection]:
+    """Conexión de solo lectura; None si la base todavía no existe."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+
+
+def _where(tenant: str, start: Optional[str], end: Optional[str]):
+    sql, params = "tenant = ?", [tenant]
+    if start:
+        sql += " AND period >= ?"
+        params.append(start)
+    if end:
+        sql += " AND period <= ?"
+        params.append(end)
+    return sql, params
+
+
+def periods(path: str | Path, tenant: str) -> List[str]:
+    """Meses ("AAAA-MM") con resultados del tenant, en orden."""
+    conn = _connect_ro(path)
+    if conn is None:
+        return []
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT period FROM rollup_levels WHERE tenant = ? "
+            "ORDER BY period",
+            (tenant,),
+        )
+        return [r[0] for r in rows]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def cohort_summary(
+    path: str | Path,
+    tenant: str,
+    questions: Sequence[Dict[str, Any]],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Resumen del tenant entre los meses `start` y `end` (inclusive):
+    - n, mean_total: diagnósticos y puntaje total promedio
+    - levels: [{level_key, level_label, n, share}]
+    - sections: [{section, weak, rate}] en el orden del cuestionario; rate es
+      la fracción de diagnósticos con la sección a fortalecer
+    - questions: [{id, section, text, n, mean, hist: {puntaje: n}}]
+    """
+    out: Dict[str, Any] = {
+        "n": 0,
+        "mean_total": None,
+        "levels": [],
+        "sections": [],
+        "questions": [],
+    }
+    conn = _connect_ro(path)
+    if conn is None:
+        return out
+    where, params = _where(tenant, start, end)
+    try:
+        levels = conn.execute(
+            f"SELECT level_key, MAX(level_label), SUM(n), SUM(total_sum) "
+            f"FROM rollup_levels WHERE {where} GROUP BY level_key "
+            f"ORDER BY level_key",
+            params,
+        ).fetchall()
+        weak = dict(
+            conn.execute(
+                f"SELECT section, SUM(weak) FROM rollup_sections WHERE {where} "
+                f"GROUP BY section",
+                params,
+            ).fetchall()
+        )
+        per_question = {
+            qid: (n, total)
+            for qid, n, total in conn.execute(
+                f"SELECT question_id, SUM(n), SUM(score_sum) FROM rollup_questions "
+                f"WHERE {where} GROUP BY question_id",
+                params,
+            )
+        }
+        hist: Dict[str, Dict[int, int]] = {}
+        for qid, score, n in conn.execute(
+            f"SELECT question_id, score, SUM(n) FROM rollup_question_hist "
+            f"WHERE {where} GROUP BY question_id, score",
+            params,
+        ):
+            hist.setdefault(qid, {})[int(score)] = n
+    except sqlite3.OperationalError:
+        return out
+    finally:
+        conn.close()
+
+    n = sum(row[2] for row in levels)
+    if not n:
+        return out
+    out["n"] = n
+    out["mean_total"] = sum(row[3] for row in levels) / n
+    out["levels"] = [
+        {"level_key": key, "level_label": label or key, "n": cnt, "share": cnt / n}
+        for key, label, cnt, _ in levels
+    ]
+
+    seen = set()
+    for q in questions:
+        # Misma clave que sections_to_improve ("" si la pregunta no tiene sección)
+        key = q.get("section", "")
+        section = key or "General"
+        if key not in seen:
+            seen.add(key)
+            out["sections"].append(
+                {
+                    "section": section,
+                    "weak": weak.get(key, 0),
+                    "rate": weak.get(key, 0) / n,
+                }
+            )
+        qn, total = per_question.get(q["id"], (0, 0))
+        out["questions"].append(
+            {
+                "id": q["id"],
+                "section": section,
+                "text": q.get("text", ""),
+                "n": qn,
+                "mean": total / qn if qn else None,
+                "hist": hist.get(q["id"], {}),
+            }
+        )
+    return out
@@ -0,0 +1,230 @@
+# src/assets.py
+# -*- coding: utf-8 -*-
+"""
+Pipeline de imágenes estáticas (logos).
+
+Los logos de assets/ se redimensionan con Pillow a 2x su alto máximo en pantalla
+y se exportan a static/ como PNG y, solo si pesa menos, WebP, con el hash del
+contenido en el nombre (cache-busting). Streamlit los sirve una sola vez por navegador
+desde /app/static/ (server.enableStaticServing, con ETag/Last-Modified) en vez
+de reenviar el base64 en cada rerun.
+
+Uso (paso de build):
+    python -m src.assets            # genera static/ y reporta bytes ahorrados
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import base64
+import hashlib
+import html
+import io
+import json
+import sys
+
+# nombre lógico -> archivo fuente en assets/
+LOGOS = {
+    "logo_website": "cropped-Logo_WebSite.png",
+    "logo_camara": "camara-de-la-diversidad.jpg_1.png",
+}
+
+# Alto máximo en pantalla de .logo-img es 80px: 2x para pantallas retina
+TARGET_HEIGHT = 160
+MANIFEST_NAME = "manifest.json"
+STATIC_URL = "app/static"
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _encode(img, fmt: str) -> bytes:
+    """El menor entre las variantes: WebP con pérdida leve o sin pérdida; PNG
+    RGBA o con paleta de 256 colores."""
+    from PIL import Image
+
+    candidates = []
+    if fmt == "WEBP":
+        for opts in ({"quality": 90}, {"lossless": True, "quality": 100}):
+            buf = io.BytesIO()
+            img.save(buf, "WEBP", method=6, **opts)
+            candidates.append(buf.getvalue())
+        return min(candidates, key=len)
+
+    for im in (img, img.quantize(colors=256, method=Image.Quantize.FASTOCTREE)):
+        buf = io.BytesIO()
+        im.save(buf, "PNG", optimize=True)
+        candidates.append(buf.getvalue())
+    return min(candidates, key=len)
+
+
+def _formats(entry: Dict[str, Any]) -> Tuple[str, ...]:
+    """Extensiones publicadas para un logo (el WebP puede faltar)."""
+    return tuple(ext for ext in ("webp", "png") if entry.get(ext))
+
+
+def build_static_assets(
+    assets_dir: str | Path = "assets",
+    static_dir: str | Path = "static",
+    target_height: int = TARGET_HEIGHT,
+) -> Dict[str, Any]:
+    """
+    Genera las versiones optimizadas y escribe static/manifest.json.
+    Retorna el manifest: {nombre: {"webp", "png", "width", "height", ...}}; el
+    WebP solo se publica si pesa menos que el PNG ("webp": None si no).
+    """
+    from PIL import Image
+
+    src_dir, out_dir = Path(assets_dir), Path(static_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest: Dict[str, Any] = {}
+
+    for name, filename in LOGOS.items():
+        src = src_dir / filename
+        if not src.exists():
+            continue
+        raw = src.read_bytes()
+        with Image.open(io.BytesIO(raw)) as im:
+            img = im.convert("RGBA")
+        if img.height > target_height:
+            w = max(1, round(img.width * target_height / img.height))
+            img = img.resize((w, target_height), Image.LANCZOS)
+
+        entry: Dict[str, Any] = {
+            "source": filename,
+            "source_sha256": hashlib.sha256(raw).hexdigest(),
+            "source_bytes": len(raw),
+            "width": img.width,
+            "height": img.height,
+        }
+        encoded = {
+            ext: _encode(img, fmt) for fmt, ext in (("WEBP", "webp"), ("PNG", "png"))
+        }
+        if len(encoded["webp"]) >= len(encoded["png"]):
+            del encoded["webp"]
+        for ext in ("webp", "png"):
+            data = encoded.get(ext)
+            out_name = f"{name}.{_digest(data)}.{ext}" if data is not None else None
+            # Borrar versiones anteriores del mismo logo
+            for old in out_dir.glob(f"{name}.*.{ext}"):
+                if old.name != out_name:
+                    old.unlink()
+            entry[ext] = out_name
+            entry[f"{ext}_bytes"] = len(data) if data is not None else None
+            if data is not None:
+                (out_dir / out_name).write_bytes(data)
+        manifest[name] = entry
+
+    (out_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    return manifest
+
+
+def load_manifest(
+    static_dir: str | Path = "static", assets_dir: str | Path = "assets"
+) -> Optional[Dict[str, Any]]:
+    """
+    Lee static/manifest.json. Retorna None si no existe, si falta algún archivo,
+    si publica un WebP que no pesa menos que su PNG o si un logo fuente cambió
+    desde el último build.
+    """
+    out_dir, src_dir = Path(static_dir), Path(assets_dir)
+    try:
+        manifest = json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    for name, filename in LOGOS.items():
+        entry = manifest.get(name)
+        src = src_dir / filename
+        if entry is None:
+            if src.exists():
+                return None
+            continue
+        if not entry.get("png") or not all(
+            (out_dir / entry[ext]).exists() for ext in _formats(entry)
+        ):
+            return None
+        if entry.get("webp") and entry["webp_bytes"] >= entry["png_bytes"]:
+            return None
+        if src.exists() and hashlib.sha256(src.read_bytes()).hexdigest() != entry.get(
+            "source_sha256"
+        ):
+            return None
+    return manifest
+
+
+def ensure_static_assets(
+    static_dir: str | Path = "static", assets_dir: str | Path = "assets"
+) -> Optional[Dict[str, Any]]:
+    """Manifest vigente; si no existe o está desactualizado lo regenera."""
+    manifest = load_manifest(static_dir, assets_dir)
+    if manifest is not None:
+        return manifest
+    try:
+        return build_static_assets(assets_dir, static_dir)
+    except Exception:
+        return None
+
+
+def picture_html(entry: Dict[str, Any], css_class: str, alt: str) -> str:
+    """
+    <picture> servido desde /app/static/: PNG y, si pesa menos, WebP. Sin
+    loading="lazy": los logos del encabezado se ven al cargar y el pie reusa
+    los mismos archivos ya descargados.
+    """
+    source = (
+        f'<source srcset="{STATIC_URL}/{entry["webp"]}" type="image/webp">'
+        if entry.get("webp")
+        else ""
+    )
+    return (
+        f"<picture>{source}"
+        f'<img src="{STATIC_URL}/{entry["png"]}" class="{html.escape(css_class)}" '
+        f'alt="{html.escape(alt)}" width="{entry["width"]}" '
+        f'height="{entry["height"]}">'
+        "</picture>"
+    )
+
+
+def bytes_per_rerun_report(
+    manifest: Dict[str, Any], assets_dir: str | Path = "assets", copies: int = 2
+) -> Dict[str, int]:
+    """
+    Bytes de logos enviados por rerun (header + footer = 2 copias):
+    antes (data URI base64 de los PNG originales) vs. ahora (solo las etiquetas).
+    """
+    src_dir = Path(assets_dir)
+    before = after = 0
+    for name, entry in manifest.items():
+        raw = (src_dir / entry["source"]).read_bytes()
+        before += copies * len(
+            f'<img src="data:image/png;base64,{base64.b64encode(raw).decode()}">'
+        )
+        after += copies * len(picture_html(entry, "logo-img", name))
+    return {"before": before, "after": after, "saved": before - after}
+
+
+def main() -> int:
+    manifest = build_static_assets()
+    if not manifest:
+        print("No se encontraron logos en assets/", file=sys.stderr)
+        return 1
+    for name, e in manifest.items():
+        webp = f"webp {e['webp_bytes']:,} B" if e["webp"] else "sin webp"
+        print(
+            f"{name}: {e['source_bytes']:,} B -> {webp}, "
+            f"png {e['png_bytes']:,} B ({e['width']}x{e['height']})"
+        )
+    rep = bytes_per_rerun_report(manifest)
+    print(
+        f"Bytes por rerun: {rep['before']:,} -> {rep['after']:,} "
+        f"(ahorro {rep['saved']:,} B)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
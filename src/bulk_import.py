@@ -0,0 +1,271 @@
+# src/bulk_import.py
+# -*- coding: utf-8 -*-
+"""
+Evaluación offline de cuestionarios diligenciados en hoja de cálculo.
+
+Entrada: CSV o XLSX con una fila por empresa. Las columnas cuyo nombre es un id
+de pregunta (A, B, ...) contienen el puntaje elegido (3/2/1); el resto de
+columnas (p.ej. 'empresa', 'nit') se copian tal cual a la salida.
+
+Un puntaje distinto de 3/2/1 (p.ej. 4, 2.5 o "tres") no se suma: la pregunta
+cuenta como no respondida y su id queda en la columna 'invalidas'. Las filas
+con preguntas sin responder llevan completa=False; su total y nivel son los de
+las respuestas que sí tienen.
+
+La entrada se lee por bloques y cada bloque se evalúa con score_batch (misma
+lógica que calculate_score + sections_to_improve) y se escribe en el acto, así
+que la memoria no depende del tamaño del archivo.
+
+Uso:
+    python -m src.bulk_import respuestas.csv -o resultados.csv
+    python -m src.bulk_import respuestas.xlsx -o resultados.parquet --chunksize 20000
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from src.data_handler import load_data
+from src.quiz_logic import batch_to_frame, score_batch
+
+DEFAULT_CHUNKSIZE = 50_000
+VALID_SCORES = (3, 2, 1)
+
+
+# ---------- lectura por bloques ----------
+
+
+def _iter_csv(path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    yield from pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=True)
+
+
+def _iter_xlsx(
+    path: Path, chunksize: int, sheet: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """Recorre la hoja en modo read_only (streaming) y arma DataFrames por bloque."""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        cols = [
+            str(h).strip() if h is not None else f"col_{i}"
+            for i, h in enumerate(header)
+        ]
+        buf: List[Any] = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            buf.append(row[: len(cols)])
+            if len(buf) >= chunksize:
+                yield pd.DataFrame(buf, columns=cols)
+                buf = []
+        if buf:
+            yield pd.DataFrame(buf, columns=cols)
+    finally:
+        wb.close()
+
+
+def iter_input_chunks(
+    path: str | Path, chunksize: int = DEFAULT_CHUNKSIZE, sheet: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """Itera la entrada (CSV o XLSX) en DataFrames de a lo sumo `chunksize` filas."""
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix == ".csv":
+        return _iter_csv(p, chunksize)
+    if suffix in (".xlsx", ".xlsm"):
+        return _iter_xlsx(p, chunksize, sheet)
+    raise ValueError(f"Formato de entrada no soportado: {p.name} (usa .csv o .xlsx)")
+
+
+# ---------- evaluación ----------
+
+
+def score_chunk(
+    chunk: pd.DataFrame, questions: List[Dict[str, Any]], thresholds: Dict[str, int]
+) -> pd.DataFrame:
+    """
+    Evalúa un bloque: columnas de pasada + total, nivel, respondidas, completa,
+    invalidas, áreas a fortalecer y el puntaje mínimo por sección débil.
+    """
+    ids = [q["id"] for q in questions]
+    # Columnas de preguntas siempre en el mismo orden (las ausentes = sin responder)
+    raw = chunk.reindex(columns=ids)
+    answers = raw.apply(pd.to_numeric, errors="coerce").astype(float)
+    filled = (
+        raw.astype("string").apply(lambda col: col.str.strip() != "").fillna(False)
+    ).to_numpy(dtype=bool)
+    invalid = filled & ~answers.isin(VALID_SCORES).to_numpy()
+    answers = answers.mask(invalid)
+    batch = score_batch(answers, questions, thresholds)
+
+    scored = batch_to_frame(batch)
+    answered = answers.notna().sum(axis=1).to_numpy()
+    scored.insert(3, "respondidas", answered)
+    scored.insert(4, "completa", answered == len(ids))
+    id_arr = np.array(ids, dtype=object)
+    scored.insert(5, "invalidas", ["; ".join(id_arr[row]) for row in invalid])
+    weak = batch["weak"]
+    sections = np.array(batch["sections"], dtype=object)
+    scored.insert(
+        6,
+        "areas_a_fortalecer",
+        ["; ".join(sections[row]) for row in weak],
+    )
+
+    extra = [c for c in chunk.columns if c not in set(ids)]
+    passthrough = chunk[extra].astype("string").reset_index(drop=True)
+    return pd.concat([passthrough, scored], axis=1)
+
+
+# ---------- escritura incremental ----------
+
+
+class _CsvSink:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._first = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        df.to_csv(
+            self.path, mode="w" if self._first else "a", header=self._first, index=False
+        )
+        self._first = False
+
+    def close(self) -> None:
+        if self._first:
+            # Entrada vacía: dejar al menos un archivo vacío
+            self.path.write_text("", encoding="utf-8")
+
+
+class _ParquetSink:
+    def __init__(self, path: Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError(
+                "La salida .parquet requiere pyarrow (pip install pyarrow)"
+            ) from e
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _open_sink(path: Path):
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return _CsvSink(path)
+    if suffix == ".parquet":
+        return _ParquetSink(path)
+    raise ValueError(
+        f"Formato de salida no soportado: {path.name} (usa .csv o .parquet)"
+    )
+
+
+def score_file(
+    input_path: str | Path,
+    output_path: str | Path,
+    data: Dict[str, Any],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    sheet: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Evalúa `input_path` por bloques y escribe cada bloque en `output_path`.
+    Retorna {"rows": n, "chunks": k, "seconds": t, "levels": {level_key: n},
+    "incomplete": filas con preguntas sin responder, "invalid": filas con algún
+    puntaje distinto de 3/2/1}.
+    """
+    questions, thresholds = data["questions"], data["thresholds"]
+    out = Path(output_path)
+    sink = _open_sink(out)
+
+    rows = chunks = incomplete = invalid = 0
+    levels: Dict[str, int] = {}
+    t0 = time.perf_counter()
+    try:
+        for chunk in iter_input_chunks(input_path, chunksize, sheet):
+            scored = score_chunk(chunk, questions, thresholds)
+            sink.write(scored)
+            rows += len(scored)
+            chunks += 1
+            incomplete += int((~scored["completa"]).sum())
+            invalid += int((scored["invalidas"] != "").sum())
+            for k, n in scored["level_key"].value_counts().items():
+                levels[k] = levels.get(k, 0) + int(n)
+    finally:
+        sink.close()
+
+    return {
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": time.perf_counter() - t0,
+        "levels": levels,
+        "incomplete": incomplete,
+        "invalid": invalid,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Evalúa cuestionarios diligenciados (CSV/XLSX, una fila por empresa)."
+    )
+    ap.add_argument("input", help="Archivo de respuestas (.csv o .xlsx)")
+    ap.add_argument(
+        "-o", "--output", required=True, help="Archivo de resultados (.csv o .parquet)"
+    )
+    ap.add_argument(
+        "--data-dir", default="data", help="Carpeta con el Excel del cuestionario"
+    )
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    ap.add_argument("--sheet", default=None, help="Hoja a leer si la entrada es XLSX")
+    args = ap.parse_args(argv)
+
+    try:
+        data = load_data(args.data_dir)
+        stats = score_file(args.input, args.output, data, args.chunksize, args.sheet)
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(
+        f"{stats['rows']} filas en {stats['chunks']} bloques "
+        f"({stats['seconds']:.2f}s, {rate:,.0f} filas/s) -> {args.output}",
+        file=sys.stderr,
+    )
+    for k in sorted(stats["levels"]):
+        print(f"  {k}: {stats['levels'][k]}", file=sys.stderr)
+    if stats["incomplete"] or stats["invalid"]:
+        print(
+            f"Aviso: {stats['incomplete']} filas incompletas (completa=False), "
+            f"{stats['invalid']} con puntajes distintos de 3/2/1 (ver 'invalidas')",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,18 +5,31 @@ Carga y parseo del Excel original:
 - Instrucciones (sheet 'Instrucciones')
 - Cuestionario (sheet 'Cuestionario'): preguntas A..J con opciones 3/2/1
 - Niveles (sheets 'Nivel 1','Nivel 2','Nivel 3'): NIVEL, DEFINICION, CARACTERISTICAS, RUTA
-- Recomendaciones (sheet 'Recomendaciones')
+- Recomendaciones (sheet 'Recomendaciones'): barrera, concepto, sintomas,
+  impacto, indicadores, recomendaciones (+ su índice, src/recommendations.py)
 - Umbrales desde la fórmula en 'Cuestionario'!C81 si existe (fallback a 15/23)
 """
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
 import re
+import time
 import warnings
+import zipfile
 
-import pandas as pd
-from openpyxl import load_workbook
+from src.lazy_imports import lazy_import
+from src.quiz_logic import question_keys
+from src.recommendations import RecommendationIndex, fold_text
+from src.snapshot import load_with_snapshot
+
+# pandas/NumPy/openpyxl se cargan en el primer uso: con el snapshot vigente
+# openpyxl nunca llega a importarse
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+openpyxl = lazy_import("openpyxl")
 
 # Suprimir warnings de openpyxl sobre extensiones no soportadas
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
@@ -28,12 +41,73 @@ EXCEL_FILENAME = (
 
 DEFAULT_THRESHOLDS = {"nivel_1_max": 15, "nivel_2_max": 23}
 
+# Subir esta versión al cambiar el parser: invalida los snapshots ya escritos
+PARSER_VERSION = "7"
+
+# Un loader acepta la ruta del Excel o un libro ya abierto (pd.ExcelFile)
+ExcelSource = Union[Path, "pd.ExcelFile"]
+
+# ---------- instrumentación de tiempos ----------
+
+# Hook de métricas: recibe (etapa, segundos) por cada etapa medida
+TimingHook = Callable[[str, float], None]
+_TIMING_HOOKS: List[TimingHook] = []
+
+
+def add_timing_hook(hook: TimingHook) -> None:
+    """Registra un hook para exportar los tiempos de carga (p.ej. a Prometheus)."""
+    if hook not in _TIMING_HOOKS:
+        _TIMING_HOOKS.append(hook)
+
+
+def remove_timing_hook(hook: TimingHook) -> None:
+    if hook in _TIMING_HOOKS:
+        _TIMING_HOOKS.remove(hook)
+
+
+def _emit_timing(timings: Dict[str, float], stage: str, seconds: float) -> None:
+    timings[stage] = seconds
+    for hook in list(_TIMING_HOOKS):
+        try:
+            hook(stage, seconds)
+        except Exception:
+            # Un hook de métricas nunca debe romper la carga de datos
+            pass
+
+
+@contextmanager
+def _stage(timings: Optional[Dict[str, float]], stage: str) -> Iterator[None]:
+    """Mide una etapa de carga y la guarda en `timings` (si no es None)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            _emit_timing(timings, stage, time.perf_counter() - t0)
+
 
 def _norm_text(x: Any) -> str:
     return str(x).strip() if x is not None else ""
 
 
-def _sheet_to_dataframe(path: Path, sheet: str) -> pd.DataFrame:
+def _open_excel(xlsx: Path) -> pd.ExcelFile:
+    """
+    Abre el Excel UNA sola vez: el zip y la tabla sharedStrings se parsean aquí
+    y todas las hojas se leen después desde este mismo handle (read_only). La
+    fórmula de umbrales se lee aparte del XML de su hoja (ver _read_formula),
+    sin sharedStrings ni un segundo libro openpyxl.
+    """
+    return pd.ExcelFile(xlsx, engine="openpyxl")
+
+
+def _workbook(xlsx: ExcelSource) -> Tuple[Any, bool]:
+    """Devuelve (workbook openpyxl, debe_cerrarse) para una ruta o un libro abierto."""
+    if isinstance(xlsx, pd.ExcelFile):
+        return xlsx.book, False
+    return openpyxl.load_workbook(xlsx, data_only=True, read_only=True), True
+
+
+def _sheet_to_dataframe(path: ExcelSource, sheet: str) -> pd.DataFrame:
     df = pd.read_excel(path, sheet_name=sheet, dtype=str, engine="openpyxl")
     df = df.dropna(how="all").dropna(axis=1, how="all").fillna("")
     return df
@@ -68,7 +142,7 @@ def _find_excel_path(data_dir: Path) -> Optional[Path]:
     return xs[0]
 
 
-def _load_instructions_from_excel(xlsx: Path) -> str:
+def _load_instructions_from_excel(xlsx: ExcelSource) -> str:
     df = _sheet_to_dataframe(xlsx, "Instrucciones")
     parts: List[str] = []
     for _, row in df.iterrows():
@@ -90,92 +164,94 @@ def _load_instructions_from_excel(xlsx: Path) -> str:
     )
 
 
-def _load_questions_from_excel(xlsx: Path) -> List[Dict[str, Any]]:
-    """OPTIMIZADO: Lee todo el sheet como DataFrame para ser 100x más rápido."""
-    # Leer TODO el sheet de una vez (mucho más rápido)
-    df = pd.read_excel(xlsx, sheet_name="Cuestionario", engine="openpyxl")
+def _text_column(values: np.ndarray, null: np.ndarray) -> pd.Series:
+    """Columna como texto normalizado (strip); las celdas vacías quedan como ''."""
+    txt = pd.Series(values, dtype=object).where(~null, "")
+    return txt.map(str).str.strip()
 
+
+def _parse_questions(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Extrae preguntas y opciones del DataFrame de 'Cuestionario' trabajando sobre
+    arrays de columna (B: id/puntaje/sección, C: enunciado/opción) en vez de
+    recorrer fila por fila con df.iloc.
+    """
     # Asegurar que tenemos las columnas B, C, D (índices 1, 2, 3)
     if df.shape[1] < 4:
         raise ValueError(
             "El sheet 'Cuestionario' debe tener al menos 4 columnas (A, B, C, D)"
         )
 
-    # Renombrar columnas para facilitar acceso
-    df.columns = [f"col_{i}" for i in range(len(df.columns))]
-    col_b = "col_1"  # Columna B
-    col_c = "col_2"  # Columna C
-    col_d = "col_3"  # Columna D
+    n = len(df)
+    b_raw = df.iloc[:, 1].to_numpy(dtype=object)  # Columna B
+    c_raw = df.iloc[:, 2].to_numpy(dtype=object)  # Columna C
+    b_null = pd.isna(b_raw)
+    c_null = pd.isna(c_raw)
+    b_txt = _text_column(b_raw, b_null)
+    c_txt = _text_column(c_raw, c_null)
+
+    # Máscaras por fila
+    is_qid = (b_txt.str.len() == 1).to_numpy() & b_txt.str.isalpha().to_numpy()
+    looks_q = (
+        c_txt.str.contains("¿", regex=False) | c_txt.str.contains("?", regex=False)
+    ).to_numpy() & (c_txt.str.len() > 10).to_numpy()
+    is_question = is_qid & looks_q
+
+    # Puntaje de opción: int(float(B)) ∈ {3, 2, 1} con texto en C
+    num = pd.to_numeric(b_txt.where(~b_null, ""), errors="coerce").to_numpy(dtype=float)
+    scores = np.where(np.isfinite(num), np.trunc(num), 0).astype(int)
+    is_option = np.isin(scores, (3, 2, 1)) & ~c_null & (c_txt.str.len() > 0).to_numpy()
+
+    # Fin de cada bloque de opciones: primera fila >= i que no es opción
+    idx = np.arange(n + 1)
+    stops = np.where(np.append(~is_option, True), idx, n)
+    next_stop = np.minimum.accumulate(stops[::-1])[::-1]
+
+    q_rows = np.flatnonzero(is_question)
+    opt_end = next_stop[q_rows + 1]
+
+    # Filas consumidas como opciones (no cuentan como encabezado de sección)
+    delta = np.zeros(n + 1, dtype=int)
+    np.add.at(delta, q_rows + 1, 1)
+    np.add.at(delta, opt_end, -1)
+    consumed = np.cumsum(delta[:n]) > 0
+
+    is_section = (
+        ~b_null
+        & ~is_qid
+        & ~looks_q
+        & ~consumed
+        & (b_txt.str.len() > 0).to_numpy()
+        & (b_txt.str.lower() != "respuesta").to_numpy()
+    )
+    last_section = np.maximum.accumulate(np.where(is_section, np.arange(n), -1))
 
+    b_list = b_txt.tolist()
+    c_list = c_txt.tolist()
     questions: List[Dict[str, Any]] = []
-    current_section: Optional[str] = None
-    row_idx = 0
-    max_rows = len(df)
-
-    while row_idx < max_rows:
-        b_val = df.iloc[row_idx][col_b]
-        c_val = df.iloc[row_idx][col_c]
-
-        # Detectar sección
-        if (
-            pd.notna(b_val)
-            and not _is_question_id(b_val)
-            and (pd.isna(c_val) or not _looks_like_question(c_val))
-        ):
-            sb = _norm_text(b_val)
-            if sb and sb.lower() != "respuesta":
-                current_section = sb
-
-        # Detectar pregunta
-        if _is_question_id(b_val) and _looks_like_question(c_val):
-            qid = _norm_text(b_val)
-            qtext = _norm_text(c_val)
-            options: List[Dict[str, Any]] = []
-
-            # Leer opciones (siguiente fila en adelante)
-            r2 = row_idx + 1
-            while r2 < max_rows:
-                b2_val = df.iloc[r2][col_b]
-                c2_val = df.iloc[r2][col_c]
-
-                # Verificar si es un score válido (3, 2, o 1)
-                if pd.notna(b2_val):
-                    try:
-                        score = int(float(str(b2_val)))
-                        if (
-                            score in (3, 2, 1)
-                            and pd.notna(c2_val)
-                            and _norm_text(c2_val)
-                        ):
-                            options.append(
-                                {"score": score, "label": _norm_text(c2_val)}
-                            )
-                            r2 += 1
-                            continue
-                    except (ValueError, TypeError):
-                        pass
-                break
-
-            # Completar opciones faltantes
+
+    for q, end in zip(q_rows.tolist(), opt_end.tolist()):
+        options: List[Dict[str, Any]] = [
+            {"score": int(scores[r]), "label": c_list[r]} for r in range(q + 1, end)
+        ]
+
+        # Completar opciones faltantes
+        options = sorted(options, key=lambda x: x["score"], reverse=True)
+        if len(options) != 3:
+            missing = {3, 2, 1} - {o["score"] for o in options}
+            for s in sorted(missing, reverse=True):
+                options.append({"score": s, "label": f"Opción {s}"})
             options = sorted(options, key=lambda x: x["score"], reverse=True)
-            if len(options) != 3:
-                missing = {3, 2, 1} - {o["score"] for o in options}
-                for s in sorted(missing, reverse=True):
-                    options.append({"score": s, "label": f"Opción {s}"})
-                options = sorted(options, key=lambda x: x["score"], reverse=True)
-
-            questions.append(
-                {
-                    "id": qid,
-                    "section": current_section or "",
-                    "text": qtext,
-                    "options": options,
-                }
-            )
-            row_idx = r2
-            continue
 
-        row_idx += 1
+        sec_row = last_section[q]
+        questions.append(
+            {
+                "id": b_list[q],
+                "section": b_list[sec_row] if sec_row >= 0 else "",
+                "text": c_list[q],
+                "options": options,
+            }
+        )
 
     if not questions:
         raise ValueError(
@@ -184,12 +260,62 @@ def _load_questions_from_excel(xlsx: Path) -> List[Dict[str, Any]]:
     return questions
 
 
+def _load_questions_from_excel(xlsx: ExcelSource) -> List[Dict[str, Any]]:
+    """
+    Lee todo el sheet como DataFrame y lo parsea por columnas. Cada pregunta
+    lleva además "key": hash estable de su contenido (ver question_keys).
+    """
+    df = pd.read_excel(xlsx, sheet_name="Cuestionario", engine="openpyxl")
+    questions = _parse_questions(df)
+    for q, key in zip(questions, question_keys(questions)):
+        q["key"] = key
+    return questions
+
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _sheet_part(zf: zipfile.ZipFile, sheet: str) -> str:
+    """Ruta dentro del zip del XML de una hoja (workbook.xml → rels → archivo)."""
+    wb = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rid = next(
+        s.get(f"{_NS_REL}id")
+        for s in wb.iter(f"{_NS_MAIN}sheet")
+        if s.get("name") == sheet
+    )
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    target = next(
+        r.get("Target")
+        for r in rels.iter(f"{_NS_PKG_REL}Relationship")
+        if r.get("Id") == rid
+    )
+    return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+
+def _read_formula(xlsx: Path, sheet: str, coord: str) -> Optional[str]:
+    """
+    Lee el texto de la fórmula de una celda directamente del XML de la hoja.
+    El handle compartido solo expone valores (data_only=True); en vez de abrir
+    un segundo libro openpyxl (que volvería a parsear el zip y sharedStrings)
+    se recorre en streaming el XML de esa hoja hasta la celda pedida.
+    """
+    with zipfile.ZipFile(xlsx) as zf:
+        with zf.open(_sheet_part(zf, sheet)) as fh:
+            for _event, el in ElementTree.iterparse(fh):
+                if el.tag != f"{_NS_MAIN}c":
+                    continue
+                if el.get("r") == coord:
+                    f = el.find(f"{_NS_MAIN}f")
+                    return f.text if f is not None else None
+                el.clear()
+    return None
+
+
 def _extract_thresholds_from_formula(xlsx: Path) -> Dict[str, int]:
     try:
-        wb = load_workbook(xlsx, data_only=False, read_only=True)
-        ws = wb["Cuestionario"]
-        f = ws["C81"].value
-        wb.close()
+        f = _read_formula(xlsx, "Cuestionario", "C81")
 
         if not isinstance(f, str) or "IF(" not in f.upper():
             return DEFAULT_THRESHOLDS.copy()
@@ -207,8 +333,8 @@ def _extract_thresholds_from_formula(xlsx: Path) -> Dict[str, int]:
         return DEFAULT_THRESHOLDS.copy()
 
 
-def _load_single_level_sheet(xlsx: Path, sheet_name: str) -> Dict[str, str]:
-    wb = load_workbook(xlsx, data_only=True, read_only=True)
+def _load_single_level_sheet(xlsx: ExcelSource, sheet_name: str) -> Dict[str, str]:
+    wb, owned = _workbook(xlsx)
     ws = wb[sheet_name]
     out: Dict[str, str] = {}
 
@@ -232,7 +358,8 @@ def _load_single_level_sheet(xlsx: Path, sheet_name: str) -> Dict[str, str]:
         if key and right:
             out[key] = f"{out[key]}\n{right}" if key in out else right
 
-    wb.close()
+    if owned:
+        wb.close()
 
     if not out:
         df = _sheet_to_dataframe(xlsx, sheet_name)
@@ -256,45 +383,44 @@ def _load_single_level_sheet(xlsx: Path, sheet_name: str) -> Dict[str, str]:
     return out
 
 
-def _load_levels_from_excel(xlsx: Path) -> Dict[str, Dict[str, str]]:
+def _load_levels_from_excel(
+    xlsx: ExcelSource, timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Dict[str, str]]:
     out = {}
     for sn in ["Nivel 1", "Nivel 2", "Nivel 3"]:
-        try:
-            out[sn] = _load_single_level_sheet(xlsx, sn)
-        except Exception:
-            out[sn] = {}
+        with _stage(timings, sn.lower().replace(" ", "_")):
+            try:
+                out[sn] = _load_single_level_sheet(xlsx, sn)
+            except Exception:
+                out[sn] = {}
     return out
 
 
 def _normalize_rec_columns(cols: List[str]) -> List[str]:
-    normed = []
-    for c in cols:
-        s = _norm_text(c).lower()
-        s = (
-            s.replace("á", "a")
-            .replace("é", "e")
-            .replace("í", "i")
-            .replace("ó", "o")
-            .replace("ú", "u")
-            .replace("ñ", "n")
-        )
-        s = s.replace(" ", "_")
-        normed.append(s)
-    return normed
+    return [fold_text(c).replace(" ", "_") for c in cols]
 
 
-def _load_recommendations_from_excel(xlsx: Path) -> pd.DataFrame:
+def _load_recommendations_from_excel(xlsx: ExcelSource) -> pd.DataFrame:
     df = _sheet_to_dataframe(xlsx, "Recomendaciones")
     df.columns = _normalize_rec_columns(df.columns.tolist())
+    if len(df) and not any("concepto" in c for c in df.columns):
+        # El encabezado real puede venir en la primera fila de datos (la hoja
+        # tiene un título arriba y pandas deja las columnas como unnamed:_N)
+        first = _normalize_rec_columns(df.iloc[0].tolist())
+        if any("concepto" in c for c in first):
+            df = df.iloc[1:].reset_index(drop=True)
+            df.columns = first
     mapping = {}
     for c in df.columns:
         if "barrera" in c:
             mapping[c] = "barrera"
         elif "concepto" in c:
             mapping[c] = "concepto"
-        elif "sintoma" in c:
+        elif "sintoma" in c or "problematica" in c:
             mapping[c] = "sintomas"
-        elif "indicador" in c:
+        elif "impacto" in c:
+            mapping[c] = "impacto"
+        elif "indicador" in c or "senales" in c:
             mapping[c] = "indicadores"
         elif "recomendacion" in c:
             mapping[c] = "recomendaciones"
@@ -303,17 +429,41 @@ def _load_recommendations_from_excel(xlsx: Path) -> pd.DataFrame:
     return df
 
 
-def load_data_from_excel(excel_path: str | Path) -> Dict[str, Any]:
-    """Carga datos del Excel."""
+def load_data_from_excel(
+    excel_path: str | Path, timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Carga datos del Excel abriendo el archivo una sola vez.
+    Los tiempos por etapa (segundos) quedan en data["_load_timings"]; si se pasa
+    `timings` se completa ese mismo dict.
+    """
     xlsx = Path(excel_path)
     if not xlsx.exists():
         raise FileNotFoundError(f"No encontré el Excel en: {xlsx}")
 
-    instructions = _load_instructions_from_excel(xlsx)
-    questions = _load_questions_from_excel(xlsx)
-    thresholds = _extract_thresholds_from_formula(xlsx)
-    levels = _load_levels_from_excel(xlsx)
-    recs = _load_recommendations_from_excel(xlsx)
+    owned = timings is None
+    timings = {} if timings is None else timings
+    t0 = time.perf_counter()
+
+    with _stage(timings, "apertura"):
+        book = _open_excel(xlsx)
+    with book:
+        with _stage(timings, "instrucciones"):
+            instructions = _load_instructions_from_excel(book)
+        with _stage(timings, "cuestionario"):
+            questions = _load_questions_from_excel(book)
+        with _stage(timings, "umbrales"):
+            thresholds = _extract_thresholds_from_formula(xlsx)
+        with _stage(timings, "niveles"):
+            levels = _load_levels_from_excel(book, timings)
+        with _stage(timings, "recomendaciones"):
+            recs = _load_recommendations_from_excel(book)
+    with _stage(timings, "indice_recomendaciones"):
+        rec_index = RecommendationIndex.build(recs, questions)
+
+    _emit_timing(timings, "excel", time.perf_counter() - t0)
+    if owned:
+        timings["total"] = timings["excel"]
 
     return {
         "instructions": instructions,
@@ -321,17 +471,34 @@ def load_data_from_excel(excel_path: str | Path) -> Dict[str, Any]:
         "thresholds": thresholds,
         "levels": levels,
         "recommendations": recs,
+        "recommendation_index": rec_index,
+        "_load_timings": timings,
     }
 
 
-def load_data(data_dir: str | Path = "data") -> Dict[str, Any]:
-    """Carga datos desde la carpeta data/ (sin debug logging)."""
+def load_data(
+    data_dir: str | Path = "data",
+    use_snapshot: bool = True,
+    workbook: Optional[str | Path] = None,
+) -> Dict[str, Any]:
+    """
+    Carga datos desde la carpeta data/ (sin debug logging).
+    Con use_snapshot=True reutiliza el snapshot compilado junto al Excel y solo
+    re-parsea el .xlsx cuando cambia su hash o PARSER_VERSION.
+    `workbook` fija el archivo a cargar (p.ej. uno de varios tenants de
+    src/registry.py); si no, se elige con _find_excel_path.
+    Los tiempos de esta carga quedan en data["_load_timings"].
+    """
     d = Path(data_dir)
 
     if not d.exists():
         raise FileNotFoundError(f"La carpeta {d.absolute()} no existe")
 
-    xlsx = _find_excel_path(d)
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+
+    with _stage(timings, "descubrimiento"):
+        xlsx = Path(workbook) if workbook is not None else _find_excel_path(d)
 
     if not xlsx:
         available = list(d.glob("*.xlsx"))
@@ -340,4 +507,16 @@ def load_data(data_dir: str | Path = "data") -> Dict[str, Any]:
             f"Archivos disponibles: {[f.name for f in available]}"
         )
 
-    return load_data_from_excel(xlsx)
+    def _parse(path: Path) -> Dict[str, Any]:
+        return load_data_from_excel(path, timings)
+
+    if use_snapshot:
+        # Incluye hash + lectura del snapshot (y el parseo si no estaba vigente)
+        with _stage(timings, "snapshot"):
+            data = load_with_snapshot(xlsx, _parse, PARSER_VERSION)
+    else:
+        data = _parse(xlsx)
+
+    _emit_timing(timings, "total", time.perf_counter() - t0)
+    data["_load_timings"] = timings
+    return data
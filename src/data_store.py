@@ -0,0 +1,264 @@
+# src/data_store.py
+# -*- coding: utf-8 -*-
+"""
+Datos del Excel con recarga en caliente.
+
+DataStore guarda la versión vigente del libro parseado (instrucciones,
+preguntas, umbrales, niveles y recomendaciones) y la comparte entre sesiones:
+- la primera carga se hace una sola vez aunque lleguen varias sesiones a la vez
+  (doble chequeo con lock: las demás esperan ese mismo parseo);
+- con watch() un observer de watchdog vigila data/; cuando el .xlsx cambia,
+  un hilo en segundo plano lo re-parsea (agrupando los eventos de un mismo
+  guardado), valida el resultado y lo publica con una sola asignación;
+- las lecturas de current() no toman el lock una vez cargados los datos, así
+  que la recarga no bloquea a nadie. app.py fija la versión en session_state:
+  las sesiones en curso siguen con su versión y las nuevas toman la última.
+
+Si la versión nueva no pasa validate_data se conserva la anterior y el error
+queda en stats().
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
+import threading
+import time
+
+from src import data_handler
+from src.snapshot import SNAPSHOT_SUFFIX, workbook_hash
+
+HOT_RELOAD_ENV_VAR = "AUTODIAG_HOT_RELOAD"
+
+# Solo los eventos de escritura: leer el libro (workbook_hash, el parseo) emite
+# "opened" / "closed_no_write", y reaccionar a esos haría que cada recarga
+# programe la siguiente
+WRITE_EVENTS = frozenset({"created", "modified", "moved", "deleted"})
+
+# Un guardado desde Excel/LibreOffice genera varios eventos seguidos
+# (temporal, rename, modified): se espera esta pausa antes de re-parsear
+DEBOUNCE_SECONDS = 1.0
+
+
+def validate_data(data: Dict[str, Any]) -> List[str]:
+    """Problemas que impiden publicar una versión del libro (vacío = válida)."""
+    errors = []
+    questions = data.get("questions") or []
+    if not questions:
+        errors.append("el cuestionario no tiene preguntas")
+    for q in questions:
+        if not q.get("id"):
+            errors.append("hay una pregunta sin id")
+            break
+        if not q.get("options"):
+            errors.append(f"la pregunta {q['id']} no tiene opciones")
+    th = data.get("thresholds") or {}
+    n1, n2 = th.get("nivel_1_max"), th.get("nivel_2_max")
+    if not isinstance(n1, int) or not isinstance(n2, int) or n1 >= n2:
+        errors.append(f"umbrales inválidos: {th}")
+    if not data.get("levels"):
+        errors.append("no se encontraron las hojas de niveles")
+    return errors
+
+
+def is_workbook(path: str) -> bool:
+    """True para un .xlsx de datos (no temporales de Office, ocultos ni snapshots)."""
+    name = os.path.basename(path)
+    return (
+        name.endswith(".xlsx")
+        and not name.startswith(("~$", "."))
+        and not name.endswith(SNAPSHOT_SUFFIX)
+    )
+
+
+def watch_directory(
+    directory: str | Path, on_change: Callable[[str, str], None]
+) -> Optional[Any]:
+    """
+    Observer de watchdog sobre `directory` que llama on_change(ruta, evento)
+    por cada escritura en un libro (WRITE_EVENTS: "created", "modified",
+    "moved", "deleted"); las lecturas no cuentan.
+    Retorna None si watchdog no está instalado o la carpeta no se puede vigilar.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event) -> None:
+            if event.is_directory or event.event_type not in WRITE_EVENTS:
+                return
+            for path in (event.src_path, getattr(event, "dest_path", "") or ""):
+                if path and is_workbook(path):
+                    on_change(path, event.event_type)
+
+    observer = Observer()
+    try:
+        observer.schedule(_Handler(), str(directory), recursive=False)
+        observer.daemon = True
+        observer.start()
+    except OSError:
+        return None
+    return observer
+
+
+class _Version:
+    """Una versión publicada: datos + hash del Excel del que salieron."""
+
+    __slots__ = ("data", "digest", "path", "loaded_at")
+
+    def __init__(self, data: Dict[str, Any], digest: str, path: Path) -> None:
+        self.data = data
+        self.digest = digest
+        self.path = path
+        self.loaded_at = time.time()
+
+
+class DataStore:
+    """Versión vigente del Excel de `data_dir`, con recarga en segundo plano."""
+
+    def __init__(
+        self,
+        data_dir: str | Path = "data",
+        debounce: float = DEBOUNCE_SECONDS,
+        workbook: Optional[str | Path] = None,
+    ) -> None:
+        self.data_dir = Path(data_dir)
+        # Archivo fijo (un tenant de src/registry.py) o None: el que elija data_handler
+        self.workbook = Path(workbook) if workbook is not None else None
+        self.debounce = debounce
+        self._current: Optional[_Version] = None
+        # Serializa la primera carga y las recargas (nunca las lecturas)
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self._observer = None
+        self._reloads = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._last_reload_seconds: Optional[float] = None
+
+    # --- lectura ---
+    def current(self) -> Dict[str, Any]:
+        """Datos vigentes; la primera llamada parsea (una vez por proceso)."""
+        return self.current_version()[0]
+
+    def current_version(self) -> Tuple[Dict[str, Any], str]:
+        """(datos, SHA-256 del Excel) de la misma versión, leídos juntos."""
+        version = self._current
+        if version is None:
+            with self._lock:
+                if self._current is None:
+                    self._current = self._load()
+                version = self._current
+        return version.data, version.digest
+
+    @property
+    def loaded(self) -> bool:
+        return self._current is not None
+
+    @property
+    def digest(self) -> Optional[str]:
+        version = self._current
+        return version.digest if version else None
+
+    # --- carga ---
+    def _excel_path(self) -> Path:
+        if self.workbook is not None:
+            if not self.workbook.exists():
+                raise FileNotFoundError(f"No encontré el Excel en: {self.workbook}")
+            return self.workbook
+        xlsx = data_handler._find_excel_path(self.data_dir)
+        if xlsx is None:
+            raise FileNotFoundError(
+                f"No encontré ningún archivo Excel en {self.data_dir.absolute()}"
+            )
+        return xlsx
+
+    def _load(self) -> _Version:
+        xlsx = self._excel_path()
+        digest = workbook_hash(xlsx)
+        data = data_handler.load_data(self.data_dir, workbook=self.workbook)
+        errors = validate_data(data)
+        if errors:
+            raise ValueError(f"{xlsx.name}: " + "; ".join(errors))
+        return _Version(data, digest, xlsx)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-parsea si el Excel cambió (o siempre con `force`) y publica la nueva
+        versión si es válida. Retorna True si se publicó una versión nueva.
+        """
+        with self._lock:
+            t0 = time.perf_counter()
+            try:
+                xlsx = self._excel_path()
+                current = self._current
+                if (
+                    not force
+                    and current is not None
+                    and current.path == xlsx
+                    and current.digest == workbook_hash(xlsx)
+                ):
+                    return False
+                version = self._load()
+            except Exception as exc:
+                # Libro a medio escribir, hoja faltante, etc.: se sigue con la anterior
+                self._failures += 1
+                self._last_error = f"{type(exc).__name__}: {exc}"
+                return False
+            self._current = version
+            self._reloads += 1
+            self._last_error = None
+            self._last_reload_seconds = time.perf_counter() - t0
+            return True
+
+    def schedule_reload(self) -> None:
+        """Programa reload() en un hilo tras `debounce` segundos sin eventos."""
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    # --- observer ---
+    def watch(self) -> bool:
+        """
+        Empieza a vigilar data_dir con watchdog. Retorna False si watchdog no
+        está instalado o la carpeta no se puede vigilar (sin recarga en caliente).
+        """
+        if self._observer is None:
+            self._observer = watch_directory(
+                self.data_dir, lambda _path, _event: self.schedule_reload()
+            )
+        return self._observer is not None
+
+    def stop(self) -> None:
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def stats(self) -> Dict[str, Any]:
+        version = self._current
+        return {
+            "archivo": version.path.name if version else None,
+            "version": version.digest[:12] if version else None,
+            "cargado": (
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(version.loaded_at))
+                if version
+                else None
+            ),
+            "vigilando": self._observer is not None,
+            "recargas": self._reloads,
+            "fallidas": self._failures,
+            "ultima_recarga_s": self._last_reload_seconds,
+            "ultimo_error": self._last_error,
+        }
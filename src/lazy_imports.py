@@ -0,0 +1,189 @@
+# src/lazy_imports.py
+# -*- coding: utf-8 -*-
+"""
+Importaciones perezosas y perfil de importaciones al arranque.
+
+- lazy_import("openpyxl"): devuelve el módulo sin ejecutarlo; se carga de verdad
+  en el primer acceso a un atributo (bajo un lock: el warm-up y las sesiones lo
+  pueden tocar a la vez). Así la primera carga de la página solo paga
+  por lo que usa (p.ej. openpyxl no se importa si el snapshot está vigente).
+- ImportProfiler: mide, al estilo de `python -X importtime`, el tiempo propio y
+  acumulado de cada módulo importado después de instalarlo. Se activa con
+  AUTODIAG_IMPORT_PROFILE=1 y el resultado se muestra en el panel de debug.
+"""
+
+from __future__ import annotations
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+import importlib
+import importlib.abc
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV_VAR = "AUTODIAG_IMPORT_PROFILE"
+
+
+# Serializa la primera carga de los módulos perezosos. importlib.util.LazyLoader
+# no es seguro entre hilos antes de Python 3.12: el hilo que llega primero cambia
+# la clase del módulo antes de ejecutarlo y otro hilo (warm-up, otra sesión) puede
+# leer el módulo a medio inicializar. RLock: los imports anidados del mismo hilo
+# vuelven a entrar mientras se ejecuta el módulo.
+_LOAD_LOCK = threading.RLock()
+# nombre -> loader real de los módulos que todavía no se ejecutaron
+_PENDING: Dict[str, Any] = {}
+
+
+class _LazyModule(ModuleType):
+    """Módulo que se ejecuta (bajo _LOAD_LOCK) en el primer acceso a un atributo."""
+
+    def __getattribute__(self, attr: str) -> Any:
+        name = ModuleType.__getattribute__(self, "__name__")
+        with _LOAD_LOCK:
+            loader = _PENDING.pop(name, None)
+            if loader is not None:
+                try:
+                    loader.exec_module(self)
+                except BaseException:
+                    sys.modules.pop(name, None)
+                    raise
+                # Recién ahora los demás hilos leen el módulo sin pasar por el lock
+                self.__class__ = ModuleType
+        return ModuleType.__getattribute__(self, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Importa `name` de forma perezosa: el módulo se ejecuta en el primer acceso a
+    un atributo, una sola vez aunque lo toquen varios hilos a la vez.
+    Si el módulo ya está cargado se retorna tal cual.
+    """
+    with _LOAD_LOCK:
+        if name in sys.modules:
+            return sys.modules[name]
+
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"No se encontró el módulo {name!r}")
+        if not hasattr(spec.loader, "exec_module"):
+            raise ImportError(f"{name!r} no admite importación perezosa")
+
+        module = importlib.util.module_from_spec(spec)
+        _PENDING[name] = spec.loader
+        module.__class__ = _LazyModule
+        sys.modules[name] = module
+        return module
+
+
+# ---------- perfil de importaciones ----------
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """
+    Finder que envuelve exec_module de cada loader para medir la ejecución del
+    módulo. Igual que -X importtime: `self_us` excluye los imports anidados y
+    `cumulative_us` los incluye.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # --- MetaPathFinder ---
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.finding = False
+
+        loader = getattr(spec, "loader", None) if spec is not None else None
+        # Loaders "de clase" (builtin/frozen) son compartidos: no se envuelven
+        if (
+            loader is None
+            or isinstance(loader, type)
+            or not hasattr(loader, "exec_module")
+        ):
+            return spec
+
+        loader.exec_module = self._wrap(fullname, loader.exec_module)
+        return spec
+
+    def _wrap(self, name: str, exec_module):
+        def timed_exec(module):
+            stack = self._stack()
+            frame = [0.0]  # tiempo de imports hijos
+            stack.append(frame)
+            t0 = time.perf_counter()
+            try:
+                return exec_module(module)
+            finally:
+                cum = time.perf_counter() - t0
+                stack.pop()
+                if stack:
+                    stack[-1][0] += cum
+                with self._lock:
+                    self.records.append(
+                        {
+                            "module": name,
+                            "self_us": int((cum - frame[0]) * 1e6),
+                            "cumulative_us": int(cum * 1e6),
+                            "depth": len(stack),
+                        }
+                    )
+
+        return timed_exec
+
+    def _stack(self) -> List[List[float]]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    # --- reporte ---
+    def top(self, n: int = 15, by: str = "cumulative_us") -> List[Dict[str, Any]]:
+        """Módulos más costosos; por defecto solo los de primer nivel (depth 0)."""
+        with self._lock:
+            rows = list(self.records)
+        if by == "cumulative_us":
+            rows = [r for r in rows if r["depth"] == 0]
+        return sorted(rows, key=lambda r: r[by], reverse=True)[:n]
+
+    def total_seconds(self) -> float:
+        with self._lock:
+            return (
+                sum(r["cumulative_us"] for r in self.records if r["depth"] == 0) / 1e6
+            )
+
+
+_PROFILER: Optional[ImportProfiler] = None
+
+
+def install_import_profiler() -> ImportProfiler:
+    """Instala el profiler al inicio de sys.meta_path (idempotente)."""
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = ImportProfiler()
+        sys.meta_path.insert(0, _PROFILER)
+    return _PROFILER
+
+
+def install_from_env() -> Optional[ImportProfiler]:
+    """Instala el profiler solo si AUTODIAG_IMPORT_PROFILE=1."""
+    if os.environ.get(PROFILE_ENV_VAR) == "1":
+        return install_import_profiler()
+    return None
+
+
+def get_import_profiler() -> Optional[ImportProfiler]:
+    return _PROFILER
@@ -0,0 +1,532 @@
+# src/pdf_report.py
+# -*- coding: utf-8 -*-
+"""
+Informe PDF del resultado (ReportLab).
+
+- create_result_pdf: un informe -> bytes.
+- cached_result_pdf: lo mismo con un LRU acotado por (nivel, puntaje, áreas,
+  recomendaciones);
+  lo usa el botón de descarga de app.py. prewarm_pdf_cache lo llena al inicio.
+- render_batch: muchos informes repartidos en un pool de procesos, escritos en
+  una carpeta o en un zip a medida que se generan.
+
+La hoja de estilos se construye una sola vez por proceso y el contenido de cada
+nivel (definición, características, ruta) se prepara una sola vez por worker.
+
+Uso (sobre la salida de `python -m src.bulk_import`):
+    python -m src.pdf_report resultados.csv --out-dir reportes/ --name-col empresa
+    python -m src.pdf_report resultados.csv --zip reportes.zip --workers 4
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import argparse
+import hashlib
+import math
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import LETTER
+from reportlab.lib.styles import StyleSheet1, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.recommendations import Recommendation, RecommendationIndex
+
+PDF_FILENAME = "resultado_autodiagnostico_lgbtiq.pdf"
+
+# (título, clave en levels[...]) en el orden del informe
+LEVEL_SECTIONS = (
+    ("Definición", "DEFINICION"),
+    ("Características", "CARACTERISTICAS"),
+    ("Ruta de aprendizaje", "RUTA"),
+)
+
+# Estado por worker (lo llena _init_worker): niveles y su contenido ya
+# preparado para Paragraph
+_LEVELS: Dict[str, Dict[str, str]] = {}
+_LEVEL_BLOCKS: Dict[str, List[Tuple[str, str]]] = {}
+
+
+@lru_cache(maxsize=1)
+def _styles() -> StyleSheet1:
+    """getSampleStyleSheet() una sola vez por proceso."""
+    return getSampleStyleSheet()
+
+
+def _level_blocks(
+    levels: Dict[str, Dict[str, str]], level_key: str
+) -> List[Tuple[str, str]]:
+    """[(título, markup)] del nivel; reutiliza el precalculado del worker si existe."""
+    if levels is _LEVELS and level_key in _LEVEL_BLOCKS:
+        return _LEVEL_BLOCKS[level_key]
+    lv = levels.get(level_key, {})
+    return [
+        (titulo, (lv.get(key) or "(sin contenido)").replace("\n", "<br/>"))
+        for titulo, key in LEVEL_SECTIONS
+    ]
+
+
+def _markup(text: str) -> str:
+    """Texto del Excel como markup de Paragraph (escapado, saltos de línea)."""
+    return escape(text or "").replace("\n", "<br/>")
+
+
+def create_result_pdf(
+    result: Dict[str, Any],
+    levels: Dict[str, Dict[str, str]],
+    areas_dict: Dict[str, int],
+    recommendations: Sequence["Recommendation"] = (),
+) -> bytes:
+    """Genera el PDF del resultado y lo retorna como bytes."""
+    buf = BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=LETTER,
+        leftMargin=0.8 * inch,
+        rightMargin=0.8 * inch,
+        topMargin=0.8 * inch,
+        bottomMargin=0.8 * inch,
+    )
+    styles = _styles()
+    story = []
+
+    story.append(
+        Paragraph(
+            "<b>Autodiagnóstico en inclusión laboral LGBTIQ+</b>",
+            styles["Title"],
+        )
+    )
+    story.append(Spacer(1, 10))
+    story.append(
+        Paragraph(
+            f"<b>Resultado:</b> {result['level_label']} &nbsp;&nbsp; "
+            f"<b>Puntaje total:</b> {int(result['total'])}",
+            styles["Normal"],
+        )
+    )
+    story.append(Spacer(1, 14))
+
+    for titulo, contenido in _level_blocks(levels, result["level_key"]):
+        story.append(Paragraph(f"<b>{titulo}</b>", styles["Heading2"]))
+        story.append(Spacer(1, 4))
+        story.append(Paragraph(contenido, styles["Normal"]))
+        story.append(Spacer(1, 10))
+
+    if areas_dict:
+        story.append(Paragraph("<b>Áreas a fortalecer</b>", styles["Heading2"]))
+        story.append(Spacer(1, 4))
+        for sec_name, sc in areas_dict.items():
+            story.append(
+                Paragraph(
+                    f"• {sec_name} (puntaje ≤ {int(sc)})",
+                    styles["Normal"],
+                )
+            )
+        story.append(Spacer(1, 10))
+
+    if recommendations:
+        story.append(Paragraph("<b>Recomendaciones</b>", styles["Heading2"]))
+        story.append(Spacer(1, 4))
+        for rec in recommendations:
+            story.append(Paragraph(f"<b>{_markup(rec.barrera)}</b>", styles["Normal"]))
+            story.append(Spacer(1, 2))
+            story.append(
+                Paragraph(
+                    _markup(rec.recomendaciones or rec.concepto), styles["Normal"]
+                )
+            )
+            story.append(Spacer(1, 8))
+
+    doc.build(story)
+    pdf = buf.getvalue()
+    buf.close()
+    return pdf
+
+
+# ---------- caché de PDF ya generados ----------
+
+# Clave: (huella de niveles, level_key, level_label, total, áreas,
+#         huella de las recomendaciones)
+PdfKey = Tuple[str, str, str, int, Tuple[Tuple[str, int], ...], str]
+
+
+class PdfCache:
+    """LRU acotado de bytes de PDF, seguro entre hilos, con contadores hit/miss."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[PdfKey, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: PdfKey) -> Optional[bytes]:
+        with self._lock:
+            pdf = self._data.get(key)
+            if pdf is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return pdf
+
+    def __contains__(self, key: PdfKey) -> bool:
+        # No cuenta como hit/miss (lo usa el pre-calentamiento)
+        with self._lock:
+            return key in self._data
+
+    def put(self, key: PdfKey, pdf: bytes) -> None:
+        with self._lock:
+            self._data[key] = pdf
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes": sum(len(v) for v in self._data.values()),
+            }
+
+
+_PDF_CACHE = PdfCache()
+
+
+def _levels_fingerprint(levels: Dict[str, Dict[str, str]]) -> str:
+    """Huella del contenido de niveles: un Excel nuevo no reutiliza PDFs viejos."""
+    h = hashlib.sha1()
+    for key in sorted(levels):
+        for field, text in sorted(levels[key].items()):
+            h.update(f"{key}\x1f{field}\x1f{text}\x1e".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _recommendations_fingerprint(recommendations: Sequence["Recommendation"]) -> str:
+    h = hashlib.sha1()
+    for rec in recommendations:
+        h.update(f"{rec.barrera}\x1f{rec.recomendaciones}\x1e".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _pdf_key(
+    result: Dict[str, Any],
+    levels: Dict[str, Dict[str, str]],
+    areas_dict: Dict[str, int],
+    recommendations: Sequence["Recommendation"] = (),
+) -> PdfKey:
+    return (
+        _levels_fingerprint(levels),
+        str(result["level_key"]),
+        str(result["level_label"]),
+        int(result["total"]),
+        tuple((str(sec), int(sc)) for sec, sc in areas_dict.items()),
+        _recommendations_fingerprint(recommendations),
+    )
+
+
+def cached_result_pdf(
+    result: Dict[str, Any],
+    levels: Dict[str, Dict[str, str]],
+    areas_dict: Dict[str, int],
+    recommendations: Sequence["Recommendation"] = (),
+) -> bytes:
+    """create_result_pdf con memoización en el LRU del proceso."""
+    key = _pdf_key(result, levels, areas_dict, recommendations)
+    pdf = _PDF_CACHE.get(key)
+    if pdf is None:
+        pdf = create_result_pdf(result, levels, areas_dict, recommendations)
+        _PDF_CACHE.put(key, pdf)
+    return pdf
+
+
+def pdf_cache_stats() -> Dict[str, Any]:
+    return _PDF_CACHE.stats()
+
+
+def configure_pdf_cache(maxsize: int) -> None:
+    """Cambia el tamaño máximo del LRU (vacía la caché)."""
+    global _PDF_CACHE
+    _PDF_CACHE = PdfCache(maxsize=maxsize)
+
+
+def _common_answer_sets(questions: List[Dict[str, Any]]) -> List[Dict[str, int]]:
+    """
+    Combinaciones frecuentes: todo 3, todo 2, todo 1 y "todo 3 salvo una
+    pregunta en 2" (una sola área a fortalecer), por cada pregunta.
+    """
+    ids = [q["id"] for q in questions]
+    sets = [{qid: s for qid in ids} for s in (3, 2, 1)]
+    for qid in ids:
+        answers = {x: 3 for x in ids}
+        answers[qid] = 2
+        sets.append(answers)
+    return sets
+
+
+def prewarm_pdf_cache(
+    levels: Dict[str, Dict[str, str]],
+    questions: List[Dict[str, Any]],
+    thresholds: Dict[str, int],
+    answer_sets: Optional[Iterable[Dict[str, int]]] = None,
+    index: Optional["RecommendationIndex"] = None,
+) -> int:
+    """
+    Renderiza de antemano las combinaciones más comunes (o las indicadas en
+    `answer_sets`) y las deja en la caché. Retorna cuántos PDF se generaron.
+    Con `index` incluye las recomendaciones, como el botón de descarga.
+    """
+    from src.quiz_logic import WEAK_SCORE_MAX, calculate_score, sections_to_improve
+
+    rendered = 0
+    for answers in answer_sets or _common_answer_sets(questions):
+        result = calculate_score(answers, thresholds)
+        areas = sections_to_improve(answers, questions)
+        recs = (
+            index.match(
+                {q: s for q, s in answers.items() if s <= WEAK_SCORE_MAX}, areas
+            )
+            if index is not None
+            else []
+        )
+        key = _pdf_key(result, levels, areas, recs)
+        if key not in _PDF_CACHE:
+            _PDF_CACHE.put(key, create_result_pdf(result, levels, areas, recs))
+            rendered += 1
+    return rendered
+
+
+# ---------- generación por lotes ----------
+
+
+def _init_worker(levels: Dict[str, Dict[str, str]]) -> None:
+    """Inicializa un worker: estilos + contenido de niveles, una sola vez."""
+    global _LEVELS
+    _LEVELS = levels
+    _styles()
+    _LEVEL_BLOCKS.clear()
+    for key in levels:
+        _LEVEL_BLOCKS[key] = _level_blocks(levels, key)
+
+
+def _render_item(item: Dict[str, Any]) -> Tuple[str, bytes]:
+    pdf = create_result_pdf(
+        item["result"], _LEVELS, item["areas"], item.get("recommendations", ())
+    )
+    return item["name"], pdf
+
+
+def _safe_filename(name: str) -> str:
+    s = re.sub(r"[^\w.-]+", "_", str(name), flags=re.UNICODE).strip("._")
+    s = s or "resultado"
+    return s if s.lower().endswith(".pdf") else f"{s}.pdf"
+
+
+def _available_cpus() -> int:
+    # En contenedores la afinidad refleja las CPU asignadas, no las del host
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def iter_render(
+    items: Iterable[Dict[str, Any]],
+    levels: Dict[str, Dict[str, str]],
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Genera (nombre, pdf) para cada item {"name", "result", "areas"} (y
+    opcionalmente "recommendations", como en el botón de descarga).
+    Con workers > 1 reparte el trabajo en un ProcessPoolExecutor.
+    """
+    workers = workers or _available_cpus()
+    if workers <= 1:
+        _init_worker(levels)
+        for item in items:
+            yield _render_item(item)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(levels,)
+    ) as pool:
+        yield from pool.map(_render_item, items, chunksize=chunksize)
+
+
+def render_batch(
+    items: Iterable[Dict[str, Any]],
+    levels: Dict[str, Dict[str, str]],
+    out_dir: Optional[str | Path] = None,
+    zip_target: Optional[str | Path | BinaryIO] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+) -> Dict[str, Any]:
+    """
+    Genera un PDF por item y lo escribe en `out_dir` o en `zip_target`
+    (ruta o stream binario). Retorna {"count", "bytes", "seconds", "per_second"}.
+    """
+    if (out_dir is None) == (zip_target is None):
+        raise ValueError("Indica exactamente uno de out_dir o zip_target")
+
+    count = total_bytes = 0
+    seen: Dict[str, int] = {}
+    t0 = time.perf_counter()
+
+    def _unique(name: str) -> str:
+        fn = _safe_filename(name)
+        n = seen.get(fn, 0)
+        seen[fn] = n + 1
+        return fn if n == 0 else f"{fn[:-4]}_{n}.pdf"
+
+    rendered = iter_render(items, levels, workers, chunksize)
+    if out_dir is not None:
+        d = Path(out_dir)
+        d.mkdir(parents=True, exist_ok=True)
+        for name, pdf in rendered:
+            (d / _unique(name)).write_bytes(pdf)
+            count += 1
+            total_bytes += len(pdf)
+    else:
+        # Los PDF ya vienen comprimidos: ZIP_STORED evita recomprimir
+        with zipfile.ZipFile(zip_target, "w", zipfile.ZIP_STORED) as zf:
+            for name, pdf in rendered:
+                zf.writestr(_unique(name), pdf)
+                count += 1
+                total_bytes += len(pdf)
+
+    seconds = time.perf_counter() - t0
+    return {
+        "count": count,
+        "bytes": total_bytes,
+        "seconds": seconds,
+        "per_second": count / seconds if seconds else 0.0,
+    }
+
+
+def _answer_score(value: Any) -> Optional[float]:
+    """Puntaje de una celda de respuesta; None si está vacía o no es numérica."""
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(score) else score
+
+
+def items_from_results(
+    df: pd.DataFrame,
+    name_col: Optional[str] = None,
+    index: Optional["RecommendationIndex"] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Items de render_batch a partir de la salida de src.bulk_import
+    (total, level_key, level_label, areas_a_fortalecer y una columna por sección).
+    Con `index` cada item lleva sus recomendaciones: por las secciones a
+    fortalecer y, si el archivo trae columnas de preguntas, por sus respuestas
+    bajas.
+    """
+    from src.quiz_logic import WEAK_SCORE_MAX
+
+    cols = list(df.columns)
+    question_cols = [c for c in cols if index is not None and c in index.by_question]
+    for i, row in enumerate(df.itertuples(index=False, name=None)):
+        rec = dict(zip(cols, row))
+        areas_txt = rec.get("areas_a_fortalecer")
+        names = str(areas_txt).split("; ") if isinstance(areas_txt, str) else []
+        areas = {s: int(float(rec[s])) for s in names if s and s in rec}
+        recs: Sequence["Recommendation"] = ()
+        if index is not None:
+            scores = {q: _answer_score(rec[q]) for q in question_cols}
+            low = {
+                q: int(s)
+                for q, s in scores.items()
+                if s is not None and s <= WEAK_SCORE_MAX
+            }
+            recs = index.match(low, areas)
+        yield {
+            "name": str(rec[name_col]) if name_col else f"resultado_{i + 1:06d}",
+            "result": {
+                "total": int(rec["total"]),
+                "level_key": rec["level_key"],
+                "level_label": rec["level_label"],
+            },
+            "areas": areas,
+            "recommendations": recs,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import pandas as pd
+
+    from src.data_handler import load_data
+
+    ap = argparse.ArgumentParser(
+        description="Genera un PDF por fila de resultados de src.bulk_import."
+    )
+    ap.add_argument("results", help="CSV o Parquet generado por src.bulk_import")
+    target = ap.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out-dir", help="Carpeta donde escribir los PDF")
+    target.add_argument("--zip", help="Archivo .zip de salida")
+    ap.add_argument("--name-col", default=None, help="Columna para nombrar cada PDF")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--data-dir", default="data")
+    args = ap.parse_args(argv)
+
+    path = Path(args.results)
+    df = (
+        pd.read_parquet(path)
+        if path.suffix.lower() == ".parquet"
+        else pd.read_csv(path)
+    )
+    data = load_data(args.data_dir)
+    items = items_from_results(df, args.name_col, data["recommendation_index"])
+
+    stats = render_batch(
+        items,
+        data["levels"],
+        out_dir=args.out_dir,
+        zip_target=args.zip,
+        workers=args.workers,
+    )
+    print(
+        f"{stats['count']} PDF en {stats['seconds']:.2f}s "
+        f"({stats['per_second']:.1f} PDF/s, {stats['bytes'] / 1e6:.1f} MB)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# src/percentiles.py
+# -*- coding: utf-8 -*-
+"""
+Percentiles del puntaje total y por sección frente a las demás empresas.
+
+Por cada (tenant, versión del cuestionario) y cada ámbito (total o sección) se
+guarda la distribución de puntajes como un arreglo de conteos acumulados:
+cum[s] = cuántos resultados tienen puntaje <= s. Los puntajes son enteros
+acotados (0..máximo del cuestionario), así que el arreglo es chico y:
+- consultar un percentil son dos lecturas del arreglo, O(1) sin importar
+  cuántos resultados haya;
+- sumar un resultado nuevo suma 1 desde cum[s] hasta el final (a lo sumo el
+  máximo del cuestionario de posiciones), sin releer la base.
+
+El índice se arma desde rollup_scores (src/results_store.py) la primera vez que
+se consulta una versión, suma en memoria lo que envía este proceso y se
+refresca desde la base cada REFRESH_SECONDS para incluir lo de otros procesos.
+
+Uso:
+    index = shared_percentile_index("results/autodiagnostico.db")
+    pct = index.lookup(tenant, version, res["total"], state.section_totals())
+    index.add(tenant, version, res["total"], state.section_totals())
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from array import array
+from itertools import accumulate
+import sqlite3
+import threading
+import time
+
+from src.results_store import TOTAL_SCOPE
+
+# Con menos resultados que esto el percentil no se muestra
+MIN_SAMPLE = 20
+REFRESH_SECONDS = 60.0
+
+
+class ScoreDistribution:
+    """Conteos acumulados de puntajes enteros >= 0 (crece si llega uno mayor)."""
+
+    __slots__ = ("cum",)
+
+    def __init__(self, size: int = 1) -> None:
+        # array("q"): enteros de 64 bits contiguos, y leer uno da un int de Python
+        # sin el costo de convertir un escalar de numpy en cada consulta
+        self.cum = array("q", bytes(8 * max(size, 1)))
+
+    @classmethod
+    def from_counts(cls, counts: Dict[int, int]) -> "ScoreDistribution":
+        dist = cls(max(counts, default=0) + 1)
+        for score, n in counts.items():
+            if score >= 0:
+                dist.cum[score] += n
+        dist.cum = array("q", accumulate(dist.cum))
+        return dist
+
+    @property
+    def n(self) -> int:
+        return self.cum[-1]
+
+    def add(self, score: int, n: int = 1) -> None:
+        score = max(int(score), 0)
+        cum = self.cum
+        if score >= len(cum):
+            cum.extend([cum[-1]] * (score + 1 - len(cum)))
+        for s in range(score, len(cum)):
+            cum[s] += n
+
+    def percentile(self, score: int) -> Optional[float]:
+        """
+        Percentil (0-100) de `score` con rango medio: los de puntaje menor
+        cuentan entero y los empatados por la mitad. None si no hay datos.
+        """
+        cum = self.cum
+        total = cum[-1]
+        if not total:
+            return None
+        if score <= 0:
+            below = 0
+            at_or_below = cum[0] if score == 0 else 0
+        else:
+            last = len(cum) - 1
+            below = cum[score - 1] if score <= last else total
+            at_or_below = cum[score] if score <= last else total
+        return 100.0 * (below + at_or_below) / (2 * total)
+
+
+Key = Tuple[str, str]
+
+
+class PercentileIndex:
+    """Distribuciones por (tenant, versión) y ámbito, cargadas de rollup_scores."""
+
+    def __init__(
+        self,
+        path: Optional[str | Path],
+        refresh_seconds: float = REFRESH_SECONDS,
+        min_sample: int = MIN_SAMPLE,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.refresh_seconds = refresh_seconds
+        self.min_sample = min_sample
+        self._dists: Dict[Key, Dict[str, ScoreDistribution]] = {}
+        self._loaded_at: Dict[Key, float] = {}
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._loads = 0
+
+    def _read(self, key: Key) -> Dict[str, ScoreDistribution]:
+        counts: Dict[str, Dict[int, int]] = {}
+        if self.path is None or not self.path.exists():
+            return {}
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+        try:
+            rows = conn.execute(
+                "SELECT scope, score, n FROM rollup_scores "
+                "WHERE tenant = ? AND questionnaire = ?",
+                key,
+            )
+            for scope, score, n in rows:
+                counts.setdefault(scope, {})[int(score)] = int(n)
+        except sqlite3.OperationalError:
+            return {}
+        finally:
+            conn.close()
+        return {scope: ScoreDistribution.from_counts(c) for scope, c in counts.items()}
+
+    def _dists_for(self, key: Key) -> Dict[str, ScoreDistribution]:
+        now = time.monotonic()
+        loaded_at = self._loaded_at.get(key)
+        if loaded_at is not None and now - loaded_at < self.refresh_seconds:
+            return self._dists[key]
+        # Lectura fuera del lock; si otra sesión recarga a la vez gana la última
+        dists = self._read(key)
+        with self._lock:
+            self._dists[key] = dists
+            self._loaded_at[key] = now
+            self._loads += 1
+        return dists
+
+    def lookup(
+        self,
+        tenant: str,
+        version: Optional[str],
+        total: int,
+        sections: Optional[Dict[str, int]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        {"total": pct, "sections": {sección: pct}, "n": resultados comparados},
+        o None si todavía no hay MIN_SAMPLE resultados de esta versión.
+        """
+        self._lookups += 1
+        dists = self._dists_for((tenant, version or ""))
+        total_dist = dists.get(TOTAL_SCOPE)
+        if total_dist is None or total_dist.n < self.min_sample:
+            return None
+        out: Dict[str, Any] = {
+            "total": total_dist.percentile(total),
+            "sections": {},
+            "n": total_dist.n,
+        }
+        for section, score in (sections or {}).items():
+            dist = dists.get(section)
+            if dist is not None and dist.n >= self.min_sample:
+                out["sections"][section] = dist.percentile(score)
+        return out
+
+    def add(
+        self,
+        tenant: str,
+        version: Optional[str],
+        total: int,
+        sections: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Suma un resultado recién enviado (el writer lo guarda en rollup_scores)."""
+        key = (tenant, version or "")
+        with self._lock:
+            dists = self._dists.get(key)
+            if dists is None:
+                # Se cargará completo (incluido este resultado) en la próxima consulta
+                return
+            dists.setdefault(TOTAL_SCOPE, ScoreDistribution()).add(total)
+            for section, score in (sections or {}).items():
+                dists.setdefault(section, ScoreDistribution()).add(score)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "versiones": len(self._dists),
+            "consultas": self._lookups,
+            "cargas": self._loads,
+            "resultados": {
+                f"{tenant}@{version or '-'}": dists[TOTAL_SCOPE].n
+                for (tenant, version), dists in self._dists.items()
+                if TOTAL_SCOPE in dists
+            },
+        }
+
+
+_INDEXES: Dict[Path, PercentileIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def shared_percentile_index(path: str | Path) -> PercentileIndex:
+    """PercentileIndex del proceso para la base `path`."""
+    key = Path(path).resolve()
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = PercentileIndex(key)
+    return index
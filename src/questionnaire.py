@@ -0,0 +1,178 @@
+# src/questionnaire.py
+# -*- coding: utf-8 -*-
+"""
+Cuestionario tipado e inmutable.
+
+data_handler entrega las preguntas como lista de dicts (es lo que se guarda en
+el snapshot y lo que consumen el CLI y los informes). Questionnaire es la
+versión compacta para la app: Question/Option con __slots__, nombres de
+sección internados y el índice id -> sección (el que usan sections_to_improve
+y score_batch) calculado una sola vez.
+
+Question y Option también responden a q["id"] / q.get("section"), y
+Questionnaire es una secuencia de Question, así que se puede pasar tal cual
+donde antes iba la lista de dicts (sections_to_improve, score_batch,
+RunningScore, el modelo de render).
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+import sys
+
+
+class FrozenSlots:
+    """Base con __slots__: los atributos se fijan en __init__ y no cambian."""
+
+    __slots__ = ()
+
+    def _init(self, **values: Any) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+
+class _Record(FrozenSlots):
+    """Acceso estilo dict (r["campo"], r.get("campo")) sobre los slots."""
+
+    __slots__ = ()
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        return default if value is None else value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__slots__ and getattr(self, name) is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        }
+
+
+class Option(_Record):
+    __slots__ = ("score", "label")
+
+    def __init__(self, score: int, label: str) -> None:
+        self._init(score=int(score), label=str(label))
+
+    def __reduce__(self):
+        return (Option, (self.score, self.label))
+
+    def __repr__(self) -> str:
+        return f"Option({self.score}, {self.label!r})"
+
+
+class Question(_Record):
+    __slots__ = ("id", "section", "text", "options", "key")
+
+    def __init__(
+        self,
+        id: str,
+        section: str,
+        text: str,
+        options: Sequence[Option],
+        key: Optional[str] = None,
+    ) -> None:
+        self._init(
+            id=sys.intern(str(id)),
+            section=sys.intern(str(section or "")),
+            text=str(text),
+            options=tuple(options),
+            key=key,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = super().to_dict()
+        out["options"] = [o.to_dict() for o in self.options]
+        return out
+
+    def __reduce__(self):
+        return (Question, (self.id, self.section, self.text, self.options, self.key))
+
+    def __repr__(self) -> str:
+        return f"Question({self.id!r}, {self.section!r})"
+
+
+class Questionnaire(FrozenSlots):
+    """
+    Secuencia inmutable de Question con índices precalculados:
+    - ids / keys: tuplas en el orden del cuestionario
+    - sections: secciones distintas en orden de aparición
+    - section_of: id -> sección
+    """
+
+    __slots__ = ("questions", "ids", "keys", "sections", "section_of")
+
+    def __init__(self, questions: Sequence[Question]) -> None:
+        questions = tuple(questions)
+        section_of: Dict[str, str] = {}
+        for q in questions:
+            # Igual que el dict de sections_to_improve: ante ids repetidos gana el último
+            section_of[q.id] = q.section
+
+        self._init(
+            questions=questions,
+            ids=tuple(q.id for q in questions),
+            keys=tuple(q.key for q in questions),
+            sections=tuple(dict.fromkeys(q.section for q in questions)),
+            section_of=section_of,
+        )
+
+    # --- secuencia ---
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __iter__(self) -> Iterator[Question]:
+        return iter(self.questions)
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        return self.questions[i]
+
+    def __reduce__(self):
+        return (Questionnaire, (self.questions,))
+
+    # --- conversión ---
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [q.to_dict() for q in self.questions]
+
+    @classmethod
+    def from_dicts(cls, questions: Sequence[Dict[str, Any]]) -> "Questionnaire":
+        """Construye desde la salida de data_handler (opciones ordenadas 3,2,1)."""
+        return cls(
+            Question(
+                q.get("id", ""),
+                q.get("section", ""),
+                q.get("text", ""),
+                [
+                    Option(o["score"], o.get("label", ""))
+                    for o in sorted(
+                        q.get("options", []),
+                        key=lambda x: int(x["score"]),
+                        reverse=True,
+                    )
+                ],
+                q.get("key"),
+            )
+            for q in questions
+        )
+
+
+def as_questionnaire(
+    questions: Union[Questionnaire, Sequence[Dict[str, Any]]],
+) -> Questionnaire:
+    """Questionnaire tal cual, o construido desde la lista de dicts."""
+    if isinstance(questions, Questionnaire):
+        return questions
+    return Questionnaire.from_dicts(questions)
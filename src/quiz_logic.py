@@ -1,7 +1,38 @@
 # src/quiz_logic.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from typing import Dict, Any, List
+from collections import Counter
+import hashlib
+import json
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Tuple, Union
+
+from src.lazy_imports import lazy_import
+
+if TYPE_CHECKING:
+    from src.questionnaire import Questionnaire
+
+# Solo las funciones por lotes usan NumPy/pandas
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# (level_key, level_label) en orden de umbral
+LEVELS = (
+    ("Nivel 1", "Nivel 1 – Inicial"),
+    ("Nivel 2", "Nivel 2 – Intermedio"),
+    ("Nivel 3", "Nivel 3 – Avanzado"),
+)
+
+# Puntaje máximo que marca una sección como "a fortalecer"
+WEAK_SCORE_MAX = 2
+
+# Lista de dicts de data_handler o un Questionnaire (src/questionnaire.py)
+Questions = Union[List[Dict[str, Any]], "Questionnaire"]
+
+
+def _threshold_values(thresholds: Dict[str, int]) -> Tuple[int, int]:
+    n1 = int(thresholds.get("nivel_1_max", 15))
+    n2 = int(thresholds.get("nivel_2_max", 23))
+    return n1, n2
 
 
 def calculate_score(
@@ -12,35 +43,296 @@ def calculate_score(
     thresholds: {'nivel_1_max': 15, 'nivel_2_max': 23}
     """
     total = sum(int(v) for v in answers.values())
-    n1 = int(thresholds.get("nivel_1_max", 15))
-    n2 = int(thresholds.get("nivel_2_max", 23))
+    level_key, level_label = level_for_total(total, thresholds)
+    return {"total": total, "level_key": level_key, "level_label": level_label}
 
+
+def level_for_total(total: int, thresholds: Dict[str, int]) -> Tuple[str, str]:
+    """(level_key, level_label) que corresponde a un puntaje total."""
+    n1, n2 = _threshold_values(thresholds)
     if total <= n1:
-        level_key = "Nivel 1"
-        level_label = "Nivel 1 – Inicial"
-    elif total <= n2:
-        level_key = "Nivel 2"
-        level_label = "Nivel 2 – Intermedio"
-    else:
-        level_key = "Nivel 3"
-        level_label = "Nivel 3 – Avanzado"
+        return LEVELS[0]
+    if total <= n2:
+        return LEVELS[1]
+    return LEVELS[2]
 
-    return {"total": total, "level_key": level_key, "level_label": level_label}
+
+def _section_map(questions: Questions) -> Dict[str, str]:
+    """id -> sección; un Questionnaire ya lo trae precalculado."""
+    section_of = getattr(questions, "section_of", None)
+    if section_of is not None:
+        return section_of
+    return {q["id"]: q.get("section", "") for q in questions}
 
 
 def sections_to_improve(
-    answers: Dict[str, int], questions: List[Dict[str, Any]]
+    answers: Dict[str, int], questions: Questions
 ) -> Dict[str, int]:
     """
     Identifica secciones con respuestas <= 2, para orientar recomendaciones.
     Retorna {seccion: puntaje_min_detectado}
     """
-    id_to_section = {q["id"]: q.get("section", "") for q in questions}
+    id_to_section = _section_map(questions)
     secc_low: Dict[str, int] = {}
     for qid, score in answers.items():
         sec = id_to_section.get(qid, "General")
         s = int(score)
-        if s <= 2:
+        if s <= WEAK_SCORE_MAX:
             prev = secc_low.get(sec, 3)
             secc_low[sec] = min(prev, s)
     return secc_low
+
+
+# ---------- claves estables ----------
+
+
+def question_key(q: Dict[str, Any]) -> str:
+    """Hash corto del contenido de la pregunta (id + enunciado + opciones)."""
+    opts = sorted(q.get("options", []), key=lambda o: int(o["score"]), reverse=True)
+    payload = json.dumps(
+        [
+            str(q.get("id", "")),
+            str(q.get("text", "")),
+            [[int(o["score"]), str(o.get("label", ""))] for o in opts],
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def question_keys(questions: Questions) -> List[str]:
+    """
+    Claves deterministas para widgets y respuestas: no dependen de la sesión ni
+    de la posición, así que sobreviven a recargas del Excel si la pregunta no
+    cambia. Ids repetidos con distinto contenido ya dan claves distintas; las
+    preguntas idénticas repetidas llevan sufijo ~2, ~3, ...
+    """
+    seen: Dict[str, int] = {}
+    keys: List[str] = []
+    for q in questions:
+        key = question_key(q)
+        n = seen[key] = seen.get(key, 0) + 1
+        keys.append(key if n == 1 else f"{key}~{n}")
+    return keys
+
+
+# ---------- evaluación incremental ----------
+
+
+class RunningScore:
+    """
+    Agregados de un cuestionario en curso, actualizados en O(1) por respuesta:
+    respondidas, puntaje total y, por sección, cuántas respuestas hay de cada
+    puntaje (el mínimo sale de ahí sin recorrer las preguntas).
+
+    Las respuestas se indexan por `keys` (por defecto, el id de cada pregunta;
+    la UI usa question_keys para que ids repetidos no se pisen).
+    result() y areas() equivalen a calculate_score y sections_to_improve sobre
+    `answers`, con las áreas en el orden del cuestionario.
+    """
+
+    def __init__(
+        self, questions: Questions, keys: Optional[Sequence[str]] = None
+    ) -> None:
+        if keys is None:
+            keys = [q["id"] for q in questions]
+        self.keys = tuple(keys)
+        # clave -> (posición de la 1ª aparición, sección)
+        self._meta: Dict[str, Tuple[int, str]] = {}
+        for idx, (key, q) in enumerate(zip(self.keys, questions)):
+            first = self._meta.get(key, (idx, ""))[0]
+            self._meta[key] = (first, q.get("section", ""))
+
+        self.answers: Dict[str, int] = {}
+        self.labels: Dict[str, str] = {}
+        self.total = 0
+        self._counts: Dict[str, Counter] = {}  # sección -> {puntaje: n}
+        self._low: Dict[str, set] = {}  # sección -> posiciones con puntaje bajo
+
+    @property
+    def answered(self) -> int:
+        return len(self.answers)
+
+    def set(self, qid: str, score: int, label: str = "") -> None:
+        """
+        Registra (o reemplaza) la respuesta de la pregunta con clave `qid`.
+        KeyError si `qid` no es una de las claves del cuestionario.
+        """
+        if qid not in self._meta:
+            raise KeyError(f"Pregunta desconocida: {qid!r}")
+        self.clear(qid)
+        score = int(score)
+        idx, sec = self._meta[qid]
+        self.answers[qid] = score
+        self.labels[qid] = label
+        self.total += score
+        self._counts.setdefault(sec, Counter())[score] += 1
+        if score <= WEAK_SCORE_MAX:
+            self._low.setdefault(sec, set()).add(idx)
+
+    def clear(self, qid: str) -> None:
+        """Quita la respuesta de `qid` (no hace nada si no estaba respondida)."""
+        score = self.answers.pop(qid, None)
+        if score is None:
+            return
+        self.labels.pop(qid, None)
+        self.total -= score
+        idx, sec = self._meta[qid]
+        counts = self._counts[sec]
+        counts[score] -= 1
+        if not counts[score]:
+            del counts[score]
+        if not counts:
+            del self._counts[sec]
+        low = self._low.get(sec)
+        if low is not None:
+            low.discard(idx)
+            if not low:
+                del self._low[sec]
+
+    def carry_over(self, previous: "RunningScore") -> None:
+        """Copia las respuestas de `previous` cuyas claves siguen existiendo."""
+        for key, score in previous.answers.items():
+            if key in self._meta:
+                self.set(key, score, previous.labels.get(key, ""))
+
+    def section_min(self, section: str) -> Optional[int]:
+        """Puntaje mínimo respondido en la sección (None si no hay respuestas)."""
+        counts = self._counts.get(section)
+        return min(counts) if counts else None
+
+    def result(self, thresholds: Dict[str, int]) -> Dict[str, Any]:
+        level_key, level_label = level_for_total(self.total, thresholds)
+        return {"total": self.total, "level_key": level_key, "level_label": level_label}
+
+    def areas(self) -> Dict[str, int]:
+        """{sección: puntaje mínimo} de las secciones con respuestas <= WEAK_SCORE_MAX."""
+        ordered = sorted(self._low, key=lambda sec: min(self._low[sec]))
+        return {sec: min(self._counts[sec]) for sec in ordered}
+
+    def section_totals(self) -> Dict[str, int]:
+        """{sección: suma de sus respuestas}, en el orden del cuestionario."""
+        totals: Dict[str, int] = {}
+        for _, sec in sorted(self._meta.values()):
+            if sec not in totals and sec in self._counts:
+                counts = self._counts[sec]
+                totals[sec] = sum(score * n for score, n in counts.items())
+        return totals
+
+
+# ---------- evaluación por lotes ----------
+
+
+def score_batch(
+    answers: Union[pd.DataFrame, np.ndarray],
+    questions: Questions,
+    thresholds: Dict[str, int],
+    question_ids: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Versión vectorizada de calculate_score + sections_to_improve para una matriz
+    de respuestas (empresas × preguntas).
+
+    - DataFrame: las columnas son ids de pregunta.
+    - ndarray: columnas en el orden de `question_ids` (por defecto, el de `questions`).
+    Las celdas NaN cuentan como pregunta no respondida (igual que omitirla del dict).
+
+    Retorna:
+        {
+          "total": int64[n], "level_key": object[n], "level_label": object[n],
+          "sections": [nombres de sección],
+          "section_min": float[n, S]  (mínimo por sección; NaN si no hay respuestas),
+          "weak": bool[n, S]          (sección a fortalecer),
+          "first_low": int64[n, S]    (columna de la 1ª respuesta baja, para ordenar),
+        }
+    Usar `batch_row_areas(resultado, i)` para obtener el dict de sections_to_improve.
+    """
+    if isinstance(answers, pd.DataFrame):
+        ids = [str(c) for c in answers.columns]
+        mat = answers.to_numpy(dtype=float)
+    else:
+        mat = np.asarray(answers, dtype=float)
+        if mat.ndim != 2:
+            raise ValueError(
+                "La matriz de respuestas debe ser 2D (empresas × preguntas)"
+            )
+        if question_ids is not None:
+            ids = [str(x) for x in question_ids]
+        else:
+            ids = list(getattr(questions, "ids", None) or [q["id"] for q in questions])
+
+    if mat.shape[1] != len(ids):
+        raise ValueError(
+            f"La matriz tiene {mat.shape[1]} columnas pero hay {len(ids)} ids de pregunta"
+        )
+
+    # int() trunca hacia cero: mismo criterio que calculate_score
+    mat = np.trunc(mat)
+    answered = ~np.isnan(mat)
+    total = np.where(answered, mat, 0).sum(axis=1).astype(np.int64)
+
+    n1, n2 = _threshold_values(thresholds)
+    level_idx = np.where(total <= n1, 0, np.where(total <= n2, 1, 2))
+    level_key = np.array([k for k, _ in LEVELS], dtype=object)[level_idx]
+    level_label = np.array([lbl for _, lbl in LEVELS], dtype=object)[level_idx]
+
+    # Columnas agrupadas por sección (ids desconocidos -> "General")
+    id_to_section = _section_map(questions)
+    sections: List[str] = []
+    sec_cols: Dict[str, List[int]] = {}
+    for j, qid in enumerate(ids):
+        sec = id_to_section.get(qid, "General")
+        if sec not in sec_cols:
+            sections.append(sec)
+            sec_cols[sec] = []
+        sec_cols[sec].append(j)
+
+    n = mat.shape[0]
+    section_min = np.full((n, len(sections)), np.nan)
+    first_low = np.full((n, len(sections)), len(ids), dtype=np.int64)
+    masked = np.where(answered, mat, np.inf)
+    low = answered & (mat <= WEAK_SCORE_MAX)
+
+    for s, sec in enumerate(sections):
+        cols = sec_cols[sec]
+        m = masked[:, cols].min(axis=1)
+        section_min[:, s] = np.where(np.isfinite(m), m, np.nan)
+        low_s = low[:, cols]
+        first_low[:, s] = np.where(
+            low_s.any(axis=1), np.asarray(cols)[low_s.argmax(axis=1)], len(ids)
+        )
+
+    weak = section_min <= WEAK_SCORE_MAX
+
+    return {
+        "total": total,
+        "level_key": level_key,
+        "level_label": level_label,
+        "sections": sections,
+        "section_min": section_min,
+        "weak": weak,
+        "first_low": first_low,
+    }
+
+
+def batch_row_areas(batch: Dict[str, Any], i: int) -> Dict[str, int]:
+    """Dict {seccion: puntaje_min} de la fila i, igual al de sections_to_improve."""
+    weak_idx = np.flatnonzero(batch["weak"][i])
+    order = weak_idx[np.argsort(batch["first_low"][i, weak_idx], kind="stable")]
+    return {
+        batch["sections"][s]: int(batch["section_min"][i, s]) for s in order.tolist()
+    }
+
+
+def batch_to_frame(batch: Dict[str, Any]) -> pd.DataFrame:
+    """Resultado por lotes como DataFrame: total, nivel y mínimo por sección débil."""
+    df = pd.DataFrame(
+        {
+            "total": batch["total"],
+            "level_key": batch["level_key"],
+            "level_label": batch["level_label"],
+        }
+    )
+    for s, sec in enumerate(batch["sections"]):
+        df[sec] = np.where(batch["weak"][:, s], batch["section_min"][:, s], np.nan)
+    return df
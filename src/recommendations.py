@@ -0,0 +1,371 @@
+# src/recommendations.py
+# -*- coding: utf-8 -*-
+"""
+Recomendaciones según el patrón de respuestas.
+
+La hoja 'Recomendaciones' (una fila por barrera organizacional) se indexa una
+sola vez al cargar el Excel (load_data_from_excel; queda en el snapshot), con un
+único tokenizador (index_words: minúsculas, sin tildes ni diacríticos, desde
+MIN_WORD_LEN letras, las mismas que necesita un término de búsqueda):
+- vocab: palabras ordenadas, así que las que empiezan con un prefijo son un
+  rango contiguo (bisect) y sus postings también: en formato CSR (offsets /
+  docs / tfs / impacts, arreglos NumPy) los de un prefijo son un solo tramo;
+- by_question / by_section: filas más afines a cada pregunta y a cada sección,
+  calculadas desde el texto de la pregunta, de sus opciones de puntaje bajo y
+  del nombre de la sección (keywords: las mismas palabras sin las vacías)
+  contra los postings.
+
+Al mostrar un resultado, match() solo suma esas tablas para las preguntas con
+puntaje bajo y las secciones a fortalecer: no se recorre el DataFrame.
+
+search() es la búsqueda de texto completo de la página de consultores: cada
+término es un prefijo ("discrim" encuentra "discriminacion"), se exigen todos
+y las filas se ordenan por la suma de sus puntajes BM25 (impacts, ya
+calculados). Un prefijo suma todas sus palabras; para los prefijos de
+MIN_PREFIX_LEN letras con más postings que filas esa suma ya viene hecha
+(blocks).
+
+Uso:
+    index = data["recommendation_index"]
+    recs = index.match({"C": 1, "D": 2}, areas)
+    hits = index.search("nombre ident")  # [(fila, puntaje)]
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import re
+import unicodedata
+
+from src.lazy_imports import lazy_import
+from src.questionnaire import FrozenSlots
+from src.quiz_logic import WEAK_SCORE_MAX
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+np = lazy_import("numpy")
+
+# (columna, peso de sus palabras): el nombre de la barrera pesa más que el resto
+FIELDS = (
+    ("barrera", 3),
+    ("concepto", 1),
+    ("sintomas", 1),
+    ("impacto", 1),
+    ("indicadores", 1),
+    ("recomendaciones", 1),
+)
+# Las palabras se comparan por sus primeras STEM_LEN letras ("formularios" y
+# "formulario", "documentos" y "documentacion" coinciden)
+STEM_LEN = 6
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Filas guardadas por pregunta / sección y sugeridas por resultado
+ROWS_PER_KEY = 3
+MATCH_LIMIT = 3
+# Búsqueda: un término necesita al menos MIN_PREFIX_LEN letras ("d" o "de"
+# expandirían a casi todo el vocabulario) y se muestran SEARCH_LIMIT filas.
+# Se indexan las palabras desde ese mismo largo: "DEI", "CRM" o "uso" se
+# pueden buscar
+MIN_PREFIX_LEN = 3
+MIN_WORD_LEN = MIN_PREFIX_LEN
+SEARCH_LIMIT = 20
+
+STOPWORDS = frozenset("""
+    ante bajo cada como con cual cuales cuando del desde donde entre esa ese eso
+    esta estan estas este esto estos fue han hacia hasta hay las les los mas
+    mismo misma muy otra otras otro otros para pero por puede pueden que quien
+    quienes segun sean ser sido sin sino sobre solo son sus tambien tiene
+    tienen toda todas todo todos tras una uno unos cuenta debe deben mediante
+    """.split())
+
+# Marcas diacríticas que deja NFKD al separar "á" en "a" + U+0301
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+# Letras y dígitos de cualquier alfabeto (ya sin diacríticos)
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def fold_text(x: Any) -> str:
+    """
+    Minúsculas y sin tildes ni diacríticos: "Señales" -> "senales",
+    "Ação" -> "acao". El texto ASCII (la mayoría) no pasa por unicodedata.
+    """
+    if x is None:
+        return ""
+    text = str(x).strip().lower()
+    if text.isascii():
+        return text
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text))
+
+
+def index_words(text: Any) -> List[str]:
+    """Palabras normalizadas de `text` que van al índice (desde MIN_WORD_LEN)."""
+    return [w for w in WORD_RE.findall(fold_text(text)) if len(w) >= MIN_WORD_LEN]
+
+
+def keywords(text: Any) -> List[str]:
+    """index_words sin las vacías: las que cuentan para rank()."""
+    return [w for w in index_words(text) if w not in STOPWORDS]
+
+
+def query_terms(query: Any) -> List[str]:
+    """
+    Términos (prefijos) de una consulta de search(): mismo tokenizador que las
+    filas (index_words), sin las palabras vacías. La última se conserva aunque
+    sea vacía: puede estar a medio escribir ("con" -> "contratacion").
+    """
+    words = index_words(query)
+    terms = [w for w in words[:-1] if w not in STOPWORDS] + words[-1:]
+    return list(dict.fromkeys(terms))
+
+
+def _cell(value: Any) -> str:
+    # Celdas vacías de pandas llegan como NaN (float)
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value).strip()
+
+
+class Recommendation(FrozenSlots):
+    """Una fila de la hoja 'Recomendaciones'."""
+
+    __slots__ = ("id",) + tuple(name for name, _ in FIELDS)
+
+    def __init__(self, id: int, **fields: str) -> None:
+        self._init(id=int(id), **{name: fields.get(name, "") for name, _ in FIELDS})
+
+    def __reduce__(self):
+        return (_recommendation, (self.id, {n: getattr(self, n) for n, _ in FIELDS}))
+
+    def __repr__(self) -> str:
+        return f"Recommendation({self.id}, {self.barrera[:40]!r})"
+
+
+def _recommendation(id: int, fields: Dict[str, str]) -> Recommendation:
+    return Recommendation(id, **fields)
+
+
+def rows_from_dataframe(df: Optional["pd.DataFrame"]) -> List[Recommendation]:
+    """Filas con barrera o recomendaciones (las vacías de la hoja se saltan)."""
+    rows: List[Recommendation] = []
+    records = df.to_dict("records") if df is not None else []
+    for record in records:
+        fields = {name: _cell(record.get(name)) for name, _ in FIELDS}
+        if fields["barrera"] or fields["recomendaciones"]:
+            rows.append(Recommendation(len(rows), **fields))
+    return rows
+
+
+# (fila, peso)
+Scored = Tuple[Tuple[int, float], ...]
+
+
+class RecommendationIndex:
+    """Índice invertido de la hoja y tablas precalculadas por pregunta/sección."""
+
+    def __init__(self, rows: Sequence[Recommendation]) -> None:
+        self.rows: Tuple[Recommendation, ...] = tuple(rows)
+        counts: Dict[str, Dict[int, int]] = {}
+        lengths = [0] * len(self.rows)
+        for rec in self.rows:
+            for name, weight in FIELDS:
+                for word in index_words(getattr(rec, name)):
+                    per_row = counts.setdefault(word, {})
+                    per_row[rec.id] = per_row.get(rec.id, 0) + weight
+                    lengths[rec.id] += weight
+        self.vocab: List[str] = sorted(counts)
+
+        # Largo de cada fila relativo al promedio (normalización de BM25)
+        n_rows = len(self.rows)
+        avg = sum(lengths) / n_rows if n_rows else 1.0
+        self._lengths = [n / avg if avg else 1.0 for n in lengths]
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * n) for n in self._lengths]
+
+        offsets = [0]
+        docs: List[int] = []
+        tfs: List[int] = []
+        impacts: List[float] = []
+        for word in self.vocab:
+            per_row = sorted(counts[word].items())
+            idf = _idf(n_rows, len(per_row))
+            for row, tf in per_row:
+                docs.append(row)
+                tfs.append(tf)
+                impacts.append(idf * tf * (BM25_K1 + 1) / (tf + norms[row]))
+            offsets.append(len(docs))
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.docs = np.asarray(docs, dtype=np.int32)
+        # float64: np.bincount convierte los pesos a float64 en cada llamada
+        self.tfs = np.asarray(tfs, dtype=np.float64)
+        self.impacts = np.asarray(impacts, dtype=np.float64)
+        self._norms = np.asarray(norms, dtype=np.float64)
+        # Filas por palabra (df de BM25)
+        self.df = np.diff(self.offsets)
+        self.blocks: Dict[str, Tuple[Any, Any]] = {}
+        self._build_blocks()
+
+        self.by_question: Dict[str, Scored] = {}
+        self.by_section: Dict[str, Scored] = {}
+
+    @classmethod
+    def build(
+        cls,
+        df: Optional["pd.DataFrame"],
+        questions: Iterable[Dict[str, Any]] = (),
+    ) -> "RecommendationIndex":
+        """Índice de `df` (salida de _load_recommendations_from_excel)."""
+        index = cls(rows_from_dataframe(df))
+        index.link_questions(questions)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Rango [lo, hi) de vocab con las palabras que empiezan con `prefix`."""
+        lo = bisect_left(self.vocab, prefix)
+        return lo, bisect_left(self.vocab, prefix + "\uffff", lo)
+
+    def words_with_prefix(self, prefix: str) -> List[str]:
+        """Palabras del vocabulario que empiezan con `prefix` (ya normalizado)."""
+        lo, hi = self.prefix_range(prefix)
+        return self.vocab[lo:hi]
+
+    def _postings(self, prefix: str) -> Tuple[int, int]:
+        """Tramo [start, end) de docs / tfs / impacts de las palabras con `prefix`."""
+        lo, hi = self.prefix_range(prefix)
+        return int(self.offsets[lo]), int(self.offsets[hi])
+
+    def _build_blocks(self) -> None:
+        """
+        Prefijos de MIN_PREFIX_LEN letras cuyas palabras suman más postings que
+        filas hay ("con", "per"...): su puntaje por fila se suma de antemano,
+        para que la consulta no recorra cientos de miles de postings.
+        """
+        n_rows = len(self.rows)
+        prefixes = dict.fromkeys(w[:MIN_PREFIX_LEN] for w in self.vocab)
+        for prefix in prefixes:
+            start, end = self._postings(prefix)
+            if end - start <= n_rows:
+                continue
+            scores = np.bincount(
+                self.docs[start:end], self.impacts[start:end], minlength=n_rows
+            )
+            rows = np.flatnonzero(scores)
+            self.blocks[prefix] = (rows.astype(np.int32), scores[rows])
+
+    def rank(self, text: str, limit: int = ROWS_PER_KEY) -> Scored:
+        """
+        Filas más afines a `text` (BM25 por raíz: las palabras de la fila con
+        esa raíz suman su frecuencia); el mejor puntaje queda en 1.
+        """
+        n_rows = len(self.rows)
+        scores = np.zeros(n_rows)
+        for stem in sorted(set(w[:STEM_LEN] for w in keywords(text))):
+            start, end = self._postings(stem)
+            if start == end:
+                continue
+            hits = np.bincount(
+                self.docs[start:end], self.tfs[start:end], minlength=n_rows
+            )
+            rows = np.flatnonzero(hits)
+            # Raíces presentes en casi todas las filas (p.ej. "person") pesan poco
+            idf = _idf(n_rows, len(rows))
+            tf = hits[rows]
+            scores[rows] += idf * tf * (BM25_K1 + 1) / (tf + self._norms[rows])
+        ranked = sorted(
+            ((int(row), float(scores[row])) for row in np.flatnonzero(scores)),
+            key=lambda item: (-item[1], item[0]),
+        )[:limit]
+        if not ranked:
+            return ()
+        best = ranked[0][1]
+        return tuple((row, round(s / best, 4)) for row, s in ranked)
+
+    def link_questions(self, questions: Iterable[Dict[str, Any]]) -> None:
+        """Precalcula by_question y by_section para el cuestionario."""
+        for q in questions:
+            section = q.get("section", "")
+            low = [
+                o.get("label", "")
+                for o in q.get("options", [])
+                if int(o.get("score", 0)) <= WEAK_SCORE_MAX
+            ]
+            text = " ".join([section, section, q.get("text", ""), *low])
+            self.by_question[q["id"]] = self.rank(text)
+            if section not in self.by_section:
+                self.by_section[section] = self.rank(section)
+
+    def match(
+        self,
+        low_questions: Dict[str, int],
+        areas: Iterable[str] = (),
+        limit: int = MATCH_LIMIT,
+    ) -> List[Recommendation]:
+        """
+        Recomendaciones para un resultado: `low_questions` es {id: puntaje} de
+        las preguntas con puntaje <= WEAK_SCORE_MAX (una respuesta 1 pesa más
+        que una 2) y `areas` las secciones a fortalecer.
+        """
+        totals: Dict[int, float] = {}
+        for qid, score in low_questions.items():
+            weight = WEAK_SCORE_MAX + 1 - int(score)
+            for row, s in self.by_question.get(qid, ()):
+                totals[row] = totals.get(row, 0.0) + weight * s
+        for section in areas:
+            for row, s in self.by_section.get(section, ()):
+                totals[row] = totals.get(row, 0.0) + s
+        best = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [self.rows[row] for row, _ in best]
+
+    # --- búsqueda de texto completo ---
+    def _term_scores(self, prefix: str):
+        """Puntaje de cada fila para un término; None si ninguna palabra lo tiene."""
+        n_rows = len(self.rows)
+        block = self.blocks.get(prefix)
+        if block is not None:
+            scores = np.zeros(n_rows)
+            scores[block[0]] = block[1]
+            return scores
+        start, end = self._postings(prefix)
+        if start == end:
+            return None
+        return np.bincount(
+            self.docs[start:end], self.impacts[start:end], minlength=n_rows
+        )
+
+    def search(
+        self, query: str, limit: int = SEARCH_LIMIT
+    ) -> List[Tuple[Recommendation, float]]:
+        """
+        [(fila, puntaje)] de las filas que contienen todos los términos de
+        `query` (cada uno como prefijo), de mayor a menor puntaje.
+        """
+        prefixes = query_terms(query)
+        if not prefixes or not self.rows:
+            return []
+        total = None
+        matched = None
+        for prefix in prefixes:
+            scores = self._term_scores(prefix)
+            if scores is None:
+                return []
+            if total is None:
+                total, matched = scores, scores > 0
+            else:
+                total += scores
+                matched &= scores > 0
+        candidates = np.flatnonzero(matched)
+        if len(candidates) > limit:
+            best = np.argpartition(-total[candidates], limit)[:limit]
+            candidates = candidates[best]
+        ranked = sorted(
+            ((int(row), float(total[row])) for row in candidates),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return [(self.rows[row], score) for row, score in ranked]
+
+
+def _idf(n_rows: int, df: int) -> float:
+    return math.log(1 + (n_rows - df + 0.5) / (df + 0.5))
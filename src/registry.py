@@ -0,0 +1,256 @@
+# src/registry.py
+# -*- coding: utf-8 -*-
+"""
+Registro de cuestionarios (multi-tenant).
+
+Una misma instalación puede servir varias cámaras o variantes por país: cada
+.xlsx de data/ es un tenant. WorkbookRegistry:
+- indexa los libros de la carpeta por id (slug del nombre del archivo, p.ej.
+  "camara-colombia.xlsx" -> "camara-colombia") y por hash SHA-256;
+- los carga de forma perezosa, en el primer uso, cada uno en su propio
+  DataStore (mismo snapshot y recarga en caliente que con un solo libro);
+- mantiene los cargados en un LRU acotado (AUTODIAG_TENANT_CACHE, por
+  defecto 4) y cuenta aciertos, fallos y desalojos;
+- con watch() vigila la carpeta: los eventos de escritura de un mismo guardado
+  se agrupan (debounce) y recién entonces re-indexa una vez y recarga en
+  segundo plano los tenants cargados cuyo libro cambió. scan() solo vuelve a
+  calcular el hash de los libros cuyo tamaño o fecha de modificación cambió.
+
+Cada tenant tiene su propio DataStore y app.py fija en la sesión los datos
+junto con el id del tenant, así que ningún tenant ve datos de otro. El tenant
+por defecto es el que elige data_handler._find_excel_path (instalaciones de un
+solo libro no cambian).
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+import os
+import re
+import threading
+import unicodedata
+
+from src import data_handler
+from src.data_store import (
+    DEBOUNCE_SECONDS,
+    HOT_RELOAD_ENV_VAR,
+    DataStore,
+    is_workbook,
+    watch_directory,
+)
+from src.snapshot import workbook_hash
+
+TENANT_CACHE_ENV_VAR = "AUTODIAG_TENANT_CACHE"
+DEFAULT_MAXSIZE = 4
+
+# Un hash abreviado debe tener al menos estos caracteres para identificar un libro
+MIN_HASH_PREFIX = 12
+
+
+def tenant_id(path: str | Path) -> str:
+    """Slug ASCII del nombre del archivo: minúsculas, sin tildes, con guiones."""
+    stem = unicodedata.normalize("NFKD", Path(path).stem)
+    stem = stem.encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9]+", "-", stem).strip("-") or "libro"
+
+
+class WorkbookRegistry:
+    """Libros de `data_dir` por id y hash, con LRU de cuestionarios cargados."""
+
+    def __init__(
+        self,
+        data_dir: str | Path = "data",
+        maxsize: int = DEFAULT_MAXSIZE,
+        debounce: float = DEBOUNCE_SECONDS,
+    ):
+        self.data_dir = Path(data_dir)
+        self.maxsize = max(1, maxsize)
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._paths: Dict[str, Path] = {}
+        self._hashes: Dict[str, str] = {}  # hash -> id
+        # ruta -> (mtime_ns, tamaño, hash): scan() no relee los libros sin cambios
+        self._stat_hashes: Dict[Path, Tuple[int, int, str]] = {}
+        # Rutas con eventos pendientes y el timer que las procesa juntas
+        self._pending: Set[str] = set()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self._default: Optional[str] = None
+        self._stores: "OrderedDict[str, DataStore]" = OrderedDict()
+        self._observer = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._evicted: List[str] = []
+        self.scan()
+
+    # --- índice ---
+    def scan(self) -> None:
+        """(Re)indexa los libros de la carpeta."""
+        paths: Dict[str, Path] = {}
+        for xlsx in sorted(self.data_dir.glob("*.xlsx")):
+            if not is_workbook(str(xlsx)):
+                continue
+            tid = tenant_id(xlsx)
+            n = 2
+            while tid in paths:
+                tid = f"{tenant_id(xlsx)}-{n}"
+                n += 1
+            paths[tid] = xlsx
+        hashes = {}
+        stat_hashes: Dict[Path, Tuple[int, int, str]] = {}
+        for tid, xlsx in paths.items():
+            try:
+                stat = xlsx.stat()
+                key = (stat.st_mtime_ns, stat.st_size)
+                cached = self._stat_hashes.get(xlsx)
+                digest = cached[2] if cached and cached[:2] == key else None
+                if digest is None:
+                    digest = workbook_hash(xlsx)
+            except OSError:
+                continue
+            hashes[digest] = tid
+            stat_hashes[xlsx] = (*key, digest)
+        default = data_handler._find_excel_path(self.data_dir)
+        with self._lock:
+            self._paths = paths
+            self._hashes = hashes
+            self._stat_hashes = stat_hashes
+            self._default = next(
+                (tid for tid, p in paths.items() if p == default), None
+            )
+            # Tenants cuyo libro ya no existe
+            for tid in [t for t in self._stores if t not in paths]:
+                del self._stores[tid]
+
+    def ids(self) -> List[str]:
+        return list(self._paths)
+
+    @property
+    def default_id(self) -> Optional[str]:
+        return self._default
+
+    def resolve(self, key: Optional[str]) -> Optional[str]:
+        """
+        Id del tenant para `key`: un id, un hash SHA-256 (completo o con al menos
+        MIN_HASH_PREFIX caracteres) o None/"" para el tenant por defecto.
+        Retorna None si no corresponde a ningún libro.
+        """
+        if not key:
+            return self._default
+        key = key.strip().lower()
+        if key in self._paths:
+            return key
+        if key in self._hashes:
+            return self._hashes[key]
+        if len(key) >= MIN_HASH_PREFIX:
+            matches = [tid for h, tid in self._hashes.items() if h.startswith(key)]
+            if len(matches) == 1:
+                return matches[0]
+        return None
+
+    # --- cuestionarios cargados ---
+    def store(self, tid: str) -> DataStore:
+        """DataStore del tenant (se crea en el primer uso; LRU acotado)."""
+        with self._lock:
+            store = self._stores.get(tid)
+            if store is not None:
+                self._stores.move_to_end(tid)
+                self._hits += 1
+                return store
+            if tid not in self._paths:
+                raise KeyError(f"No existe el cuestionario {tid!r}")
+            self._misses += 1
+            store = DataStore(self.data_dir, workbook=self._paths[tid])
+            self._stores[tid] = store
+            while len(self._stores) > self.maxsize:
+                evicted, _ = self._stores.popitem(last=False)
+                self._evictions += 1
+                self._evicted = (self._evicted + [evicted])[-10:]
+        return store
+
+    def current(self, tid: Optional[str] = None) -> Dict[str, Any]:
+        """Datos vigentes del tenant (el por defecto si `tid` es None)."""
+        tid = tid or self._default
+        if tid is None:
+            raise FileNotFoundError(
+                f"No encontré ningún archivo Excel en {self.data_dir.absolute()}"
+            )
+        # La carga (una por tenant) se hace fuera del lock del registro
+        return self.store(tid).current()
+
+    # --- observer ---
+    def _on_change(self, path: str, _event_type: str) -> None:
+        # Un guardado genera varios eventos: se procesan juntos tras `debounce`
+        with self._timer_lock:
+            self._pending.add(path)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._apply_changes)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _apply_changes(self) -> None:
+        """Re-indexa una vez y recarga los tenants cargados cuyo libro cambió."""
+        with self._timer_lock:
+            changed, self._pending = self._pending, set()
+            self._timer = None
+        # Re-indexa siempre: los hashes cambian también con "modified"
+        self.scan()
+        for tid, xlsx in list(self._paths.items()):
+            store = self._stores.get(tid) if str(xlsx) in changed else None
+            if store is not None and store.loaded:
+                store.reload()
+
+    def watch(self) -> bool:
+        """Vigila la carpeta (ver módulo). False si watchdog no está disponible."""
+        if self._observer is None:
+            self._observer = watch_directory(self.data_dir, self._on_change)
+        return self._observer is not None
+
+    def stop(self) -> None:
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "tenants": len(self._paths),
+                "por_defecto": self._default,
+                "cargados": list(self._stores),
+                "capacidad": self.maxsize,
+                "aciertos": self._hits,
+                "fallos": self._misses,
+                "tasa_aciertos": self._hits / lookups if lookups else None,
+                "desalojos": self._evictions,
+                "ultimos_desalojados": list(self._evicted),
+                "vigilando": self._observer is not None,
+            }
+
+
+_REGISTRIES: Dict[Path, WorkbookRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def shared_registry(data_dir: str | Path = "data") -> WorkbookRegistry:
+    """
+    Registro compartido del proceso para `data_dir` (app.py y src/warmup.py
+    usan el mismo). Salvo AUTODIAG_HOT_RELOAD=0, al crearlo vigila la carpeta.
+    """
+    key = Path(data_dir).resolve()
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            maxsize = int(os.environ.get(TENANT_CACHE_ENV_VAR, DEFAULT_MAXSIZE))
+            registry = _REGISTRIES[key] = WorkbookRegistry(key, maxsize)
+            if os.environ.get(HOT_RELOAD_ENV_VAR, "1") != "0":
+                registry.watch()
+    return registry
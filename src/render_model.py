@@ -0,0 +1,156 @@
+# src/render_model.py
+# -*- coding: utf-8 -*-
+"""
+Modelo de render del cuestionario.
+
+Todo lo que la UI pinta de cada pregunta (HTML de sección y enunciado ya
+escapado, textos de las opciones, puntajes, clave del widget) y las piezas
+fijas del formulario (encabezados de página y barra de progreso para cada
+cantidad de respuestas) se calculan una vez al cargar el Excel. app.py lo
+guarda con st.cache_resource, así que el mismo objeto se comparte entre
+sesiones; por eso es inmutable (__slots__ y sin setattr).
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import html
+
+from src.questionnaire import Question, Questionnaire, FrozenSlots, as_questionnaire
+from src.quiz_logic import RunningScore, question_keys
+
+
+def _esc(x: str) -> str:
+    return html.escape(x or "", quote=True)
+
+
+class QuestionView(FrozenSlots):
+    """Una pregunta lista para pintar."""
+
+    __slots__ = (
+        "key",
+        "qid",
+        "section",
+        "widget_key",
+        "section_html",
+        "question_html",
+        "radio_label",
+        "choices",
+        "scores",
+        "labels",
+        "raw_labels",
+    )
+
+    def __init__(self, q: Question, key: str) -> None:
+        # Las opciones ya vienen ordenadas 3,2,1
+        opts = q.options
+        qid = q.id
+        section = q.section
+        raw_labels = tuple(o.label for o in opts)
+        self._init(
+            key=key,
+            qid=qid,
+            section=section,
+            widget_key=f"q_{key}",
+            section_html=(
+                f'<div class="ad-sec">{_esc(section)}</div>' if section else ""
+            ),
+            question_html=(
+                f'<div class="ad-q"><b>{_esc(qid)}.</b> ' f"{_esc(q.text)}</div>"
+            ),
+            radio_label=f"Seleccione una opción para la pregunta {_esc(qid)}:",
+            choices=tuple(range(len(opts))),
+            scores=tuple(o.score for o in opts),
+            labels=tuple(_esc(label) for label in raw_labels),
+            raw_labels=raw_labels,
+        )
+
+    def index_of(self, score: Optional[int]) -> Optional[int]:
+        """Posición de la opción con ese puntaje (None si no hay respuesta)."""
+        if score is None:
+            return None
+        try:
+            return self.scores.index(score)
+        except ValueError:
+            return None
+
+
+class PageView(FrozenSlots):
+    """Una sección del modo paginado: encabezado y posiciones de sus preguntas."""
+
+    __slots__ = ("name", "header_html", "indices")
+
+    def __init__(self, name: str, header_html: str, indices: Tuple[int, ...]) -> None:
+        self._init(name=name, header_html=header_html, indices=indices)
+
+
+def _progress_html(answered: int, total: int) -> str:
+    if answered == total:
+        status = "Completado"
+    else:
+        status = f"Progreso: {answered}/{total} preguntas · Faltan {total - answered}"
+    return (
+        '<div class="ad-pb"><div><div class="ad-pb-tr">'
+        f'<div class="ad-pb-fill" style="width:{answered / total * 100:.1f}%"></div>'
+        f'</div><div class="ad-pb-tx">{status}</div></div></div>'
+        '<div class="ad-pb-sp"></div>'
+    )
+
+
+def _pages(views: Sequence[QuestionView]) -> Tuple[PageView, ...]:
+    """Agrupa las preguntas por sección, en el orden de aparición."""
+    groups: Dict[str, List[int]] = {}
+    for idx, view in enumerate(views):
+        groups.setdefault(view.section or "General", []).append(idx)
+    n = len(groups)
+    return tuple(
+        PageView(
+            name,
+            f'<div class="ad-page">Sección {i + 1} de {n}: {_esc(name)}</div>',
+            tuple(indices),
+        )
+        for i, (name, indices) in enumerate(groups.items())
+    )
+
+
+class RenderModel(FrozenSlots):
+    """
+    Cuestionario completo listo para pintar:
+    - questions: el Questionnaire de origen
+    - views[i]: QuestionView de la i-ésima pregunta
+    - pages: secciones para el modo paginado
+    - progress_html[n]: barra de progreso con n respuestas
+    """
+
+    __slots__ = ("questions", "keys", "views", "pages", "progress_html")
+
+    def __init__(
+        self, questions: Union[Questionnaire, Sequence[Dict[str, Any]]]
+    ) -> None:
+        questions = as_questionnaire(questions)
+        if all(key is not None for key in questions.keys):
+            keys = questions.keys
+        else:
+            keys = tuple(question_keys(questions))
+        views = tuple(QuestionView(q, key) for q, key in zip(questions, keys))
+        total = len(views)
+        self._init(
+            questions=questions,
+            keys=keys,
+            views=views,
+            pages=_pages(views),
+            progress_html=(
+                tuple(_progress_html(n, total) for n in range(total + 1))
+                if total
+                else ("",)
+            ),
+        )
+
+    def new_state(self) -> RunningScore:
+        """Agregados vacíos para una sesión que empieza el cuestionario."""
+        return RunningScore(self.questions, self.keys)
+
+
+def build_render_model(
+    questions: Union[Questionnaire, Sequence[Dict[str, Any]]],
+) -> RenderModel:
+    return RenderModel(questions)
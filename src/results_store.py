@@ -0,0 +1,471 @@
+# src/results_store.py
+# -*- coding: utf-8 -*-
+"""
+Resultados persistidos (SQLite en modo WAL) con escritura diferida.
+
+Cada diagnóstico completado se guarda con sus respuestas, puntaje total, nivel
+y secciones a fortalecer, para poder analizar cohortes después. El hilo del
+script de Streamlit no toca la base: submit() solo encola el registro en una
+cola acotada y un hilo escritor la vacía por lotes (una transacción por lote),
+así la latencia de envío no depende del disco ni de cuántas sesiones envían a
+la vez. Si la cola está llena el registro se descarta y se cuenta en stats().
+
+Cada lote también suma sus agregados (tablas rollup_*: nivel, puntaje por
+pregunta y secciones a fortalecer, por tenant y mes; distribución del puntaje
+total y por sección, por tenant y versión del cuestionario) en la misma
+transacción; el tablero de src/analytics.py y los percentiles de
+src/percentiles.py leen solo esos agregados.
+
+El guardado es opcional (el pie de la app dice que el diagnóstico es
+confidencial): solo se activa con AUTODIAG_RESULTS_DB ("1" para la ruta por
+defecto o una ruta propia), ver results_db_path().
+
+Uso:
+    store = shared_results_store("results/autodiagnostico.db")
+    store.submit(make_record("tenant", "version", answers, result, areas))
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+RESULTS_DB_ENV_VAR = "AUTODIAG_RESULTS_DB"
+DEFAULT_DB_PATH = "results/autodiagnostico.db"
+
+QUEUE_MAXSIZE = 10_000
+BATCH_SIZE = 500
+# flush() no espera más que esto (p.ej. al salir del proceso con la base bloqueada)
+FLUSH_TIMEOUT = 30.0
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    tenant TEXT NOT NULL,
+    questionnaire TEXT,
+    total INTEGER NOT NULL,
+    level_key TEXT NOT NULL,
+    level_label TEXT,
+    answers TEXT NOT NULL,
+    weak_sections TEXT NOT NULL,
+    section_scores TEXT
+);
+CREATE INDEX IF NOT EXISTS results_tenant_created ON results (tenant, created_at);
+
+-- Agregados por tenant x período (mes UTC), actualizados en el mismo commit
+-- que cada lote: src/analytics.py lee solo estas tablas
+CREATE TABLE IF NOT EXISTS rollup_levels (
+    tenant TEXT NOT NULL,
+    period TEXT NOT NULL,
+    level_key TEXT NOT NULL,
+    level_label TEXT,
+    n INTEGER NOT NULL,
+    total_sum INTEGER NOT NULL,
+    PRIMARY KEY (tenant, period, level_key)
+);
+CREATE TABLE IF NOT EXISTS rollup_questions (
+    tenant TEXT NOT NULL,
+    period TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    score_sum INTEGER NOT NULL,
+    PRIMARY KEY (tenant, period, question_id)
+);
+CREATE TABLE IF NOT EXISTS rollup_question_hist (
+    tenant TEXT NOT NULL,
+    period TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (tenant, period, question_id, score)
+);
+CREATE TABLE IF NOT EXISTS rollup_scores (
+    tenant TEXT NOT NULL,
+    questionnaire TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (tenant, questionnaire, scope, score)
+);
+CREATE TABLE IF NOT EXISTS rollup_sections (
+    tenant TEXT NOT NULL,
+    period TEXT NOT NULL,
+    section TEXT NOT NULL,
+    weak INTEGER NOT NULL,
+    PRIMARY KEY (tenant, period, section)
+);
+"""
+
+# Subir al cambiar las tablas rollup_*: connect() las reconstruye desde results
+ROLLUP_VERSION = 2
+
+# Ámbito de rollup_scores para el puntaje total (el resto son nombres de sección)
+TOTAL_SCOPE = "__total__"
+
+_UPSERTS = {
+    "levels": (
+        "INSERT INTO rollup_levels VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (tenant, period, level_key) DO UPDATE SET "
+        "n = n + excluded.n, total_sum = total_sum + excluded.total_sum, "
+        "level_label = excluded.level_label"
+    ),
+    "questions": (
+        "INSERT INTO rollup_questions VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (tenant, period, question_id) DO UPDATE SET "
+        "n = n + excluded.n, score_sum = score_sum + excluded.score_sum"
+    ),
+    "hist": (
+        "INSERT INTO rollup_question_hist VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (tenant, period, question_id, score) DO UPDATE SET "
+        "n = n + excluded.n"
+    ),
+    "scores": (
+        "INSERT INTO rollup_scores VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (tenant, questionnaire, scope, score) DO UPDATE SET "
+        "n = n + excluded.n"
+    ),
+    "sections": (
+        "INSERT INTO rollup_sections VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (tenant, period, section) DO UPDATE SET "
+        "weak = weak + excluded.weak"
+    ),
+}
+_ROLLUP_TABLES = (
+    "rollup_levels",
+    "rollup_questions",
+    "rollup_question_hist",
+    "rollup_scores",
+    "rollup_sections",
+)
+
+_INSERT = (
+    "INSERT INTO results (created_at, tenant, questionnaire, total, level_key, "
+    "level_label, answers, weak_sections, section_scores) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_COLUMNS = (
+    "id",
+    "created_at",
+    "tenant",
+    "questionnaire",
+    "total",
+    "level_key",
+    "level_label",
+    "answers",
+    "weak_sections",
+    "section_scores",
+)
+
+# (created_at, tenant, questionnaire, total, level_key, level_label, answers,
+#  áreas, puntaje por sección) con los dicts ya en JSON
+Record = Tuple[float, str, Optional[str], int, str, str, str, str, Optional[str]]
+
+_STOP = object()
+
+
+def connect(path: str | Path) -> sqlite3.Connection:
+    """Conexión con WAL (lectores no bloquean al escritor) y el esquema creado."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Con WAL, NORMAL solo sincroniza en los checkpoints: seguro ante caídas
+    # del proceso, y cada commit no espera al fsync
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+    if "section_scores" not in columns:
+        # Bases creadas antes de guardar el puntaje por sección
+        conn.execute("ALTER TABLE results ADD COLUMN section_scores TEXT")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < ROLLUP_VERSION:
+        rebuild_rollups(conn)
+    return conn
+
+
+def period_of(created_at: float) -> str:
+    """Período de los agregados: mes UTC, "AAAA-MM"."""
+    return time.strftime("%Y-%m", time.gmtime(created_at))
+
+
+def _rollup_rows(records: Iterable[Record]) -> Dict[str, List[tuple]]:
+    """Filas de cada tabla rollup_* sumando `records` (se aplican con upsert)."""
+    levels: Dict[tuple, list] = {}
+    questions: Dict[tuple, list] = {}
+    hist: Dict[tuple, int] = {}
+    sections: Dict[tuple, int] = {}
+    scores: Dict[tuple, int] = {}
+    for rec in records:
+        created_at, tenant, version, total, level_key, label, answers, weak, by_sec = (
+            rec
+        )
+        period = period_of(created_at)
+        # Distribuciones de puntaje por versión del cuestionario, sin período:
+        # src/percentiles.py compara contra todos los resultados comparables
+        key = (tenant, version or "", TOTAL_SCOPE, total)
+        scores[key] = scores.get(key, 0) + 1
+        for section, score in json.loads(by_sec or "{}").items():
+            key = (tenant, version or "", section, score)
+            scores[key] = scores.get(key, 0) + 1
+        row = levels.setdefault((tenant, period, level_key), [label, 0, 0])
+        row[0] = label
+        row[1] += 1
+        row[2] += total
+        for qid, score in json.loads(answers).items():
+            agg = questions.setdefault((tenant, period, qid), [0, 0])
+            agg[0] += 1
+            agg[1] += score
+            key = (tenant, period, qid, score)
+            hist[key] = hist.get(key, 0) + 1
+        for section in json.loads(weak):
+            key = (tenant, period, section)
+            sections[key] = sections.get(key, 0) + 1
+    return {
+        "levels": [k + tuple(v) for k, v in levels.items()],
+        "questions": [k + tuple(v) for k, v in questions.items()],
+        "hist": [k + (n,) for k, n in hist.items()],
+        "scores": [k + (n,) for k, n in scores.items()],
+        "sections": [k + (n,) for k, n in sections.items()],
+    }
+
+
+def _apply_rollups(conn: sqlite3.Connection, records: Iterable[Record]) -> None:
+    for table, rows in _rollup_rows(records).items():
+        if rows:
+            conn.executemany(_UPSERTS[table], rows)
+
+
+def rebuild_rollups(conn: sqlite3.Connection, chunk: int = 10_000) -> None:
+    """Recalcula las tablas rollup_* desde `results` (bases creadas antes)."""
+    with conn:
+        for table in _ROLLUP_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        cur = conn.execute(
+            "SELECT created_at, tenant, questionnaire, total, level_key, "
+            "level_label, answers, weak_sections, section_scores FROM results "
+            "ORDER BY id"
+        )
+        while rows := cur.fetchmany(chunk):
+            _apply_rollups(conn, rows)
+        conn.execute(f"PRAGMA user_version = {ROLLUP_VERSION}")
+
+
+def make_record(
+    tenant: str,
+    questionnaire: Optional[str],
+    answers: Dict[str, int],
+    result: Dict[str, Any],
+    areas: Dict[str, int],
+    created_at: Optional[float] = None,
+    section_scores: Optional[Dict[str, int]] = None,
+) -> Record:
+    """
+    Fila de `results` a partir de lo que muestra la página de resultado.
+    `section_scores` ({sección: suma de respuestas}) alimenta los percentiles.
+    """
+    return (
+        time.time() if created_at is None else created_at,
+        tenant,
+        questionnaire,
+        int(result["total"]),
+        str(result["level_key"]),
+        str(result.get("level_label", "")),
+        json.dumps({k: int(v) for k, v in answers.items()}, ensure_ascii=False),
+        json.dumps({k: int(v) for k, v in areas.items()}, ensure_ascii=False),
+        (
+            json.dumps(
+                {k: int(v) for k, v in section_scores.items()}, ensure_ascii=False
+            )
+            if section_scores is not None
+            else None
+        ),
+    )
+
+
+def write_records(conn: sqlite3.Connection, records: Iterable[Record]) -> int:
+    """
+    Inserta `records` y suma sus agregados en una sola transacción.
+    Retorna cuántos se escribieron.
+    """
+    records = list(records)
+    with conn:
+        conn.executemany(_INSERT, records)
+        _apply_rollups(conn, records)
+    return len(records)
+
+
+class ResultsStore:
+    """Cola acotada + hilo escritor que hace commit por lotes."""
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_DB_PATH,
+        maxsize: int = QUEUE_MAXSIZE,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._conn = connect(self.path)
+        self._submitted = 0
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+        self._failed = 0
+        self._last_error: Optional[str] = None
+        self._last_commit_seconds: Optional[float] = None
+        self._thread = threading.Thread(
+            target=self._run, name="results-writer", daemon=True
+        )
+        self._thread.start()
+
+    # --- envío (hilo del script) ---
+    def submit(self, record: Record) -> bool:
+        """Encola sin bloquear. False si la cola está llena (registro descartado)."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._dropped += 1
+            return False
+        self._submitted += 1
+        return True
+
+    # --- escritor ---
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Record] = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            # Lo que ya esté en la cola va en el mismo commit (sin esperar más)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                # Aunque el lote falle: si no, flush() esperaría para siempre
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Record]) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._written += write_records(self._conn, batch)
+            self._batches += 1
+        except Exception as exc:
+            # sqlite3.Error o un registro mal formado: se descarta el lote y el
+            # hilo escritor sigue vivo
+            self._failed += len(batch)
+            self._last_error = f"{type(exc).__name__}: {exc}"
+            log.exception("No se pudo guardar un lote de %d resultados", len(batch))
+        self._last_commit_seconds = time.perf_counter() - t0
+
+    def flush(self, timeout: Optional[float] = FLUSH_TIMEOUT) -> bool:
+        """
+        Espera a que todo lo encolado quede escrito (a lo sumo `timeout`
+        segundos; None espera sin límite). False si no se alcanzó a vaciar.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                if not self._thread.is_alive():
+                    return False
+                if deadline is None:
+                    done.wait(1.0)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                done.wait(min(remaining, 1.0))
+        return True
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._conn.close()
+
+    # --- lectura ---
+    def iter_results(
+        self, tenant: Optional[str] = None, since: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Resultados guardados (answers y weak_sections ya decodificados)."""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM results WHERE 1=1"
+        params: List[Any] = []
+        if tenant is not None:
+            sql += " AND tenant = ?"
+            params.append(tenant)
+        if since is not None:
+            sql += " AND created_at >= ?"
+            params.append(since)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            for row in conn.execute(sql + " ORDER BY id", params):
+                out = dict(zip(_COLUMNS, row))
+                out["answers"] = json.loads(out["answers"])
+                out["weak_sections"] = json.loads(out["weak_sections"])
+                out["section_scores"] = json.loads(out["section_scores"] or "null")
+                yield out
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "archivo": str(self.path),
+            "encolados": self._submitted,
+            "en_cola": self._queue.qsize(),
+            "escritos": self._written,
+            "lotes": self._batches,
+            "por_lote": self._written / self._batches if self._batches else None,
+            "descartados": self._dropped,
+            "fallidos": self._failed,
+            "ultimo_commit_s": self._last_commit_seconds,
+            "ultimo_error": self._last_error,
+        }
+
+
+_STORES: Dict[Path, ResultsStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def shared_results_store(path: str | Path = DEFAULT_DB_PATH) -> ResultsStore:
+    """ResultsStore del proceso para `path`; al salir se vacía la cola."""
+    key = Path(path).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = ResultsStore(key)
+            atexit.register(store.close)
+    return store
+
+
+def results_db_path(app_dir: Path) -> Optional[Path]:
+    """
+    Ruta de la base según AUTODIAG_RESULTS_DB (relativa a la app): "1" usa
+    DEFAULT_DB_PATH; sin definir, "" o "0" no se guardan resultados (None).
+    """
+    value = os.environ.get(RESULTS_DB_ENV_VAR, "")
+    if value in ("", "0"):
+        return None
+    return app_dir / (DEFAULT_DB_PATH if value == "1" else value)
@@ -0,0 +1,97 @@
+# src/snapshot.py
+# -*- coding: utf-8 -*-
+"""
+Snapshot compilado del Excel parseado.
+
+El resultado de `load_data_from_excel` (instrucciones, preguntas, umbrales,
+niveles y recomendaciones) se guarda junto al .xlsx como un pickle. La clave es
+el SHA-256 del contenido del Excel más la versión del parser: mientras ninguna
+de las dos cambie, los procesos nuevos cargan el snapshot sin tocar openpyxl.
+Las claves privadas (prefijo "_", p.ej. "_load_timings") no se guardan.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import os
+import pickle
+import tempfile
+
+SNAPSHOT_SUFFIX = ".snapshot.pkl"
+_CHUNK = 1 << 20
+
+
+def workbook_hash(xlsx: Path) -> str:
+    """SHA-256 del contenido del archivo (no depende de mtime ni del nombre)."""
+    h = hashlib.sha256()
+    with open(xlsx, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def snapshot_path(xlsx: Path) -> Path:
+    """Ruta del snapshot: mismo directorio, archivo oculto con el nombre del Excel."""
+    return xlsx.with_name(f".{xlsx.name}{SNAPSHOT_SUFFIX}")
+
+
+def _snapshot_key(digest: str, parser_version: str) -> Dict[str, str]:
+    return {"sha256": digest, "parser_version": parser_version}
+
+
+def read_snapshot(
+    xlsx: Path, digest: str, parser_version: str
+) -> Optional[Dict[str, Any]]:
+    """Devuelve los datos del snapshot si existe y coincide la clave; si no, None."""
+    sp = snapshot_path(xlsx)
+    try:
+        with open(sp, "rb") as f:
+            payload = pickle.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("key") != _snapshot_key(digest, parser_version):
+        return None
+    return payload.get("data")
+
+
+def write_snapshot(
+    xlsx: Path, digest: str, parser_version: str, data: Dict[str, Any]
+) -> bool:
+    """
+    Escribe el snapshot de forma atómica (archivo temporal + os.replace).
+    Si la carpeta es de solo lectura se ignora el error y se retorna False.
+    """
+    sp = snapshot_path(xlsx)
+    public = {k: v for k, v in data.items() if not str(k).startswith("_")}
+    payload = {"key": _snapshot_key(digest, parser_version), "data": public}
+    tmp_name = None
+    try:
+        fd, tmp_name = tempfile.mkstemp(prefix=sp.name, suffix=".tmp", dir=sp.parent)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, sp)
+        return True
+    except OSError:
+        if tmp_name and os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        return False
+
+
+def load_with_snapshot(
+    xlsx: Path,
+    parse: Callable[[Path], Dict[str, Any]],
+    parser_version: str,
+) -> Dict[str, Any]:
+    """Carga desde el snapshot si está vigente; si no, parsea el Excel y lo regenera."""
+    digest = workbook_hash(xlsx)
+    data = read_snapshot(xlsx, digest, parser_version)
+    if data is not None:
+        return data
+
+    data = parse(xlsx)
+    write_snapshot(xlsx, digest, parser_version, data)
+    return data
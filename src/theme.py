@@ -0,0 +1,141 @@
+# src/theme.py
+# -*- coding: utf-8 -*-
+"""
+Tema visual de la app.
+
+Todos los estilos viven en src/theme.css (variables, overrides de Streamlit y
+las clases cortas .ad-* que usan los componentes de ui_builder). Se compilan
+una vez por proceso a una hoja minificada y:
+- con server.enableStaticServing, se escriben en static/theme.<hash>.css y cada
+  rerun solo envía un <link> de ~80 bytes (el navegador la cachea);
+- si no, o si el servidor entrega los .css de static/ como text/plain (las
+  versiones con servidor Tornado, junto con nosniff: el navegador la bloquea),
+  se inyecta el <style> minificado.
+
+app.py y las páginas usan load_theme_html(APP_DIR).
+
+Uso (paso de build / medición):
+    python -m src.theme             # genera static/ y reporta bytes por rerun
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import re
+import sys
+
+from src.assets import STATIC_URL
+
+CSS_PATH = Path(__file__).with_name("theme.css")
+
+_COMMENTS = re.compile(r"/\*.*?\*/", re.S)
+_SPACES = re.compile(r"\s+")
+_PUNCT = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(css: str) -> str:
+    """Minificado conservador: comentarios, espacios y ';' finales."""
+    css = _COMMENTS.sub("", css)
+    css = _SPACES.sub(" ", css)
+    css = _PUNCT.sub(r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=1)
+def compiled_css() -> str:
+    return minify_css(CSS_PATH.read_text(encoding="utf-8"))
+
+
+def stylesheet_name() -> str:
+    digest = hashlib.sha256(compiled_css().encode("utf-8")).hexdigest()[:12]
+    return f"theme.{digest}.css"
+
+
+def build_static_stylesheet(static_dir: str | Path = "static") -> Path:
+    """Escribe static/theme.<hash>.css (borra versiones anteriores)."""
+    out_dir = Path(static_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    name = stylesheet_name()
+    for old in out_dir.glob("theme.*.css"):
+        if old.name != name:
+            old.unlink()
+    target = out_dir / name
+    if not target.exists():
+        target.write_text(compiled_css(), encoding="utf-8")
+    return target
+
+
+def theme_html(static_dir: Optional[str | Path] = None) -> str:
+    """
+    HTML a inyectar en cada rerun: <link> a la hoja estática si `static_dir`
+    se pudo preparar, o el <style> minificado en su defecto.
+    """
+    if static_dir is not None:
+        try:
+            name = build_static_stylesheet(static_dir).name
+            return f'<link rel="stylesheet" href="{STATIC_URL}/{name}">'
+        except OSError:
+            pass
+    return f"<style>{compiled_css()}</style>"
+
+
+def static_serves_css() -> bool:
+    """
+    True si el servidor de Streamlit entrega static/*.css como text/css. El
+    servidor Tornado solo respeta el tipo de las extensiones de
+    SAFE_APP_STATIC_FILE_EXTENSIONS (imágenes, fuentes, pdf, json...); el resto
+    sale como text/plain con X-Content-Type-Options: nosniff.
+    """
+    try:
+        from streamlit.web.server import app_static_file_handler
+    except ImportError:
+        # Sin ese módulo el servidor (Starlette) usa el tipo según la extensión
+        return True
+    safe = getattr(app_static_file_handler, "SAFE_APP_STATIC_FILE_EXTENSIONS", ())
+    return ".css" in safe
+
+
+@lru_cache(maxsize=4)
+def _cached_theme_html(static_dir: Optional[str]) -> str:
+    return theme_html(static_dir)
+
+
+def load_theme_html(app_dir: str | Path) -> str:
+    """
+    Tema para app.py y las páginas (una vez por proceso): <link> a
+    static/theme.<hash>.css si el static serving está activo y entrega text/css,
+    o el <style> minificado.
+    """
+    import streamlit as st
+
+    use_static = bool(st.get_option("server.enableStaticServing"))
+    static_dir = Path(app_dir) / "static"
+    return _cached_theme_html(
+        str(static_dir) if use_static and static_serves_css() else None
+    )
+
+
+def bytes_per_rerun_report() -> Dict[str, int]:
+    """Bytes de estilos globales por rerun: fuente original, minificado y <link>."""
+    source = len(CSS_PATH.read_bytes()) + len("<style></style>")
+    inline = len(f"<style>{compiled_css()}</style>".encode("utf-8"))
+    link = len(f'<link rel="stylesheet" href="{STATIC_URL}/{stylesheet_name()}">')
+    return {"source": source, "inline": inline, "link": link}
+
+
+def main() -> int:
+    path = build_static_stylesheet()
+    rep = bytes_per_rerun_report()
+    print(f"{path}: {path.stat().st_size:,} B")
+    print(
+        f"Estilos por rerun: {rep['source']:,} B (fuente) -> "
+        f"{rep['inline']:,} B (<style> minificado) / {rep['link']:,} B (<link>)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
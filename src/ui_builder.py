@@ -1,11 +1,15 @@
 # src/ui_builder.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, Sequence, Tuple
 import streamlit as st
-import pandas as pd
 import html
-from uuid import uuid4
+
+from src.quiz_logic import RunningScore
+from src.render_model import QuestionView, RenderModel
+
+if TYPE_CHECKING:
+    from src.recommendations import Recommendation
 
 # ---------- util ----------
 
@@ -18,14 +22,7 @@ def esc(x: str) -> str:
 def display_instructions(instructions_text: str) -> None:
     st.markdown(
         """
-    <div style="
-        background: linear-gradient(145deg, #ffffff 0%, #f8f9fa 100%);
-        color: #111827;
-        padding: 1.5rem;
-        border-radius: 12px;
-        border: 1px solid #e5e7eb;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.06);
-    ">
+    <div class="ad-ins">
     
     ## Cuestionario de autodiagnóstico en inclusión laboral LGBTIQ+
 
@@ -47,153 +44,152 @@ def display_instructions(instructions_text: str) -> None:
 
 
 # ---------- preguntas ----------
+# Todo el HTML y los textos vienen precalculados en el RenderModel
+# (src/render_model.py); aquí solo se buscan y se emiten.
 
+QUIZ_STATE_KEY = "_quiz_state"
 
-def _radio_for_question(q: Dict[str, Any], idx: int) -> Tuple[int, str]:
+
+def quiz_state(model: RenderModel) -> RunningScore:
     """
-    Render de una pregunta con diseño responsive mejorado.
+    Agregados del cuestionario de esta sesión (respondidas, total, mínimos por
+    sección). Se reinician si cambia la lista de preguntas.
     """
-    # Sección arriba del enunciado
-    section = q.get("section") or ""
-    if section:
-        st.markdown(
-            f"""
-            <div style="
-                display: inline-block;
-                font-size: 0.9rem;
-                color: #6b7280;
-                background: linear-gradient(135deg, #f3f4f6 0%, #e5e7eb 100%);
-                border: 1px solid #d1d5db;
-                padding: 0.4rem 0.8rem;
-                border-radius: 8px;
-                margin: 0 0 0.75rem 0;
-                font-weight: 600;
-            ">
-                {esc(section)}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+    state = st.session_state.get(QUIZ_STATE_KEY)
+    if state is None or state.keys != model.keys:
+        fresh = model.new_state()
+        if state is not None:
+            # Excel recargado: se conservan las respuestas de preguntas sin cambios
+            fresh.carry_over(state)
+        state = st.session_state[QUIZ_STATE_KEY] = fresh
+    return state
+
+
+def _record_answer(state: RunningScore, view: QuestionView) -> None:
+    """Callback on_change del radio: actualiza los agregados en O(1)."""
+    choice = st.session_state.get(view.widget_key)
+    score = view.scores[choice] if choice is not None else 0
+    if score > 0:
+        state.set(view.key, score, view.raw_labels[choice])
+    else:
+        state.clear(view.key)
 
-    # Enunciado responsive
-    st.markdown(
-        f"""
-        <div style="
-            font-size: clamp(1.1rem, 2.5vw, 1.4rem);
-            line-height: 1.6;
-            color: #111827;
-            background-color: #ffffff;
-            margin: 0.5rem 0 1rem 0;
-            font-weight: 700;
-            padding: 0.5rem 0;
-        ">
-            <span style="color: #667eea; font-weight: 800;">{esc(q.get('id', ''))}.</span> {esc(q.get('text', ''))}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
 
-    # Opciones 3,2,1
-    opts = sorted(q.get("options", []), key=lambda x: int(x["score"]), reverse=True)
-    labels = [esc(str(o.get("label", ""))) for o in opts]
+def sync_quiz_state(model: RenderModel) -> None:
+    """
+    Relee los radios presentes (modo st.form, donde los widgets no admiten
+    on_change): se usa como callback de los botones de envío.
+    """
+    state = quiz_state(model)
+    for view in model.views:
+        if view.widget_key in st.session_state:
+            _record_answer(state, view)
+
 
-    choice = st.radio(
-        f"Seleccione una opción para la pregunta {esc(q.get('id',''))}:",
-        options=list(range(len(opts))),
-        format_func=lambda i: labels[i],
-        index=None,
-        key=f"q_{q.get('id','')}_{idx}_{st.session_state.get('_render_uid','0')}",
+def _radio_for_question(
+    view: QuestionView, state: RunningScore, in_form: bool = False
+) -> None:
+    """
+    Render de una pregunta con diseño responsive mejorado.
+    """
+    # Sección arriba del enunciado
+    if view.section_html:
+        st.markdown(view.section_html, unsafe_allow_html=True)
+    st.markdown(view.question_html, unsafe_allow_html=True)
+
+    st.radio(
+        view.radio_label,
+        options=view.choices,
+        format_func=view.labels.__getitem__,
+        # Si el radio no estuvo en pantalla (otra página), parte de la respuesta guardada
+        index=view.index_of(state.answers.get(view.key)),
+        key=view.widget_key,
         horizontal=False,
         label_visibility="collapsed",
+        # Dentro de st.form solo el botón de envío admite callbacks
+        on_change=None if in_form else _record_answer,
+        args=None if in_form else (state, view),
     )
 
-    st.markdown(
-        '<div style="height: 1.5rem; border-bottom: 1px solid #e5e7eb; margin: 1rem 0;"></div>',
-        unsafe_allow_html=True,
-    )
-
-    if choice is not None:
-        chosen = opts[choice]
-        return int(chosen.get("score", 0)), str(chosen.get("label", ""))
-    else:
-        return 0, ""
+    st.markdown('<div class="ad-sep"></div>', unsafe_allow_html=True)
 
 
 def build_quiz_form(
-    questions: List[Dict[str, Any]], show_missing_hint: bool = False
-) -> Tuple[Dict[str, int], Dict[str, str]]:
+    model: RenderModel,
+    show_missing_hint: bool = False,
+    in_form: bool = False,
+) -> RunningScore:
     """
     Pinta todas las preguntas con barra de progreso LGBTI.
+    Las respuestas se acumulan en quiz_state() vía on_change (o con
+    sync_quiz_state al enviar, si `in_form`); no se recorren en cada rerun.
     """
-    _ = st.session_state.setdefault("_render_uid", str(uuid4()))
+    state = quiz_state(model)
 
-    answers: Dict[str, int] = {}
-    labels: Dict[str, str] = {}
-    completed_questions = 0
+    for view in model.views:
+        _radio_for_question(view, state, in_form)
+        if show_missing_hint and view.key not in state.answers:
+            st.warning(f"Falta responder la pregunta **{view.qid or '?'}**")
 
-    for idx, q in enumerate(questions):
-        score, label = _radio_for_question(q, idx)
-        if score > 0:
-            answers[q["id"]] = score
-            labels[q["id"]] = label
-            completed_questions += 1
-        elif show_missing_hint:
-            st.warning(f"Falta responder la pregunta **{q.get('id','?')}**")
+    st.markdown(model.progress_html[state.answered], unsafe_allow_html=True)
+    return state
 
-    # Barra de progreso con colores de la bandera LGBTI
-    if len(questions) > 0:
-        progress = completed_questions / len(questions)
 
-        # Gradiente de la bandera LGBTI
-        lgbti_gradient = "linear-gradient(to right, #E40303 0%, #FF8C00 16.67%, #FFED00 33.33%, #008026 50%, #24408E 66.67%, #732982 83.33%, #732982 100%)"
+# ---------- modo paginado ----------
 
-        st.markdown(
-            f"""
-            <div style="
-                position: fixed;
-                bottom: 0;
-                left: 0;
-                right: 0;
-                background: linear-gradient(to top, #ffffff 0%, rgba(255,255,255,0.98) 100%);
-                padding: clamp(0.75rem, 2vw, 1.25rem);
-                border-top: 2px solid #e5e7eb;
-                box-shadow: 0 -4px 16px rgba(0,0,0,0.1);
-                z-index: 999;
-                backdrop-filter: blur(10px);
-            ">
-                <div style="max-width: 1200px; margin: 0 auto;">
-                    <div style="
-                        height: 14px;
-                        background-color: #e5e7eb;
-                        border-radius: 999px;
-                        overflow: hidden;
-                        box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
-                    ">
-                        <div style="
-                            height: 100%;
-                            width: {progress * 100}%;
-                            background: {lgbti_gradient};
-                            transition: width 0.4s cubic-bezier(0.4, 0.0, 0.2, 1);
-                            box-shadow: 0 0 12px rgba(0,0,0,0.15);
-                        "></div>
-                    </div>
-                    <div style="
-                        margin-top: 0.5rem;
-                        color: #374151;
-                        font-size: clamp(0.85rem, 2vw, 1rem);
-                        text-align: center;
-                        font-weight: 600;
-                    ">
-                        {'Completado' if completed_questions == len(questions) else f'Progreso: {completed_questions}/{len(questions)} preguntas · Faltan {len(questions)-completed_questions}'}
-                    </div>
-                </div>
-            </div>
-            <div style="height: clamp(70px, 15vw, 90px);"></div>
-            """,
-            unsafe_allow_html=True,
-        )
+PAGE_KEY = "_quiz_page"
 
-    return answers, labels
+
+def _go_to_page(page: int, sync: Optional[Callable[[], None]] = None) -> None:
+    if sync is not None:
+        sync()
+    st.session_state[PAGE_KEY] = page
+
+
+def build_quiz_page(
+    model: RenderModel, in_form: bool = False
+) -> Tuple[RunningScore, bool]:
+    """
+    Modo paginado: una sección por página, con botones Anterior/Siguiente.
+    Las respuestas viven en quiz_state(), así que persisten entre páginas.
+    Retorna (agregados, es_la_última_página).
+    """
+    state = quiz_state(model)
+    pages = model.pages
+    if not pages:
+        return state, True
+
+    page = min(max(int(st.session_state.get(PAGE_KEY, 0)), 0), len(pages) - 1)
+    st.markdown(pages[page].header_html, unsafe_allow_html=True)
+    for idx in pages[page].indices:
+        _radio_for_question(model.views[idx], state, in_form)
+
+    # Navegación; en st.form los botones deben ser de envío y sincronizar
+    button = st.form_submit_button if in_form else st.button
+    sync = (lambda: sync_quiz_state(model)) if in_form else None
+    nav = st.columns([1, 2, 1])
+    if page > 0:
+        with nav[0]:
+            button(
+                "← Anterior",
+                key="quiz_prev",
+                on_click=_go_to_page,
+                args=(page - 1, sync),
+                use_container_width=True,
+            )
+    is_last = page == len(pages) - 1
+    if not is_last:
+        with nav[2]:
+            button(
+                "Siguiente →",
+                key="quiz_next",
+                on_click=_go_to_page,
+                args=(page + 1, sync),
+                use_container_width=True,
+            )
+
+    st.markdown(model.progress_html[state.answered], unsafe_allow_html=True)
+    return state, is_last
 
 
 # ---------- resultados ----------
@@ -202,184 +198,80 @@ def build_quiz_form(
 def show_result(
     result: Dict[str, Any],
     levels: Dict[str, Dict[str, str]],
-    recommendations: pd.DataFrame,
+    recommendations: Sequence["Recommendation"],
     areas: Dict[str, int],
+    percentiles: Optional[Dict[str, Any]] = None,
 ) -> None:
-    # Encabezado responsive y centrado
-    st.markdown(
-        """
-    <div style="
-        max-width: 800px;
-        margin: 2rem auto 1rem auto;
-        text-align: center;
-        background-color: #ffffff;
-    ">
-        <h2 style="
-            color: #111827;
-            font-size: clamp(1.8rem, 4vw, 2.5rem);
-            font-weight: 800;
-            margin: 0;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        ">
-            Resultados del diagnóstico
-        </h2>
-    </div>
-    """,
-        unsafe_allow_html=True,
-    )
-
-    # Tarjeta principal responsive y centrada
+    """
+    `recommendations` son las filas que eligió RecommendationIndex.match
+    (src/recommendations.py) para este patrón de respuestas.
+    `percentiles` es lo que retorna PercentileIndex.lookup (src/percentiles.py);
+    None si no hay base de resultados o todavía no hay suficientes.
+    """
+    # Encabezado y tarjeta principal (clases en src/theme.css)
+    comparison = ""
+    if percentiles and percentiles.get("total") is not None:
+        comparison = (
+            f" · Percentil {percentiles['total']:.0f} "
+            f"entre {percentiles['n']:,} empresas"
+        )
     st.markdown(
-        f"""
-    <div style="
-        max-width: 800px;
-        margin: 1.5rem auto 2rem auto;
-        padding: clamp(1.5rem, 4vw, 2.5rem);
-        border-radius: 16px;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        text-align: center;
-        box-shadow: 0 8px 32px rgba(102, 126, 234, 0.35);
-        animation: fadeIn 0.5s ease;
-    ">
-        <div style="
-            font-size: clamp(1.5rem, 4vw, 2rem);
-            font-weight: 800;
-            margin-bottom: 0.5rem;
-        ">
-            {esc(result['level_label'])}
-        </div>
-        <div style="
-            font-size: clamp(1rem, 2.5vw, 1.3rem);
-            font-weight: 600;
-            opacity: 0.95;
-        ">
-            Puntaje total: {int(result['total'])} puntos
-        </div>
-    </div>
-    """,
+        '<div class="ad-rh"><h2>Resultados del diagnóstico</h2></div>'
+        f'<div class="ad-lv"><div class="ad-lv-t">{esc(result["level_label"])}</div>'
+        f'<div class="ad-lv-s">Puntaje total: {int(result["total"])} puntos'
+        f"{comparison}</div></div>",
         unsafe_allow_html=True,
     )
 
     lv_key = result["level_key"]
     lv = levels.get(lv_key, {})
 
-    # Cards más anchas y centradas
-    def _card(title: str, color: str, text: str) -> None:
+    # Cards más anchas y centradas; variant = c1/c2/c3 (color del tema)
+    def _card(title: str, variant: str, text: str) -> None:
         st.markdown(
-            f"""
-            <div style="
-                max-width: 800px;
-                margin: 1.5rem auto;
-                padding: clamp(1.25rem, 3vw, 2rem);
-                border-radius: 12px;
-                background: #ffffff;
-                border: 2px solid {color}30;
-                box-shadow: 0 4px 16px rgba(0,0,0,0.08);
-                transition: transform 0.2s ease, box-shadow 0.2s ease;
-            ">
-                <div style="
-                    color: {color};
-                    font-weight: 700;
-                    font-size: clamp(1.2rem, 2.5vw, 1.5rem);
-                    margin-bottom: 1rem;
-                    border-bottom: 3px solid {color};
-                    width: fit-content;
-                    padding-bottom: 0.35rem;
-                    padding-right: 0.75rem;
-                ">{esc(title)}</div>
-                <div style="
-                    line-height: 1.8;
-                    color: #374151;
-                    font-size: clamp(1rem, 2vw, 1.15rem);
-                    background-color: #ffffff;
-                    white-space: pre-wrap;
-                    word-wrap: break-word;
-                ">
-                    {esc(text)}
-                </div>
-            </div>
-            """,
+            f'<div class="ad-card {variant}"><div class="ad-card-t">{esc(title)}</div>'
+            f'<div class="ad-card-b">{esc(text)}</div></div>',
             unsafe_allow_html=True,
         )
 
     if lv:
+        _card("Definición", "c1", lv.get("DEFINICION", "(sin definición)"))
         _card(
-            "Definición",
-            "#667eea",
-            lv.get("DEFINICION", "(sin definición)"),
-        )
-        _card(
-            "Características",
-            "#764ba2",
-            lv.get("CARACTERISTICAS", "(sin características)"),
+            "Características", "c2", lv.get("CARACTERISTICAS", "(sin características)")
         )
+        _card("Ruta de aprendizaje", "c3", lv.get("RUTA", "(sin ruta)"))
+
+    # Percentil por sección: qué tan arriba quedó cada sección frente al resto
+    if percentiles and percentiles.get("sections"):
         _card(
-            "Ruta de aprendizaje",
-            "#28a745",
-            lv.get("RUTA", "(sin ruta)"),
+            "Comparación por sección",
+            "c1",
+            "\n".join(
+                f"{sec or 'General'}: percentil {pct:.0f}"
+                for sec, pct in percentiles["sections"].items()
+            ),
         )
 
-    # Áreas a fortalecer - VERTICALES y centradas (CORREGIDO)
+    # Áreas a fortalecer - una card debajo de otra
     if areas:
-        # Contenedor principal centrado
         st.markdown(
-            """
-        <div style="
-            max-width: 800px;
-            margin: 2.5rem auto 1.5rem auto;
-            background-color: #ffffff;
-        ">
-            <h3 style="
-                color:#111827;
-                font-size: clamp(1.3rem, 3vw, 1.6rem);
-                font-weight:700;
-                margin:0 0 0.5rem 0;
-            ">
-                Áreas a fortalecer
-            </h3>
-            <div style="
-                color:#6b7280;
-                margin-bottom: 1.5rem;
-                font-size: clamp(0.9rem, 2vw, 1rem);
-            ">
-                Secciones donde se eligieron opciones de puntaje bajo:
-            </div>
-        """,
+            '<div class="ad-ah"><h3>Áreas a fortalecer</h3>'
+            "<div>Secciones donde se eligieron opciones de puntaje bajo:</div></div>",
             unsafe_allow_html=True,
         )
-
-        # Layout vertical (una card debajo de otra) - centrado
         for sec, sc in areas.items():
             st.markdown(
-                f"""
-            <div style="
-                max-width: 800px;
-                margin: 0 auto 0.75rem auto;
-                padding: clamp(1rem, 2.5vw, 1.5rem);
-                border-radius: 10px;
-                background: linear-gradient(145deg, #fff3cd 0%, #ffeaa7 100%);
-                border: 2px solid #f1c40f;
-                box-shadow: 0 3px 12px rgba(241, 196, 15, 0.2);
-                transition: transform 0.2s ease;
-            ">
-                <div style="
-                    color:#7a5d00;
-                    font-weight:700;
-                    margin-bottom:0.5rem;
-                    font-size: clamp(1rem, 2.2vw, 1.2rem);
-                ">{esc(sec)}</div>
-                <div style="
-                    color:#7a5d00;
-                    font-size: clamp(0.9rem, 1.9vw, 1rem);
-                ">Puntaje ≤ {int(sc)}</div>
-            </div>
-            """,
+                f'<div class="ad-area"><b>{esc(sec)}</b>Puntaje ≤ {int(sc)}</div>',
                 unsafe_allow_html=True,
             )
 
-        # Cerrar contenedor principal
-        st.markdown("</div>", unsafe_allow_html=True)
+    # Recomendaciones para las barreras más relacionadas con las respuestas bajas
+    if recommendations:
+        st.markdown(
+            '<div class="ad-ah"><h3>Recomendaciones</h3>'
+            "<div>Barreras organizacionales relacionadas con sus respuestas:</div>"
+            "</div>",
+            unsafe_allow_html=True,
+        )
+        for rec in recommendations:
+            _card(rec.barrera, "c3", rec.recomendaciones or rec.concepto)
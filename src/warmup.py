@@ -0,0 +1,171 @@
+# src/warmup.py
+# -*- coding: utf-8 -*-
+"""
+Calentamiento en segundo plano al arrancar el servidor.
+
+Lo que de otro modo paga la primera visita se ejecuta en un pool de hilos:
+- datos: parseo del Excel por defecto (o su snapshot) en el registro compartido;
+- pdf: import de ReportLab, hoja de estilos y un informe de prueba (fuentes);
+- estaticos: logos WebP/PNG y hoja de estilos compilada en static/.
+
+WarmUp expone `ready` (todos los componentes terminaron sin error) y status()
+con el estado y los segundos de cada componente. serve.py lo arranca en el
+lifespan del servidor y publica /ready para el balanceador; app.py lo arranca
+también (idempotente) y muestra el estado en el panel de debug.
+
+Uso (mismo calentamiento en primer plano, p.ej. en un paso de deploy):
+    python -m src.warmup            # imprime los tiempos; código 1 si algo falla
+"""
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import sys
+import threading
+import time
+
+WARMUP_ENV_VAR = "AUTODIAG_WARMUP"
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _warm_data(app_dir: Path) -> None:
+    from src.registry import shared_registry
+
+    # Solo el tenant por defecto; los demás se cargan en su primer uso
+    shared_registry(app_dir / "data").current()
+
+
+def _warm_pdf() -> None:
+    from src.pdf_report import _styles, create_result_pdf
+
+    _styles()
+    # Un informe mínimo carga las fuentes y el motor de maquetación
+    create_result_pdf(
+        {"level_key": "nivel_1", "level_label": "Nivel 1", "total": 0},
+        {},
+        {"Warm-up": 1},
+    )
+
+
+def _warm_static(app_dir: Path) -> None:
+    from src.assets import ensure_static_assets
+    from src.theme import build_static_stylesheet
+
+    ensure_static_assets(app_dir / "static", app_dir / "assets")
+    build_static_stylesheet(app_dir / "static")
+
+
+def default_tasks(app_dir: Path = ROOT) -> Dict[str, Callable[[], Any]]:
+    return {
+        "datos": lambda: _warm_data(app_dir),
+        "pdf": _warm_pdf,
+        "estaticos": lambda: _warm_static(app_dir),
+    }
+
+
+class WarmUp:
+    """Ejecuta `tasks` (nombre -> callable) en paralelo y registra sus tiempos."""
+
+    def __init__(self, tasks: Dict[str, Callable[[], Any]], workers: int = 3) -> None:
+        self.tasks = dict(tasks)
+        self.workers = workers
+        self._futures: Dict[str, Future] = {}
+        self._seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> "WarmUp":
+        """Lanza el calentamiento sin bloquear (no hace nada si ya empezó)."""
+        with self._lock:
+            if self._started is not None:
+                return self
+            self._started = time.perf_counter()
+            pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="warmup"
+            )
+            for name, task in self.tasks.items():
+                self._futures[name] = pool.submit(self._run, name, task)
+            pool.shutdown(wait=False)
+            if not self._futures:
+                self._finish()
+        return self
+
+    def _run(self, name: str, task: Callable[[], Any]) -> None:
+        t0 = time.perf_counter()
+        try:
+            task()
+        except Exception as exc:
+            self._errors[name] = f"{type(exc).__name__}: {exc}"
+        finally:
+            self._seconds[name] = time.perf_counter() - t0
+            if len(self._seconds) == len(self.tasks):
+                self._finish()
+
+    def _finish(self) -> None:
+        self._finished = time.perf_counter()
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que terminen todos los componentes; retorna `ready`."""
+        self._done.wait(timeout)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and not self._errors
+
+    def status(self) -> Dict[str, Any]:
+        components = {}
+        for name in self.tasks:
+            if name in self._errors:
+                state = "error"
+            elif name in self._seconds:
+                state = "listo"
+            elif name in self._futures:
+                state = "en curso"
+            else:
+                state = "pendiente"
+            components[name] = {
+                "estado": state,
+                "segundos": self._seconds.get(name),
+                "error": self._errors.get(name),
+            }
+        total = None
+        if self._started is not None:
+            end = self._finished or time.perf_counter()
+            total = end - self._started
+        return {"ready": self.ready, "segundos": total, "componentes": components}
+
+
+_WARMUP: Optional[WarmUp] = None
+_WARMUP_LOCK = threading.Lock()
+
+
+def start_warmup(app_dir: Path = ROOT) -> WarmUp:
+    """Calentamiento del proceso (se crea y lanza una sola vez)."""
+    global _WARMUP
+    with _WARMUP_LOCK:
+        if _WARMUP is None:
+            _WARMUP = WarmUp(default_tasks(Path(app_dir))).start()
+    return _WARMUP
+
+
+def main() -> int:
+    warm = start_warmup()
+    warm.wait()
+    status = warm.status()
+    for name, comp in status["componentes"].items():
+        line = f"{name:<10} {comp['estado']:<8} {comp['segundos'] or 0:>8.3f}s"
+        if comp["error"]:
+            line += f"  {comp['error']}"
+        print(line)
+    print(f"{'total':<10} {'':<8} {status['segundos']:>8.3f}s")
+    return 0 if status["ready"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+# tests/test_bulk_import.py
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+from src.bulk_import import score_chunk, score_file
+
+THRESHOLDS = {"nivel_1_max": 3, "nivel_2_max": 6}
+QUESTIONS = [
+    {"id": "A", "section": "Cultura", "text": "¿Pregunta A?", "options": []},
+    {"id": "B", "section": "Cultura", "text": "¿Pregunta B?", "options": []},
+    {"id": "C", "section": "Liderazgo", "text": "¿Pregunta C?", "options": []},
+]
+
+
+def _chunk(rows):
+    return pd.DataFrame(rows, columns=["empresa", "A", "B", "C"], dtype=object)
+
+
+def test_invalid_scores_are_not_summed():
+    scored = score_chunk(
+        _chunk(
+            [
+                ("ok", "3", "2", "1"),
+                ("fuera", "4", "2", "1"),
+                ("texto", "3", "tres", "1"),
+                ("decimal", "3", "2.5", " 1 "),
+            ]
+        ),
+        QUESTIONS,
+        THRESHOLDS,
+    )
+
+    assert scored["total"].tolist() == [6, 3, 4, 4]
+    assert scored["invalidas"].tolist() == ["", "A", "B", "B"]
+    assert scored["respondidas"].tolist() == [3, 2, 2, 2]
+    assert scored["completa"].tolist() == [True, False, False, False]
+
+
+def test_partial_rows_are_flagged(tmp_path):
+    src = tmp_path / "respuestas.csv"
+    _chunk(
+        [("completa", 3, 3, 3), ("parcial", 3, None, 3), ("vacia", "", "", "")]
+    ).to_csv(src, index=False)
+    out = tmp_path / "resultados.csv"
+
+    stats = score_file(
+        src, out, {"questions": QUESTIONS, "thresholds": THRESHOLDS}, chunksize=2
+    )
+    scored = pd.read_csv(out, keep_default_na=False)
+
+    assert stats["rows"] == 3
+    assert stats["incomplete"] == 2
+    assert stats["invalid"] == 0
+    assert scored["completa"].tolist() == [True, False, False]
+    assert scored["respondidas"].tolist() == [3, 2, 0]
+    assert scored["total"].tolist() == [9, 6, 0]
@@ -0,0 +1,80 @@
+# tests/test_questions.py
+# -*- coding: utf-8 -*-
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import data_handler as dh
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def legacy_parse():
+    """Parser fila por fila de benchmarks/bench_questions.py (la referencia)."""
+    path = ROOT / "benchmarks" / "bench_questions.py"
+    spec = importlib.util.spec_from_file_location("bench_questions", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.legacy_parse
+
+
+def _sheet(rows):
+    """DataFrame A-D a partir de filas (B, C, D); None = celda vacía."""
+    b, c, d = zip(*rows)
+    df = pd.DataFrame({"B": b, "C": c, "D": d}, dtype=object).fillna(np.nan)
+    df.insert(0, "A", np.nan)
+    return df
+
+
+def test_bundled_workbook_matches_reference(legacy_parse):
+    xlsx = next((ROOT / "data").glob("*.xlsx"))
+    df = pd.read_excel(xlsx, sheet_name="Cuestionario", engine="openpyxl")
+    questions = dh._load_questions_from_excel(xlsx)
+
+    assert questions
+    assert [{k: v for k, v in q.items() if k != "key"} for q in questions] == (
+        legacy_parse(df)
+    )
+
+
+def test_blank_rows_and_ids_without_text(legacy_parse):
+    df = _sheet(
+        [
+            ("Cultura", None, "Respuesta"),
+            (None, None, None),
+            ("A", "¿La empresa tiene una política de inclusión?", 3),
+            (3, "Sí, escrita y comunicada", None),
+            (None, None, None),
+            ("B", None, None),
+            ("C", "Sin signo de pregunta", None),
+            ("D", "¿Se mide la diversidad del equipo?", 2),
+            (3.0, "Sí", None),
+            (2, None, None),
+            (1, "No", None),
+            (7, "Fuera de rango", None),
+            (None, None, None),
+            ("Liderazgo", None, "Respuesta"),
+            ("E", "¿Hay metas de inclusión en la dirección?", 1),
+        ]
+    )
+    questions = dh._parse_questions(df)
+
+    assert questions == legacy_parse(df)
+    assert [q["id"] for q in questions] == ["A", "D", "E"]
+    assert [q["section"] for q in questions] == ["Cultura", "Cultura", "Liderazgo"]
+    # A no tiene más opciones tras la fila vacía; a D, la de puntaje 2 sin texto
+    # corta el bloque
+    assert [o["label"] for o in questions[0]["options"]] == [
+        "Sí, escrita y comunicada",
+        "Opción 2",
+        "Opción 1",
+    ]
+    assert [o["label"] for o in questions[1]["options"]] == [
+        "Sí",
+        "Opción 2",
+        "Opción 1",
+    ]
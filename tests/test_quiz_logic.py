@@ -0,0 +1,82 @@
+# tests/test_quiz_logic.py
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+import pytest
+
+from src.quiz_logic import RunningScore, question_keys, sections_to_improve
+
+ROOT = Path(__file__).resolve().parents[1]
+
+QUESTIONS = [
+    {"id": "A", "section": "Políticas"},
+    {"id": "B", "section": "Políticas"},
+    {"id": "C", "section": "Cultura"},
+]
+
+
+def test_set_clear_areas():
+    state = RunningScore(QUESTIONS)
+    state.set("C", 1)
+    state.set("A", 2)
+    state.set("B", 4)
+    assert state.areas() == {"Políticas": 2, "Cultura": 1}
+
+    state.clear("A")
+    assert state.areas() == {"Cultura": 1}
+    assert state.areas() == sections_to_improve(state.answers, QUESTIONS)
+
+    state.set("C", 3)
+    state.clear("C")
+    assert state.areas() == {}
+    assert state.total == 4
+
+
+def test_unknown_question_is_rejected():
+    state = RunningScore(QUESTIONS)
+    state.set("A", 1)
+    with pytest.raises(KeyError):
+        state.set("Z", 1)
+    state.clear("Z")
+    state.clear("A")
+    assert state.answers == {}
+    assert state.areas() == {}
+    assert state.section_totals() == {}
+
+
+def _question(qid, text, labels=("Sí", "No")):
+    options = [{"score": 4 - i, "label": label} for i, label in enumerate(labels)]
+    return {"id": qid, "text": text, "options": options}
+
+
+def test_question_keys_duplicate_ids():
+    questions = [
+        _question("A", "¿Tiene política?"),
+        _question("A", "¿Tiene protocolo?"),
+        _question("A", "¿Tiene política?"),
+        _question("A", "¿Tiene política?"),
+    ]
+    keys = question_keys(questions)
+    assert len(set(keys)) == len(keys)
+    assert keys[0] != keys[1]
+    assert keys[2] == f"{keys[0]}~2"
+    assert keys[3] == f"{keys[0]}~3"
+
+
+def test_question_keys_are_stable():
+    questions = [_question("A", "¿Tiene política?"), _question("B", "¿Capacita?")]
+    keys = question_keys(questions)
+    # Copias nuevas (una recarga) y una pregunta agregada al principio
+    reloaded = [dict(q) for q in questions]
+    assert question_keys(reloaded) == keys
+    assert question_keys([_question("Z", "Nueva")] + reloaded)[1:] == keys
+
+
+def test_question_keys_stable_across_workbook_reloads():
+    from src.data_handler import load_data_from_excel
+
+    xlsx = next((ROOT / "data").glob("*.xlsx"))
+    first = [q["key"] for q in load_data_from_excel(xlsx)["questions"]]
+    second = [q["key"] for q in load_data_from_excel(xlsx)["questions"]]
+    assert first == second
+    assert len(set(first)) == len(first)
@@ -0,0 +1,54 @@
+# tests/test_recommendations.py
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+import pytest
+
+from src.recommendations import FIELDS, WORD_RE, fold_text, query_terms
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def index():
+    from src.data_handler import load_data_from_excel
+
+    xlsx = next((ROOT / "data").glob("*.xlsx"))
+    return load_data_from_excel(xlsx)["recommendation_index"]
+
+
+def _scan(index, query):
+    """
+    Filas en que cada término es prefijo de alguna palabra (recorrido completo
+    sobre el texto crudo, sin el tokenizador del índice).
+    """
+    prefixes = query_terms(query)
+    if not prefixes:
+        return set()
+    found = set()
+    for rec in index.rows:
+        text = " ".join(getattr(rec, n) for n, _ in FIELDS)
+        words = set(WORD_RE.findall(fold_text(text)))
+        if all(any(w.startswith(p) for w in words) for p in prefixes):
+            found.add(rec.id)
+    return found
+
+
+@pytest.mark.parametrize(
+    "query", ["discrim", "nombre ident", "Lenguaje INCL", "per", "con", "ins cap"]
+)
+def test_search_matches_exhaustive_scan(index, query):
+    got = {rec.id for rec, _ in index.search(query, limit=len(index))}
+    assert got == _scan(index, query)
+
+
+@pytest.mark.parametrize("query", ["DEI", "CRM", "uso"])
+def test_search_three_letter_words(index, query):
+    got = {rec.id for rec, _ in index.search(query, limit=len(index))}
+    assert got
+    assert got == _scan(index, query)
+
+
+def test_search_readme_example(index):
+    hits = index.search("nombre ident")
+    assert any("Negación del nombre identitario" in rec.barrera for rec, _ in hits)
@@ -0,0 +1,125 @@
+# tests/test_registry.py
+# -*- coding: utf-8 -*-
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from src.registry import WorkbookRegistry
+from src.render_model import build_render_model
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _wait_for(predicate, timeout: float = 30.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_edit_reloads_workbook_once(tmp_path):
+    pytest.importorskip("watchdog")
+    openpyxl = pytest.importorskip("openpyxl")
+
+    source = next((ROOT / "data").glob("*.xlsx"))
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shutil.copy(source, data_dir / "camara.xlsx")
+    # Versión editada, preparada fuera de la carpeta vigilada
+    edited = tmp_path / "editado.xlsx"
+    wb = openpyxl.load_workbook(source)
+    wb.create_sheet("Notas")["A1"] = "editado"
+    wb.save(edited)
+
+    registry = WorkbookRegistry(data_dir, debounce=0.2)
+    try:
+        first = registry.current("camara")
+        store = registry.store("camara")
+        assert registry.watch()
+        # Sin cambios, las lecturas del libro no disparan recargas
+        time.sleep(1.0)
+        assert store.stats()["recargas"] == 0
+
+        shutil.copyfile(edited, data_dir / "camara.xlsx")
+        assert _wait_for(lambda: store.stats()["recargas"] >= 1)
+        # La recarga relee el libro; eso no debe programar otra
+        time.sleep(1.5)
+        assert store.stats()["recargas"] == 1
+        assert registry.current("camara") is not first
+        assert registry.resolve(store.digest) == "camara"
+    finally:
+        registry.stop()
+
+
+def _edit_sections(source: Path, dest: Path, cells: dict) -> None:
+    """Copia del libro con otros valores en celdas de sección de 'Cuestionario'."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source)
+    for coord, value in cells.items():
+        wb["Cuestionario"][coord] = value
+    wb.save(dest)
+
+
+def _sections(data) -> list:
+    return [page.name for page in build_render_model(data["questions"]).pages]
+
+
+@pytest.mark.parametrize(
+    "cells",
+    [
+        {"B9": "Normativa interna"},
+        # La pregunta B pasa a la sección de la A
+        {"B16": "Marco normativo interno"},
+    ],
+    ids=["renombrar", "mover"],
+)
+def test_section_edit_changes_render_model_key(tmp_path, cells):
+    pytest.importorskip("openpyxl")
+    source = next((ROOT / "data").glob("*.xlsx"))
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shutil.copy(source, data_dir / "camara.xlsx")
+    edited = tmp_path / "editado.xlsx"
+    _edit_sections(source, edited, cells)
+
+    store = WorkbookRegistry(data_dir).store("camara")
+    before, digest_before = store.current_version()
+    shutil.copyfile(edited, data_dir / "camara.xlsx")
+    assert store.reload()
+    after, digest_after = store.current_version()
+
+    # Mismas claves de pregunta: solo el digest separa los modelos de render
+    assert [q["key"] for q in after["questions"]] == [
+        q["key"] for q in before["questions"]
+    ]
+    assert digest_after != digest_before
+    assert _sections(after) != _sections(before)
+
+
+def test_tenants_differing_only_in_section_names(tmp_path):
+    pytest.importorskip("openpyxl")
+    source = next((ROOT / "data").glob("*.xlsx"))
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shutil.copy(source, data_dir / "norte.xlsx")
+    _edit_sections(
+        source,
+        data_dir / "sur.xlsx",
+        {f"B{row}": f"Área {i + 1}" for i, row in enumerate(range(9, 73, 7))},
+    )
+
+    registry = WorkbookRegistry(data_dir)
+    norte, norte_digest = registry.store("norte").current_version()
+    sur, sur_digest = registry.store("sur").current_version()
+
+    assert [q["key"] for q in norte["questions"]] == [
+        q["key"] for q in sur["questions"]
+    ]
+    assert norte_digest != sur_digest
+    assert _sections(sur) == [f"Área {i}" for i in range(1, 11)]
+    assert _sections(norte) != _sections(sur)